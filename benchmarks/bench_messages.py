@@ -0,0 +1,61 @@
+"""
+Micro-benchmark of converting a `ChatCompletionMessage` into a history message:
+the former `json.loads(message.model_dump_json())` round trip against
+`Message.from_completion`.
+
+    python -m benchmarks.bench_messages
+    python -m benchmarks.bench_messages --tool-calls 8 --argument-bytes 20000
+"""
+
+import argparse
+import json
+import sys
+import timeit
+
+from swarm.message import Message
+
+from .synthetic_client import make_completion
+
+
+def make_message(tool_calls, argument_bytes):
+    calls = [
+        (f"tool_{i}", {"payload": "x" * argument_bytes, "index": i})
+        for i in range(tool_calls)
+    ]
+    return make_completion("Working on it.", calls).choices[0].message
+
+
+def json_round_trip(message, sender):
+    message.sender = sender
+    return json.loads(message.model_dump_json())
+
+
+def direct(message, sender):
+    return Message.from_completion(message, sender)
+
+
+def measure(func, message, iterations):
+    timer = timeit.Timer(lambda: func(message, "Bench Agent"))
+    return min(timer.repeat(repeat=5, number=iterations)) / iterations * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--tool-calls", type=int, default=4)
+    parser.add_argument("--argument-bytes", type=int, default=2000)
+    options = parser.parse_args(argv)
+
+    message = make_message(options.tool_calls, options.argument_bytes)
+    results = {
+        "json_round_trip": measure(json_round_trip, message, options.iterations),
+        "from_completion": measure(direct, message, options.iterations),
+    }
+    for name, micros in results.items():
+        print(f"{name:<20}{micros:>10.2f} us/message")
+    print(f"{'speedup':<20}{results['json_round_trip'] / results['from_completion']:>10.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
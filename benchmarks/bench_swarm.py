@@ -0,0 +1,232 @@
+"""
+Benchmarks for the Swarm orchestration loop against a synthetic client.
+
+Each scenario drives `Swarm.run`, `Swarm.run_and_stream` or
+`Swarm.handle_tool_calls` with a client that injects a fixed model latency, and
+reports wall-time percentiles, framework overhead (wall time minus injected
+model latency, so it includes tool time) and bytes allocated per iteration.
+
+    python -m benchmarks.bench_swarm                   # run and print
+    python -m benchmarks.bench_swarm --save-baseline   # store results
+    python -m benchmarks.bench_swarm --compare         # fail on regressions
+
+Baselines are machine specific; regenerate them when moving hardware.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from swarm import Agent, Swarm
+from swarm.types import ChatCompletionMessageToolCall, Function
+
+from .synthetic_client import SyntheticClient
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def make_lookup(latency):
+    def lookup(item_id):
+        """Look up an item."""
+        if latency:
+            time.sleep(latency)
+        return f"item {item_id}"
+
+    return lookup
+
+
+def make_history(length):
+    return [
+        {
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": f"message {i} " + "lorem ipsum " * 20,
+            "sender": "Bench Agent",
+        }
+        for i in range(length)
+    ]
+
+
+def handoff_chain(depth, lookup):
+    """Agents linked by transfer functions, and the script that walks the chain."""
+    agents = [Agent(name=f"Agent {i}", functions=[lookup]) for i in range(depth + 1)]
+    for i in range(depth):
+        target = agents[i + 1]
+
+        def transfer(target=target):
+            return target
+
+        transfer.__name__ = f"transfer_to_agent_{i + 1}"
+        agents[i].functions.append(transfer)
+    script = [{"tool_calls": [(f"transfer_to_agent_{i + 1}", {})]} for i in range(depth)]
+    return agents[0], script
+
+
+def build_scenarios(options):
+    fan_out_calls = [("lookup", {"item_id": str(i)}) for i in range(options.fan_out)]
+    final = {"content": "Here is everything you asked for. " * 8}
+    history = make_history(options.history)
+    lookup = make_lookup(options.tool_latency)
+    agent = Agent(name="Bench Agent", functions=[lookup])
+    chain_head, chain_script = handoff_chain(options.depth, lookup)
+
+    def run(script, stream=False, start_agent=agent, **swarm_options):
+        client = SyntheticClient(
+            script,
+            latency=options.latency,
+            chunk_interval=options.chunk_interval,
+            chunks=options.chunks,
+        )
+        swarm = Swarm(client=client, **swarm_options)
+
+        def once():
+            response = swarm.run(agent=start_agent, messages=history, stream=stream)
+            if stream:
+                for _ in response:
+                    pass
+            return len(script)
+
+        return client, once
+
+    tool_calls = [
+        ChatCompletionMessageToolCall(
+            id=f"bench_tc_{i}",
+            type="function",
+            function=Function(name=name, arguments=json.dumps(args)),
+        )
+        for i, (name, args) in enumerate(fan_out_calls)
+    ]
+
+    def handle_tool_calls():
+        client = SyntheticClient([final])
+        swarm = Swarm(client=client)
+        registry = agent.tool_registry()
+
+        def once():
+            swarm.handle_tool_calls(tool_calls, registry, {}, False)
+            return 0
+
+        return client, once
+
+    return {
+        "run": lambda: run([final]),
+        "run_tools": lambda: run([{"tool_calls": fan_out_calls}, final]),
+        "run_handoff": lambda: run(chain_script + [final], start_agent=chain_head),
+        "stream": lambda: run([final], stream=True),
+        "stream_tools": lambda: run([{"tool_calls": fan_out_calls}, final], stream=True),
+        "stream_tools_speculative": lambda: run(
+            [{"tool_calls": fan_out_calls}, final],
+            stream=True,
+            tool_executor=ThreadPoolExecutor(max_workers=options.fan_out),
+            speculative_tools=True,
+        ),
+        "handle_tool_calls": handle_tool_calls,
+    }
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def measure(setup, iterations, warmup=5):
+    client, once = setup()
+    for _ in range(warmup):
+        once()
+
+    wall, overhead, turns = [], [], 0
+    for _ in range(iterations):
+        client.reset()
+        start = time.perf_counter()
+        turns += once()
+        elapsed = time.perf_counter() - start
+        wall.append(elapsed)
+        overhead.append(elapsed - client.injected)
+
+    # allocations are measured separately so tracing does not skew timings
+    client.reset()
+    tracemalloc.start()
+    once()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ms = 1000.0
+    return {
+        "wall_p50_ms": percentile(wall, 0.50) * ms,
+        "wall_p99_ms": percentile(wall, 0.99) * ms,
+        "overhead_p50_ms": percentile(overhead, 0.50) * ms,
+        "overhead_p99_ms": percentile(overhead, 0.99) * ms,
+        "overhead_per_turn_ms": sum(overhead) / max(turns, iterations) * ms,
+        "peak_alloc_kib": peak / 1024,
+    }
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        for metric in ("overhead_p50_ms", "peak_alloc_kib"):
+            # small absolute slack keeps sub-millisecond noise from failing runs
+            limit = expected[metric] * tolerance + 0.05
+            if result[metric] > limit:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]:.3f} > {limit:.3f} "
+                    f"(baseline {expected[metric]:.3f})"
+                )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    parser.add_argument("--chunk-interval", type=float, default=0.0, help="seconds per chunk")
+    parser.add_argument("--chunks", type=int, default=64, help="chunks per streamed reply")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="seconds per tool call")
+    parser.add_argument("--fan-out", type=int, default=4, help="tool calls per message")
+    parser.add_argument("--history", type=int, default=200, help="messages of prior history")
+    parser.add_argument("--depth", type=int, default=3, help="handoffs per run")
+    parser.add_argument("--scenario", action="append", help="only run these scenarios")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    options = parser.parse_args(argv)
+
+    scenarios = build_scenarios(options)
+    results = {}
+    print(
+        f"{'scenario':<26}{'wall p50':>10}{'wall p99':>10}{'ovh p50':>10}"
+        f"{'ovh p99':>10}{'ovh/turn':>10}{'peak KiB':>10}"
+    )
+    for name, setup in scenarios.items():
+        if options.scenario and name not in options.scenario:
+            continue
+        result = results[name] = measure(setup, options.iterations)
+        print(
+            f"{name:<26}{result['wall_p50_ms']:>10.3f}{result['wall_p99_ms']:>10.3f}"
+            f"{result['overhead_p50_ms']:>10.3f}{result['overhead_p99_ms']:>10.3f}"
+            f"{result['overhead_per_turn_ms']:>10.3f}{result['peak_alloc_kib']:>10.1f}"
+        )
+
+    if options.save_baseline:
+        with open(options.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {options.baseline}")
+
+    if options.compare:
+        with open(options.baseline) as f:
+            regressions = compare(results, json.load(f), options.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Micro-benchmarks of the per-tool-call object construction in Swarm.
+
+`construct/*` compares validated pydantic construction of `Result` and
+`Response` with `model_construct`; `merge/*` measures `merge_tool_results` per
+tool call for tools returning plain strings and tools returning `Result`s.
+
+    python -m benchmarks.bench_types
+"""
+
+import argparse
+import sys
+import timeit
+
+from swarm import Agent, Swarm
+from swarm.types import ChatCompletionMessageToolCall, Function, Response, Result
+
+from .bench_swarm import make_history
+from .synthetic_client import SyntheticClient
+
+
+def constructions(history_length):
+    agent = Agent(name="Bench Agent")
+    history = make_history(history_length)
+    context_variables = {"customer": {"name": "Ada", "orders": list(range(20))}}
+    return {
+        "construct/result": (
+            lambda: Result(value="item 1", context_variables=context_variables),
+            lambda: Result.model_construct(value="item 1", context_variables=context_variables),
+        ),
+        "construct/response": (
+            lambda: Response(messages=history, agent=agent, context_variables=context_variables),
+            lambda: Response.model_construct(
+                messages=history, agent=agent, context_variables=context_variables
+            ),
+        ),
+    }
+
+
+def merges(fan_out):
+    swarm = Swarm(client=SyntheticClient([{"content": ""}]))
+    prepared = [
+        (
+            ChatCompletionMessageToolCall(
+                id=f"call_{i}",
+                type="function",
+                function=Function(name="lookup", arguments="{}"),
+            ),
+            "lookup",
+            len,
+            {},
+        )
+        for i in range(fan_out)
+    ]
+    strings = [f"item {i}" for i in range(fan_out)]
+    results = [Result(value=f"item {i}", context_variables={"seen": i}) for i in range(fan_out)]
+    return {
+        "merge/str": lambda: swarm.merge_tool_results(prepared, strings, False),
+        "merge/result": lambda: swarm.merge_tool_results(prepared, results, False),
+    }
+
+
+def measure(func, iterations, per=1):
+    timer = timeit.Timer(func)
+    return min(timer.repeat(repeat=5, number=iterations)) / iterations / per * 1e6
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--history", type=int, default=200, help="messages per Response")
+    parser.add_argument("--fan-out", type=int, default=8, help="tool calls per merge")
+    options = parser.parse_args(argv)
+
+    print(f"{'case':<22}{'validated':>12}{'construct':>12}   (us per object)")
+    for name, (validated, fast) in constructions(options.history).items():
+        print(
+            f"{name:<22}{measure(validated, options.iterations):>12.3f}"
+            f"{measure(fast, options.iterations):>12.3f}"
+        )
+    print(f"{'case':<22}{'us/call':>12}")
+    for name, merge in merges(options.fan_out).items():
+        per_call = measure(merge, options.iterations // options.fan_out or 1, options.fan_out)
+        print(f"{name:<22}{per_call:>12.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+import json
+import time
+from types import SimpleNamespace
+
+from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice as ChunkChoice,
+    ChoiceDelta,
+)
+
+from swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
+
+
+def make_completion(content="", tool_calls=()):
+    return ChatCompletion(
+        id="bench_cc_id",
+        created=0,
+        model="gpt-4o",
+        object="chat.completion",
+        choices=[
+            Choice(
+                message=ChatCompletionMessage(
+                    role="assistant",
+                    content=content,
+                    tool_calls=[
+                        ChatCompletionMessageToolCall(
+                            id=f"bench_tc_{i}",
+                            type="function",
+                            function=Function(name=name, arguments=json.dumps(args)),
+                        )
+                        for i, (name, args) in enumerate(tool_calls)
+                    ]
+                    or None,
+                ),
+                finish_reason="stop",
+                index=0,
+            )
+        ],
+    )
+
+
+def _chunk(delta):
+    return ChatCompletionChunk(
+        id="bench_chunk_id",
+        created=0,
+        model="gpt-4o",
+        object="chat.completion.chunk",
+        choices=[ChunkChoice(delta=ChoiceDelta(**delta), index=0, finish_reason=None)],
+    )
+
+
+def make_chunks(content="", tool_calls=(), chunks=32):
+    """Split a reply into roughly `chunks` stream chunks, like a real token stream."""
+    out = [_chunk({"role": "assistant"})]
+    pieces = []
+    if content:
+        size = max(1, len(content) // chunks)
+        pieces = [
+            {"content": content[i: i + size]} for i in range(0, len(content), size)
+        ]
+    out.extend(_chunk(piece) for piece in pieces)
+    for index, (name, args) in enumerate(tool_calls):
+        out.append(
+            _chunk(
+                {
+                    "tool_calls": [
+                        {
+                            "index": index,
+                            "id": f"bench_tc_{index}",
+                            "type": "function",
+                            "function": {"name": name, "arguments": ""},
+                        }
+                    ]
+                }
+            )
+        )
+        arguments = json.dumps(args)
+        size = max(1, len(arguments) // max(1, chunks // max(1, len(tool_calls))))
+        out.extend(
+            _chunk(
+                {
+                    "tool_calls": [
+                        {"index": index, "function": {"arguments": arguments[i: i + size]}}
+                    ]
+                }
+            )
+            for i in range(0, len(arguments), size)
+        )
+    return out
+
+
+class SyntheticClient:
+    """
+    OpenAI-compatible client that plays a fixed script of replies, sleeping for
+    `latency` seconds per request and `chunk_interval` seconds per streamed chunk.
+
+    Replies are built once up front so the benchmark measures Swarm rather than
+    response construction. `injected` accumulates the time spent sleeping, which
+    is subtracted from wall time to get framework overhead.
+    """
+
+    def __init__(self, script, latency=0.0, chunk_interval=0.0, chunks=32):
+        self.latency = latency
+        self.chunk_interval = chunk_interval
+        self._completions = [make_completion(**reply) for reply in script]
+        self._streams = [make_chunks(chunks=chunks, **reply) for reply in script]
+        self._position = 0
+        self.injected = 0.0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def reset(self):
+        self._position = 0
+        self.injected = 0.0
+
+    def _sleep(self, seconds):
+        if seconds:
+            # count the time actually slept, oversleep included
+            start = time.perf_counter()
+            time.sleep(seconds)
+            self.injected += time.perf_counter() - start
+
+    def create(self, stream=False, **params):
+        index = self._position % len(self._completions)
+        self._position += 1
+        self._sleep(self.latency)
+        if not stream:
+            return self._completions[index]
+        return self._stream(self._streams[index])
+
+    def _stream(self, chunks):
+        for chunk in chunks:
+            self._sleep(self.chunk_interval)
+            yield chunk
@@ -29,20 +29,24 @@ def transfer_to_triage():
     return triage_agent
 
 
-def triage_instructions(context_variables):
-    customer_context = context_variables.get("customer_context", None)
-    flight_context = context_variables.get("flight_context", None)
-    return f"""You are to triage a users request, and call a tool to transfer to the right intent.
+TRIAGE_INSTRUCTIONS = """You are to triage a users request, and call a tool to transfer to the right intent.
     Once you are ready to transfer to the right intent, call the tool to transfer to the right intent.
     You dont need to know specifics, just the topic of the request.
     When you need more information to triage the request to an agent, ask a direct question without explaining why you're asking it.
-    Do not share your thought process with the user! Do not make unreasonable assumptions on behalf of user.
-    The customer context is here: {customer_context}, and flight context is here: {flight_context}"""
+    Do not share your thought process with the user! Do not make unreasonable assumptions on behalf of user."""
+
+
+def triage_context(context_variables):
+    # kept out of the static instructions so the system prompt prefix stays cacheable
+    customer_context = context_variables.get("customer_context", None)
+    flight_context = context_variables.get("flight_context", None)
+    return f"The customer context is here: {customer_context}, and flight context is here: {flight_context}"
 
 
 triage_agent = Agent(
     name="Triage Agent",
-    instructions=triage_instructions,
+    instructions=TRIAGE_INSTRUCTIONS,
+    context_instructions=triage_context,
     functions=[transfer_to_flight_modification, transfer_to_lost_baggage],
 )
 
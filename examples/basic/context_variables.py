@@ -18,6 +18,7 @@ def print_account_details(context_variables: dict):
 agent = Agent(
     name="Agent",
     instructions=instructions,
+    instructions_depends_on=["name"],
     functions=[print_account_details],
 )
 
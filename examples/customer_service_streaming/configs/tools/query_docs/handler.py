@@ -2,6 +2,8 @@ from openai import OpenAI
 from src.utils import get_completion
 import qdrant_client
 import re
+from swarm.embeddings import BatchingEmbedder, EmbeddingCache
+from swarm.tool_cache import ToolResultCache
 
 # # # Initialize connections
 client = OpenAI()
@@ -11,16 +13,24 @@ qdrant = qdrant_client.QdrantClient(host='localhost')#, prefer_grpc=True)
 # # TODO: Add this to global config
 EMBEDDING_MODEL = 'text-embedding-3-large'
 
+# # Query embeddings are cached across restarts and batched across threads
+embedder = BatchingEmbedder(
+    client,
+    model=EMBEDDING_MODEL,
+    cache=EmbeddingCache(path='query_embeddings.sqlite'),
+)
+
 # # # Set qdrant collection
 collection_name = 'help_center'
 
+# # # Repeated queries reuse the earlier search for ten minutes
+QUERY_CACHE_TTL = 600
+query_cache = ToolResultCache(max_entries=256)
+
 # # # Query function for qdrant
 def query_qdrant(query, collection_name, vector_name='article', top_k=5):
     # Creates embedding vector from user query
-    embedded_query = client.embeddings.create(
-        input=query,
-        model=EMBEDDING_MODEL,
-    ).data[0].embedding
+    embedded_query = embedder.embed(query)
 
     query_results = qdrant.search(
         collection_name=collection_name,
@@ -34,6 +44,11 @@ def query_qdrant(query, collection_name, vector_name='article', top_k=5):
 
 
 def query_docs(query):
+    search = query_cache.wrap(search_docs, 'query_docs', {'query': query}, QUERY_CACHE_TTL)
+    return search(query=query)
+
+
+def search_docs(query):
     print(f'Searching knowledge base with query: {query}')
     query_results = query_qdrant(query,collection_name=collection_name)
     output = []
@@ -4,7 +4,9 @@ import qdrant_client
 from openai import OpenAI
 
 from swarm import Agent
+from swarm.embeddings import BatchingEmbedder, EmbeddingCache
 from swarm.repl import run_demo_loop
+from swarm.tool_cache import cached_tool
 
 # Initialize connections
 client = OpenAI()
@@ -16,17 +18,17 @@ EMBEDDING_MODEL = "text-embedding-3-large"
 # Set qdrant collection
 collection_name = "help_center"
 
+# Query embeddings are cached across restarts and batched across sessions
+embedder = BatchingEmbedder(
+    client,
+    model=EMBEDDING_MODEL,
+    cache=EmbeddingCache(path="query_embeddings.sqlite"),
+)
+
 
 def query_qdrant(query, collection_name, vector_name="article", top_k=5):
     # Creates embedding vector from user query
-    embedded_query = (
-        client.embeddings.create(
-            input=query,
-            model=EMBEDDING_MODEL,
-        )
-        .data[0]
-        .embedding
-    )
+    embedded_query = embedder.embed(query)
 
     query_results = qdrant.search(
         collection_name=collection_name,
@@ -37,6 +39,8 @@ def query_qdrant(query, collection_name, vector_name="article", top_k=5):
     return query_results
 
 
+# identical questions within ten minutes reuse the earlier search
+@cached_tool(ttl=600)
 def query_docs(query):
     """Query the knowledge base for relevant articles."""
     print(f"Searching knowledge base with query: {query}")
@@ -1,80 +1,65 @@
-import json
 import os
+import uuid
 
-import pandas as pd
 import qdrant_client
 from openai import OpenAI
 from qdrant_client.http import models as rest
 
+from swarm.ingest import Checkpoint, IngestPipeline, iter_json_documents, openai_embedder
+
 client = OpenAI()
 GPT_MODEL = "gpt-4o"
 EMBEDDING_MODEL = "text-embedding-3-large"
 
-article_list = os.listdir("data")
-
-articles = []
-
-for x in article_list:
-    article_path = "data/" + x
-
-    # Opening JSON file
-    f = open(article_path)
-
-    # returns JSON object as
-    # a dictionary
-    data = json.load(f)
-
-    articles.append(data)
-
-    # Closing file
-    f.close()
-
-for i, x in enumerate(articles):
-    try:
-        embedding = client.embeddings.create(model=EMBEDDING_MODEL, input=x["text"])
-        articles[i].update({"embedding": embedding.data[0].embedding})
-    except Exception as e:
-        print(x["title"])
-        print(e)
-
 qdrant = qdrant_client.QdrantClient(host="localhost")
-qdrant.get_collections()
 
 collection_name = "help_center"
 
-vector_size = len(articles[0]["embedding"])
-vector_size
-
-article_df = pd.DataFrame(articles)
-article_df.head()
+# Progress of an interrupted run; delete it to rebuild the collection from scratch
+checkpoint_path = "prep_data.checkpoint"
 
-# Delete the collection if it exists, so we can rewrite it changes to articles were made
-if qdrant.get_collection(collection_name=collection_name):
+# Start over unless resuming, so changes to articles are picked up
+if not os.path.exists(checkpoint_path) and qdrant.collection_exists(collection_name):
     qdrant.delete_collection(collection_name=collection_name)
 
-# Create Vector DB collection
-qdrant.create_collection(
-    collection_name=collection_name,
-    vectors_config={
-        "article": rest.VectorParams(
-            distance=rest.Distance.COSINE,
-            size=vector_size,
-        )
-    },
-)
 
-# Populate collection with vectors
-
-qdrant.upsert(
-    collection_name=collection_name,
-    points=[
-        rest.PointStruct(
-            id=k,
-            vector={
-                "article": v["embedding"],
+def upsert(records):
+    # Create Vector DB collection once the vector size is known
+    if not qdrant.collection_exists(collection_name):
+        qdrant.create_collection(
+            collection_name=collection_name,
+            vectors_config={
+                "article": rest.VectorParams(
+                    distance=rest.Distance.COSINE,
+                    size=len(records[0]["vector"]),
+                )
             },
-            payload=v.to_dict(),
         )
-        for k, v in article_df.iterrows()
-    ],
+
+    qdrant.upsert(
+        collection_name=collection_name,
+        points=[
+            rest.PointStruct(
+                id=str(uuid.uuid5(uuid.NAMESPACE_URL, record["id"])),
+                vector={
+                    "article": record["vector"],
+                },
+                payload=record["payload"],
+            )
+            for record in records
+        ],
+    )
+
+
+# Populate collection with vectors, embedding articles in batches
+pipeline = IngestPipeline(
+    embed_batch=openai_embedder(client, EMBEDDING_MODEL),
+    upsert=upsert,
+    checkpoint=Checkpoint(checkpoint_path),
 )
+stats = pipeline.run(iter_json_documents("data"))
+print(f"Stored {stats['stored']} articles, {stats['failed']} failed")
+
+# Keep the checkpoint only if something is left to retry
+if not stats["failed"] and os.path.exists(checkpoint_path):
+    os.remove(checkpoint_path)
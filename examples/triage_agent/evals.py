@@ -17,7 +17,7 @@ It is possible that the user is not satisfied with the answer, but the agent sti
 
 
 def conversation_was_successful(messages) -> bool:
-    conversation = f"CONVERSATION: {json.dumps(messages)}"
+    conversation = f"CONVERSATION: {json.dumps(messages, default=dict)}"
     result: BoolEvalResult = evaluate_with_llm_bool(
         CONVERSATIONAL_EVAL_SYSTEM_PROMPT, conversation
     )
@@ -1,6 +1,6 @@
 import panel as pn
 from typing import Optional, Dict, List
-from swarm import Swarm, Agent
+from swarm import Swarm, Agent, Session
 
 class SwarmChatInterface:
     def __init__(self, swarm_client: Optional[Swarm] = None):
@@ -24,8 +24,8 @@ class SwarmChatInterface:
             height=600
         )
         
-        # Initialize message history and context
-        self.messages: List[Dict] = []
+        # Conversation state kept server-side, created once the name is known
+        self._session: Optional[Session] = None
         self.context_variables: Dict = {
             'customer_name': None,
             'last_order_id': None
@@ -54,16 +54,18 @@ class SwarmChatInterface:
             )
             return
 
-        # Add user message to history
-        self.messages.append({"role": "user", "content": contents})
-        
         try:
-            # Get response from Swarm with default agent
-            response = self.swarm.run(
-                agent=self.default_agent,
-                messages=self.messages,
-                context_variables=self.context_variables
-            )
+            # Start the session lazily so the first turn can use its context
+            if self._session is None:
+                self._session = self.swarm.session(
+                    agent=self.default_agent,
+                    context_variables=self.context_variables
+                )
+            else:
+                self._session.context_variables.update(self.context_variables)
+            
+            # Only the new message is sent; history lives in the session
+            response = self._session.send(contents)
             
             # Process agent response
             if response.messages:
@@ -75,8 +77,7 @@ class SwarmChatInterface:
                     respond=False
                 )
                 
-                # Update message history and context
-                self.messages = response.messages
+                # Update context
                 if response.context_variables:
                     self.context_variables.update(response.context_variables)
                     
@@ -89,6 +90,11 @@ class SwarmChatInterface:
                 respond=False
             )
 
+    @property
+    def messages(self) -> List[Dict]:
+        """Full conversation history of the session"""
+        return self._session.messages if self._session is not None else []
+
     def get_panel(self) -> pn.viewable.Viewable:
         """Return the Panel component for rendering"""
         return self.chat_interface
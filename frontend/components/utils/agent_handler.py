@@ -1,5 +1,5 @@
 from typing import Dict, List, Optional, Any
-from swarm import Swarm, Agent, Response
+from swarm import Swarm, Agent, Response, Session
 
 class AgentHandler:
     """
@@ -7,16 +7,19 @@ class AgentHandler:
     Handles agent initialization, message routing, and response processing.
     """
     
-    def __init__(self, swarm_client: Optional[Swarm] = None):
+    def __init__(self, swarm_client: Optional[Swarm] = None, agent: Optional[Agent] = None):
         # Initialize Swarm client or use provided one
         self.swarm = swarm_client or Swarm()
         
         # Track current active agent
-        self._current_agent: Optional[Agent] = None
+        self._current_agent: Optional[Agent] = agent
         
         # Store last response for context
         self._last_response: Optional[Response] = None
         
+        # Conversation state kept server-side, created on first message
+        self._session: Optional[Session] = None
+        
     def process_message(self, message: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process a user message through the appropriate Swarm agent
@@ -32,15 +35,17 @@ class AgentHandler:
                 - tool_calls: Any tools called during processing
         """
         try:
-            # Prepare message format for Swarm
-            formatted_message = {"role": "user", "content": message}
+            # Start the session lazily so the first turn can use its context
+            if self._session is None:
+                self._session = self.swarm.session(
+                    agent=self._current_agent or Agent(),
+                    context_variables=context
+                )
+            else:
+                self._session.context_variables.update(context)
             
-            # Get response from Swarm
-            response = self.swarm.run(
-                agent=self._current_agent,  # Will use default if None
-                messages=[formatted_message],
-                context_variables=context
-            )
+            # Only the new message is sent; history lives in the session
+            response = self._session.send(message)
             
             # Store response and update current agent
             self._last_response = response
@@ -1,4 +1,6 @@
 from .core import Swarm
+from .async_core import AsyncSwarm
+from .session import Session
 from .types import Agent, Response
 
-__all__ = ["Swarm", "Agent", "Response"]
+__all__ = ["Swarm", "AsyncSwarm", "Session", "Agent", "Response"]
@@ -0,0 +1,379 @@
+# Standard library imports
+import asyncio
+import functools
+import inspect
+from concurrent.futures import Executor
+from typing import Callable, List, Optional, Union
+
+# Package/library imports
+from openai import AsyncOpenAI
+
+
+# Local imports
+from .cache import CompletionCache
+from .core import Swarm
+from .events import (
+    AgentHandoff,
+    MessageEnd,
+    MessageStart,
+    RunComplete,
+    ToolResult,
+)
+from .history import MessageLog
+from .message import Message
+from .prefix import StablePrefix
+from .session import AsyncSession
+from .speculative import AsyncSpeculativeToolCalls
+from .tool_cache import ToolResultCache
+from .tools import ToolRegistry
+from .tracing import Tracer, TurnTrace
+from .util import debug_print
+from .streaming import StreamAccumulator
+from .types import (
+    Agent,
+    AgentFunction,
+    ChatCompletionMessage,
+    ChatCompletionMessageToolCall,
+    Function,
+    Response,
+)
+
+
+class AsyncSwarm(Swarm):
+    """
+    asyncio counterpart of `Swarm`, driven by an `AsyncOpenAI`-compatible client.
+
+    Coroutine agent functions are awaited on the event loop; plain functions are
+    offloaded to `tool_executor` (the loop's default executor when None) so a slow
+    tool never blocks other conversations sharing the loop. With
+    `concurrent_tool_calls`, the tool calls of one assistant message are
+    gathered instead of awaited one after another. With `speculative_tools`,
+    streamed runs start each tool call as a task as soon as its arguments have
+    streamed in.
+    """
+
+    session_class = AsyncSession
+    # speculative tool calls run as tasks on the loop
+    speculation_needs_executor = False
+
+    def __init__(
+        self,
+        client=None,
+        tool_executor: Optional[Executor] = None,
+        concurrent_tool_calls: bool = False,
+        cache: Optional[CompletionCache] = None,
+        tracer: Optional[Tracer] = None,
+        speculative_tools: bool = False,
+        context_policy: Optional[Callable] = None,
+        stable_prefix: Optional[StablePrefix] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+    ):
+        """
+        Args:
+            client: `AsyncOpenAI`-compatible client, defaults to `AsyncOpenAI()`.
+            tool_executor: Optional executor running plain (non-coroutine) agent
+                functions; the loop's default executor when None.
+            concurrent_tool_calls: Gather the tool calls of one assistant message
+                instead of awaiting them one after another.
+            speculative_tools: When streaming, start each tool call as a task as
+                soon as its arguments have streamed in.
+
+        The other arguments are those of `Swarm`.
+        """
+        super().__init__(
+            client=client or AsyncOpenAI(),
+            tool_executor=tool_executor,
+            cache=cache,
+            tracer=tracer,
+            speculative_tools=speculative_tools,
+            context_policy=context_policy,
+            stable_prefix=stable_prefix,
+            tool_cache=tool_cache,
+        )
+        self.concurrent_tool_calls = concurrent_tool_calls
+
+    async def abuild_completion_params(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+    ) -> dict:
+        """
+        `build_completion_params`, awaiting context policies that provide an
+        `aprompt` coroutine (e.g. a `SummarizingWindow` calling a model) so they
+        do not block the event loop.
+        """
+        context_policy = agent.context_policy or self.context_policy
+        aprompt = getattr(context_policy, "aprompt", None)
+        if aprompt is None:
+            return self.build_completion_params(
+                agent, history, context_variables, model_override, stream, debug
+            )
+        history, instructions, context = self._system_prompt(
+            agent, history, context_variables
+        )
+        if not isinstance(history, MessageLog):
+            history = MessageLog(history)
+        messages = await aprompt(history, {"role": "system", "content": instructions})
+        return self._completion_params(
+            agent, history, messages, instructions, context, model_override, stream, debug
+        )
+
+    async def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+    ) -> ChatCompletionMessage:
+        create_params = await self.abuild_completion_params(
+            agent=agent,
+            history=history,
+            context_variables=context_variables,
+            model_override=model_override,
+            stream=stream,
+            debug=debug,
+        )
+        if self.cache is not None:
+            return await self.cache.aget_or_create(
+                create_params,
+                lambda: self.client.chat.completions.create(**create_params),
+            )
+        return await self.client.chat.completions.create(**create_params)
+
+    async def call_function(self, func: AgentFunction, args: dict):
+        if inspect.iscoroutinefunction(func):
+            return await func(**args)
+        loop = asyncio.get_running_loop()
+        raw_result = await loop.run_in_executor(
+            self.tool_executor, functools.partial(func, **args)
+        )
+        # sync wrappers around coroutines still need awaiting
+        if inspect.isawaitable(raw_result):
+            raw_result = await raw_result
+        return raw_result
+
+    async def execute_functions(self, calls: List[tuple]) -> List:
+        if not self.concurrent_tool_calls or len(calls) < 2:
+            return [await self.call_function(func, args) for func, args in calls]
+        return await asyncio.gather(
+            *(self.call_function(func, args) for func, args in calls)
+        )
+
+    async def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: Union[List[AgentFunction], ToolRegistry],
+        context_variables: dict,
+        debug: bool,
+        trace: Optional[TurnTrace] = None,
+    ) -> Response:
+        prepared = self.prepare_tool_calls(
+            tool_calls, functions, context_variables, debug
+        )
+        if trace is None:
+            calls = [(func, args) for _, _, func, args in prepared if func]
+        else:
+            calls = [
+                (trace.wrap_tool(func, name, tool_call.id), args)
+                for tool_call, name, func, args in prepared
+                if func
+            ]
+        raw_results = await self.execute_functions(calls)
+        return self.merge_tool_results(prepared, raw_results, debug)
+
+    async def run_and_stream(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        events: bool = False,
+    ):
+        """
+        Stream a run. Yields raw delta dicts framed by `{"delim": ...}` markers
+        and ending with `{"response": Response}`, or with `events=True` the typed
+        events of `swarm.events`, ending with `RunComplete`.
+        """
+        active_agent = agent
+        context_variables, history, init_len, trace = self._start_run(
+            agent, messages, context_variables
+        )
+
+        speculative = None
+        try:
+            while len(history) - init_len < max_turns:
+
+                speculative = None
+                if self.speculative_tools and execute_tools:
+                    speculative = AsyncSpeculativeToolCalls(
+                        self, active_agent.tool_registry(), context_variables, debug, trace
+                    )
+                accumulator = StreamAccumulator(
+                    sender=active_agent.name,
+                    on_tool_call=speculative.dispatch if speculative is not None else None,
+                )
+
+                # get completion with current history, agent
+                if trace is not None:
+                    trace.completion_request(
+                        active_agent, model_override or active_agent.model, True
+                    )
+                completion = await self.get_chat_completion(
+                    agent=active_agent,
+                    history=history,
+                    context_variables=context_variables,
+                    model_override=model_override,
+                    stream=True,
+                    debug=debug,
+                )
+
+                if trace is not None:
+                    completion = trace.awatch_stream(completion, active_agent)
+
+                if events:
+                    yield MessageStart(active_agent.name)
+                    async for chunk in completion:
+                        for event in accumulator.add_events(chunk):
+                            yield event
+                    for event in accumulator.finish():
+                        yield event
+                else:
+                    yield {"delim": "start"}
+                    async for chunk in completion:
+                        delta = accumulator.add(chunk)
+                        if delta is not None:
+                            yield delta
+                    yield {"delim": "end"}
+
+                message = accumulator.message()
+                debug_print(debug, "Received completion:", message)
+                history.append(message)
+                if events:
+                    yield MessageEnd(message)
+
+                if not message["tool_calls"] or not execute_tools:
+                    debug_print(debug, "Ending turn.")
+                    break
+
+                # convert tool_calls to objects
+                tool_calls = []
+                for tool_call in message["tool_calls"]:
+                    function = Function(
+                        arguments=tool_call["function"]["arguments"],
+                        name=tool_call["function"]["name"],
+                    )
+                    tool_call_object = ChatCompletionMessageToolCall(
+                        id=tool_call["id"], function=function, type=tool_call["type"]
+                    )
+                    tool_calls.append(tool_call_object)
+
+                # handle function calls, updating context_variables, and switching agents
+                if speculative is not None:
+                    partial_response = await speculative.join(tool_calls)
+                else:
+                    partial_response = await self.handle_tool_calls(
+                        tool_calls, active_agent.tool_registry(), context_variables, debug, trace
+                    )
+                previous_agent = active_agent
+                active_agent = self._apply_tool_results(
+                    partial_response, active_agent, history, context_variables, trace
+                )
+                if events:
+                    for result in partial_response.messages:
+                        yield ToolResult(
+                            result["tool_call_id"], result["tool_name"], result["content"]
+                        )
+                    if partial_response.agent:
+                        yield AgentHandoff(previous_agent, partial_response.agent)
+        except BaseException as e:
+            # drop tool calls started for a message the run will not record
+            if speculative is not None:
+                speculative.cancel()
+            # close the turn's open spans if the run raised or its stream was
+            # abandoned
+            if trace is not None:
+                trace.turn_end(active_agent, len(history) - init_len, repr(e))
+            raise
+
+        response = self._end_run(active_agent, history, init_len, context_variables, trace)
+        yield RunComplete(response) if events else {"response": response}
+
+    async def run(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        stream: bool = False,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        events: bool = False,
+    ) -> Response:
+        if stream:
+            return self.run_and_stream(
+                agent=agent,
+                messages=messages,
+                context_variables=context_variables,
+                model_override=model_override,
+                debug=debug,
+                max_turns=max_turns,
+                execute_tools=execute_tools,
+                events=events,
+            )
+        active_agent = agent
+        context_variables, history, init_len, trace = self._start_run(
+            agent, messages, context_variables
+        )
+
+        try:
+            while len(history) - init_len < max_turns and active_agent:
+
+                # get completion with current history, agent
+                if trace is not None:
+                    trace.completion_request(
+                        active_agent, model_override or active_agent.model, stream
+                    )
+                completion = await self.get_chat_completion(
+                    agent=active_agent,
+                    history=history,
+                    context_variables=context_variables,
+                    model_override=model_override,
+                    stream=stream,
+                    debug=debug,
+                )
+                message = completion.choices[0].message
+                if trace is not None:
+                    trace.first_token(active_agent)
+                    trace.last_token(active_agent)
+                debug_print(debug, "Received completion:", message)
+                history.append(Message.from_completion(message, active_agent.name))
+
+                if not message.tool_calls or not execute_tools:
+                    debug_print(debug, "Ending turn.")
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                partial_response = await self.handle_tool_calls(
+                    message.tool_calls, active_agent.tool_registry(), context_variables, debug, trace
+                )
+                active_agent = self._apply_tool_results(
+                    partial_response, active_agent, history, context_variables, trace
+                )
+        except BaseException as e:
+            # close the turn's open spans if the run raised or its stream was
+            # abandoned
+            if trace is not None:
+                trace.turn_end(active_agent, len(history) - init_len, repr(e))
+            raise
+
+        return self._end_run(active_agent, history, init_len, context_variables, trace)
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Callable, Optional
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+
+def _json_default(obj):
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def request_key(params: dict) -> str:
+    """Stable hash of a chat completion request over all of its parameters."""
+    canonical = json.dumps(
+        params,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class CompletionCache:
+    """
+    Opt-in cache of chat completions keyed on the full request parameters.
+
+    Entries live in an in-memory LRU tier and, when `path` is given, in a SQLite
+    tier that survives restarts. Both tiers evict on `ttl` (seconds) and on size.
+    Streamed completions are cached as their chunk sequence and replayed as
+    chunks, so `stream=True` callers see the same shape as a live stream.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        max_disk_entries: int = 100_000,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS completions ("
+                    "key TEXT PRIMARY KEY, payload TEXT, "
+                    "expires_at REAL, accessed_at REAL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS completions_accessed "
+                    "ON completions (accessed_at)"
+                )
+
+    def get(self, key: str) -> Optional[dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._memory[key]
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT payload, expires_at FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    payload, expires_at = row
+                    if expires_at is None or expires_at > now:
+                        with self._conn:
+                            self._conn.execute(
+                                "UPDATE completions SET accessed_at = ? WHERE key = ?",
+                                (now, key),
+                            )
+                        value = json.loads(payload)
+                        self._remember(key, expires_at, value)
+                        self.hits += 1
+                        return value
+                    with self._conn:
+                        self._conn.execute(
+                            "DELETE FROM completions WHERE key = ?", (key,))
+
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: dict) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO completions "
+                        "(key, payload, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                        (key, json.dumps(value), expires_at, now),
+                    )
+                    self._conn.execute(
+                        "DELETE FROM completions WHERE expires_at <= ?", (now,))
+                    self._conn.execute(
+                        "DELETE FROM completions WHERE key IN ("
+                        "SELECT key FROM completions ORDER BY accessed_at DESC "
+                        "LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,),
+                    )
+
+    def _remember(self, key, expires_at, value) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM completions")
+
+    def get_or_create(self, params: dict, create: Callable):
+        """
+        Return the cached completion for `params`, or call `create()` and cache its
+        result. Streams are cached once they have been fully consumed.
+        """
+        key = request_key(params)
+        value = self.get(key)
+        if value is not None:
+            return self._restore(value)
+        if params.get("stream"):
+            return self._record_stream(key, create())
+        completion = create()
+        self.set(key, {"completion": completion.model_dump_json()})
+        return completion
+
+    async def aget_or_create(self, params: dict, create: Callable):
+        """`get_or_create` for an async client; `create()` returns an awaitable."""
+        key = request_key(params)
+        value = self.get(key)
+        if value is not None:
+            if "chunks" in value:
+                return self._areplay(value["chunks"])
+            return self._restore(value)
+        if params.get("stream"):
+            return self._arecord_stream(key, await create())
+        completion = await create()
+        self.set(key, {"completion": completion.model_dump_json()})
+        return completion
+
+    def _restore(self, value: dict):
+        # always hand out fresh objects: callers annotate completions in place
+        if "chunks" in value:
+            return self._replay(value["chunks"])
+        return ChatCompletion.model_validate_json(value["completion"])
+
+    def _replay(self, chunks):
+        for chunk in chunks:
+            yield ChatCompletionChunk.model_validate_json(chunk)
+
+    async def _areplay(self, chunks):
+        for chunk in chunks:
+            yield ChatCompletionChunk.model_validate_json(chunk)
+
+    def _record_stream(self, key, stream):
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk.model_dump_json())
+            yield chunk
+        self.set(key, {"chunks": chunks})
+
+    async def _arecord_stream(self, key, stream):
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk.model_dump_json())
+            yield chunk
+        self.set(key, {"chunks": chunks})
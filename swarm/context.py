@@ -0,0 +1,263 @@
+import asyncio
+import functools
+import inspect
+from typing import Callable, List, Optional, Sequence
+
+from .history import MessageLog
+from .util import estimate_message_tokens
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+class SlidingWindow:
+    """
+    Context policy bounding the prompt to roughly `max_tokens` estimated tokens.
+
+    A policy is called with the run's `MessageLog` and the rendered system
+    message and returns the messages to send. The system prompt is always sent,
+    as are history messages whose role is in `pinned_roles`; of the rest, the
+    most recent messages that fit are kept. An assistant message with tool calls
+    and its tool results are kept or dropped together, since the API rejects
+    tool results without their call, and the latest such group is always kept.
+
+    When the window overflows, its start moves forward until the prompt is back
+    under `low_water * max_tokens`, and then stays put until the next overflow:
+    evictions happen in batches rather than every turn, which also keeps the
+    prompt prefix stable between them. Token counts are estimated with
+    `estimate_message_tokens` and cached on the history, so each turn only
+    counts its new messages.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        low_water: float = 0.75,
+        pinned_roles: Sequence[str] = ("system",),
+    ):
+        self.max_tokens = max_tokens
+        self.low_water = low_water
+        self.pinned_roles = tuple(pinned_roles)
+
+    def __call__(self, history: MessageLog, system: dict) -> List[dict]:
+        state, start, evicted = self._advance(history, system)
+        if evicted:
+            self._evict(state, evicted)
+        return self._assemble(history, state, start, system)
+
+    async def aprompt(self, history: MessageLog, system: dict) -> List[dict]:
+        """`__call__` for `AsyncSwarm`, which awaits it."""
+        state, start, evicted = self._advance(history, system)
+        if evicted:
+            await self._aevict(state, evicted)
+        return self._assemble(history, state, start, system)
+
+    def _advance(self, history: MessageLog, system: dict):
+        """Move the window start if the prompt overflows; returns the evicted messages."""
+        counts = history.token_counts()
+        state = self._state(history)
+        pinned = self._pinned(history, state, counts)
+        budget = self.max_tokens - estimate_message_tokens(system)
+        budget -= state["pinned_tokens"]
+        budget -= self._reserved(state)
+
+        start = state["start"]
+        evicted = []
+        if self._cost(history, counts, start, len(history)) > budget:
+            start = self._window_start(history, counts, start, budget * self.low_water)
+            evicted = [
+                message for message in history[state["start"]:start]
+                if message["role"] not in self.pinned_roles
+            ]
+            state["start"] = start
+            state["boundary"] = history[start - 1] if start else None
+        return state, start, evicted
+
+    def _assemble(self, history, state: dict, start: int, system: dict) -> List[dict]:
+        prompt = [system]
+        prompt.extend(history[i] for i in state["pinned"] if i < start)
+        prompt.extend(self._preamble(state))
+        prompt.extend(history[start:])
+        return prompt
+
+    def _state(self, history: MessageLog) -> dict:
+        state = history.context_state
+        # a rolled-back turn may have removed the window start; start over then
+        if (
+            state is None
+            or state["start"] > len(history)
+            or (state["start"] and history[state["start"] - 1] is not state["boundary"])
+        ):
+            state = history.context_state = {
+                "start": 0,
+                "boundary": None,
+                "pinned": [],
+                "pinned_tokens": 0,
+                "scanned": 0,
+                "scanned_last": None,
+            }
+        return state
+
+    def _pinned(self, history, state: dict, counts: List[int]) -> List[int]:
+        """Indices of pinned messages, scanning only messages added since last turn."""
+        scanned = state["scanned"]
+        if scanned > len(history) or (
+            scanned and history[scanned - 1] is not state["scanned_last"]
+        ):
+            # history was rolled back past the scanned part; rescan it
+            scanned = state["pinned_tokens"] = 0
+            state["pinned"] = []
+        pinned_roles = self.pinned_roles
+        for i in range(scanned, len(history)):
+            if history[i]["role"] in pinned_roles:
+                state["pinned"].append(i)
+                state["pinned_tokens"] += counts[i]
+        state["scanned"] = len(history)
+        state["scanned_last"] = history[-1] if len(history) else None
+        return state["pinned"]
+
+    def _cost(self, history, counts, start: int, stop: int) -> int:
+        pinned_roles = self.pinned_roles
+        return sum(
+            counts[i] for i in range(start, stop)
+            if history[i]["role"] not in pinned_roles
+        )
+
+    def _window_start(self, history, counts, start: int, budget: float) -> int:
+        end = len(history)
+        while end > start:
+            unit_start = max(self._unit_start(history, end), start)
+            cost = self._cost(history, counts, unit_start, end)
+            # the latest message group is always kept, even over budget
+            if end < len(history) and cost > budget:
+                break
+            budget -= cost
+            end = unit_start
+        return end
+
+    @staticmethod
+    def _unit_start(history, end: int) -> int:
+        i = end - 1
+        while i > 0 and history[i]["role"] == "tool":
+            i -= 1
+        return i
+
+    def _reserved(self, state: dict) -> int:
+        return 0
+
+    def _evict(self, state: dict, evicted: List[dict]) -> None:
+        pass
+
+    async def _aevict(self, state: dict, evicted: List[dict]) -> None:
+        self._evict(state, evicted)
+
+    def _preamble(self, state: dict) -> List[dict]:
+        return []
+
+
+class SummarizingWindow(SlidingWindow):
+    """
+    `SlidingWindow` that folds evicted messages into a rolling summary, sent as a
+    system message right after the system prompt.
+
+    `summarize(messages, previous_summary)` returns the new summary text; it is
+    only called when the window moves, with the newly evicted messages. Use
+    `completion_summarizer` to summarize with a chat model. With `AsyncSwarm`,
+    `summarize` may also be a coroutine function or return an awaitable; plain
+    functions are run in the default executor so they do not block the loop.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        summarize: Callable[[List[dict], Optional[str]], str],
+        low_water: float = 0.75,
+        pinned_roles: Sequence[str] = ("system",),
+        summary_tokens: int = 512,
+    ):
+        super().__init__(max_tokens, low_water, pinned_roles)
+        self.summarize = summarize
+        self.summary_tokens = summary_tokens
+
+    def _reserved(self, state: dict) -> int:
+        return self.summary_tokens
+
+    def _evict(self, state: dict, evicted: List[dict]) -> None:
+        summary = self.summarize(evicted, state.get("summary"))
+        if inspect.isawaitable(summary):
+            close = getattr(summary, "close", None)
+            if close is not None:
+                close()
+            raise TypeError("An async summarize function requires AsyncSwarm.")
+        state["summary"] = summary
+
+    async def _aevict(self, state: dict, evicted: List[dict]) -> None:
+        if inspect.iscoroutinefunction(self.summarize):
+            summary = await self.summarize(evicted, state.get("summary"))
+        else:
+            loop = asyncio.get_running_loop()
+            summary = await loop.run_in_executor(
+                None, functools.partial(self.summarize, evicted, state.get("summary"))
+            )
+            # sync wrappers around coroutines still need awaiting
+            if inspect.isawaitable(summary):
+                summary = await summary
+        state["summary"] = summary
+
+    def _preamble(self, state: dict) -> List[dict]:
+        summary = state.get("summary")
+        if not summary:
+            return []
+        return [{"role": "system", "content": SUMMARY_PREFIX + summary}]
+
+
+def completion_summarizer(
+    client, model: str = "gpt-4o-mini", max_tokens: int = 400
+) -> Callable[[List[dict], Optional[str]], str]:
+    """
+    A `summarize` callable for `SummarizingWindow` backed by a chat model. With
+    an `AsyncOpenAI`-compatible client it returns an awaitable, for `AsyncSwarm`.
+    """
+
+    def request(messages: List[dict], previous: Optional[str]) -> dict:
+        transcript = "\n".join(
+            f"{message['role']}: {message.get('content') or ''}" for message in messages
+        )
+        if previous:
+            transcript = f"Existing summary:\n{previous}\n\nNew messages:\n{transcript}"
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "Summarize the conversation so far in a few sentences, "
+                    "keeping names, numbers, decisions and open requests.",
+                },
+                {"role": "user", "content": transcript},
+            ],
+        }
+
+    def summarize(messages: List[dict], previous: Optional[str]) -> str:
+        completion = client.chat.completions.create(**request(messages, previous))
+        if inspect.isawaitable(completion):
+            return _Content(completion)
+        return completion.choices[0].message.content
+
+    return summarize
+
+
+class _Content:
+    """Awaitable content of a pending async completion."""
+
+    __slots__ = ("completion",)
+
+    def __init__(self, completion):
+        self.completion = completion
+
+    def __await__(self):
+        completion = yield from self.completion.__await__()
+        return completion.choices[0].message.content
+
+    def close(self) -> None:
+        if inspect.iscoroutine(self.completion):
+            self.completion.close()
@@ -2,14 +2,34 @@
 import copy
 import json
 from collections import defaultdict
-from typing import List, Callable, Union
+from concurrent.futures import Executor
+from typing import Dict, Iterable, List, Callable, Optional, Union
 
 # Package/library imports
 from openai import OpenAI
 
 
 # Local imports
-from .util import function_to_json, debug_print, merge_chunk
+from .cache import CompletionCache
+from .util import debug_print
+from .streaming import StreamAccumulator
+from .events import (
+    AgentHandoff,
+    MessageEnd,
+    MessageStart,
+    RunComplete,
+    ToolResult,
+)
+from .history import MessageLog
+from .message import Message
+from .prefix import StablePrefix
+from .session import Session
+from .speculative import SpeculativeToolCalls
+from .stores import SessionStore
+from .tool_cache import ToolResultCache
+from .tools import ToolRegistry, __CTX_VARS_NAME__
+from .tracing import Tracer, TurnTrace
+from .validation import argument_error
 from .types import (
     Agent,
     AgentFunction,
@@ -20,43 +40,158 @@ from .types import (
     Result,
 )
 
-__CTX_VARS_NAME__ = "context_variables"
-
 
 class Swarm:
-    def __init__(self, client=None):
+    session_class = Session
+    # speculative tool calls run on `tool_executor`
+    speculation_needs_executor = True
+
+    def __init__(
+        self,
+        client=None,
+        tool_executor: Optional[Executor] = None,
+        cache: Optional[CompletionCache] = None,
+        tracer: Optional[Tracer] = None,
+        speculative_tools: bool = False,
+        context_policy: Optional[Callable] = None,
+        stable_prefix: Optional[StablePrefix] = None,
+        tool_cache: Optional[ToolResultCache] = None,
+    ):
+        """
+        Args:
+            client: OpenAI-compatible client, defaults to `OpenAI()`.
+            tool_executor: Optional executor (e.g. a `ThreadPoolExecutor`) used to
+                run the tool calls of a single assistant message concurrently.
+                Results are still applied in tool-call order.
+            cache: Optional `CompletionCache` serving repeated identical requests.
+            tracer: Optional `Tracer` receiving turn, completion, tool and handoff
+                events.
+            speculative_tools: When streaming, submit each tool call to
+                `tool_executor` as soon as its arguments have streamed in, instead
+                of after the whole message. Requires `tool_executor`.
+            context_policy: Optional policy bounding the prompt, e.g.
+                `SlidingWindow`; an agent's own `context_policy` takes precedence.
+            stable_prefix: Optional `StablePrefix` keeping system prompts
+                byte-identical across turns for provider-side prompt caching.
+            tool_cache: `ToolResultCache` serving repeated calls of tools marked
+                with `cached_tool` or `Agent.cached_tools`; a private one is
+                created when None.
+        """
+        if speculative_tools and tool_executor is None and self.speculation_needs_executor:
+            raise ValueError("speculative_tools requires a tool_executor.")
         if not client:
             client = OpenAI()
         self.client = client
+        self.tool_executor = tool_executor
+        self.cache = cache
+        self.tracer = tracer
+        self.speculative_tools = speculative_tools
+        self.context_policy = context_policy
+        self.stable_prefix = stable_prefix
+        self.tool_cache = tool_cache if tool_cache is not None else ToolResultCache()
+
+    def session(
+        self,
+        agent: Agent,
+        context_variables: Optional[dict] = None,
+        messages: List = (),
+        **options,
+    ) -> Session:
+        """
+        Start a conversation whose agent, history and context_variables are kept
+        between turns; see `Session.send`. `options` are the `run` options
+        (`model_override`, `debug`, `max_turns`, `execute_tools`) plus an
+        optional `store` and `session_id` to persist each turn.
+        """
+        return self.session_class(
+            self,
+            agent,
+            messages=messages,
+            context_variables=context_variables,
+            **options,
+        )
 
-    def get_chat_completion(
+    def resume_session(
+        self,
+        state: dict,
+        agents: Union[Dict[str, Agent], Iterable[Agent]],
+        **options,
+    ) -> Session:
+        """Restore a session saved with `Session.to_dict`, looking up its agent by name."""
+        return self.session_class.from_dict(self, state, agents, **options)
+
+    def load_session(
+        self,
+        store: SessionStore,
+        session_id: str,
+        agents: Union[Dict[str, Agent], Iterable[Agent]],
+        tail: Optional[int] = None,
+        **options,
+    ) -> Optional[Session]:
+        """
+        Load a session persisted in `store`, reading only its last `tail` messages
+        when given. Later turns keep appending to the same stored session.
+        """
+        state = store.load(session_id, tail=tail)
+        if state is None:
+            return None
+        # a tail must not open with tool results whose tool call was cut off
+        messages = state["messages"]
+        start = 0
+        while start < len(messages) and messages[start]["role"] == "tool":
+            start += 1
+        state["messages"] = messages[start:]
+        return self.session_class.from_dict(
+            self, state, agents, store=store, session_id=session_id, **options
+        )
+
+    def _system_prompt(self, agent: Agent, history: List, context_variables: dict):
+        """Render the system prompt; returns `(history, instructions, context)`."""
+        context_variables = defaultdict(str, context_variables)
+        stable_prefix = self.stable_prefix
+        if stable_prefix is not None:
+            if not isinstance(history, MessageLog):
+                history = MessageLog(history)
+            instructions = stable_prefix.instructions(
+                history,
+                agent,
+                lambda: agent.render_instructions(context_variables),
+            )
+        else:
+            # memoized per conversation, as agents are shared between them
+            memo = history.instructions_memo if isinstance(history, MessageLog) else None
+            instructions = agent.render_instructions(context_variables, memo)
+
+        context = None
+        if agent.context_instructions is not None:
+            context = agent.context_instructions
+            if callable(context):
+                context = context(context_variables)
+            if stable_prefix is None:
+                instructions = f"{instructions}\n\n{context}"
+        return history, instructions, context
+
+    def _completion_params(
         self,
         agent: Agent,
         history: List,
-        context_variables: dict,
+        messages: List,
+        instructions: str,
+        context: Optional[str],
         model_override: str,
         stream: bool,
         debug: bool,
-    ) -> ChatCompletionMessage:
-        context_variables = defaultdict(str, context_variables)
-        instructions = (
-            agent.instructions(context_variables)
-            if callable(agent.instructions)
-            else agent.instructions
-        )
-        messages = [{"role": "system", "content": instructions}] + history
+    ) -> dict:
+        tools = agent.tool_registry().schemas
+        model = model_override or agent.model
+        if self.stable_prefix is not None:
+            if context:
+                messages = messages + [{"role": "system", "content": context}]
+            self.stable_prefix.check(history, agent, model, instructions, tools)
         debug_print(debug, "Getting chat completion for...:", messages)
 
-        tools = [function_to_json(f) for f in agent.functions]
-        # hide context_variables from model
-        for tool in tools:
-            params = tool["function"]["parameters"]
-            params["properties"].pop(__CTX_VARS_NAME__, None)
-            if __CTX_VARS_NAME__ in params["required"]:
-                params["required"].remove(__CTX_VARS_NAME__)
-
         create_params = {
-            "model": model_override or agent.model,
+            "model": model,
             "messages": messages,
             "tools": tools or None,
             "tool_choice": agent.tool_choice,
@@ -66,6 +201,57 @@ class Swarm:
         if tools:
             create_params["parallel_tool_calls"] = agent.parallel_tool_calls
 
+        return create_params
+
+    def build_completion_params(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+    ) -> dict:
+        history, instructions, context = self._system_prompt(
+            agent, history, context_variables
+        )
+        context_policy = agent.context_policy or self.context_policy
+        if context_policy is not None:
+            if not isinstance(history, MessageLog):
+                history = MessageLog(history)
+            messages = context_policy(
+                history, {"role": "system", "content": instructions}
+            )
+        elif isinstance(history, MessageLog):
+            messages = history.with_system(instructions)
+        else:
+            messages = [{"role": "system", "content": instructions}] + history
+        return self._completion_params(
+            agent, history, messages, instructions, context, model_override, stream, debug
+        )
+
+    def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+    ) -> ChatCompletionMessage:
+        create_params = self.build_completion_params(
+            agent=agent,
+            history=history,
+            context_variables=context_variables,
+            model_override=model_override,
+            stream=stream,
+            debug=debug,
+        )
+        if self.cache is not None:
+            return self.cache.get_or_create(
+                create_params,
+                lambda: self.client.chat.completions.create(**create_params),
+            )
         return self.client.chat.completions.create(**create_params)
 
     def handle_function_result(self, result, debug) -> Result:
@@ -86,56 +272,171 @@ class Swarm:
                     debug_print(debug, error_message)
                     raise TypeError(error_message)
 
-    def handle_tool_calls(
+    def prepare_tool_calls(
         self,
         tool_calls: List[ChatCompletionMessageToolCall],
-        functions: List[AgentFunction],
+        functions: Union[List[AgentFunction], ToolRegistry],
         context_variables: dict,
         debug: bool,
-    ) -> Response:
-        function_map = {f.__name__: f for f in functions}
-        partial_response = Response(
-            messages=[], agent=None, context_variables={})
+    ) -> List[tuple]:
+        """
+        Resolve and validate tool calls into `(tool_call, name, func, args)`
+        entries. Calls that cannot run have `func` None, and `args` holds the
+        error message for the model, or None if the tool does not exist.
+        """
+        registry = (
+            functions
+            if isinstance(functions, ToolRegistry)
+            else ToolRegistry(functions)
+        )
+        prepared = []
 
         for tool_call in tool_calls:
             name = tool_call.function.name
+            tool = registry.get(name)
             # handle missing tool case, skip to next tool
-            if name not in function_map:
+            if tool is None:
                 debug_print(debug, f"Tool {name} not found in function map.")
-                partial_response.messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "tool_name": name,
-                        "content": f"Error: Tool {name} not found.",
-                    }
-                )
+                prepared.append((tool_call, name, None, None))
+                continue
+            try:
+                args = json.loads(tool_call.function.arguments or "{}")
+            except json.JSONDecodeError as e:
+                errors = [f"arguments are not valid JSON: {e}"]
+            else:
+                args, errors = tool.validate(args)
+            # rejected calls are not run; the error goes back to the model
+            if errors:
+                debug_print(debug, f"Invalid arguments for tool {name}: {errors}")
+                prepared.append((tool_call, name, None, argument_error(name, errors)))
                 continue
-            args = json.loads(tool_call.function.arguments)
             debug_print(
                 debug, f"Processing tool call: {name} with arguments {args}")
 
-            func = function_map[name]
+            func = tool.function
+            if tool.cache_ttl is not None:
+                func = self.tool_cache.wrap(func, name, args, tool.cache_ttl)
             # pass context_variables to agent functions
-            if __CTX_VARS_NAME__ in func.__code__.co_varnames:
+            if tool.wants_context_variables:
                 args[__CTX_VARS_NAME__] = context_variables
-            raw_result = function_map[name](**args)
+            prepared.append((tool_call, name, func, args))
+
+        return prepared
+
+    def merge_tool_results(
+        self, prepared: List[tuple], raw_results: List, debug: bool
+    ) -> Response:
+        partial_response = Response(
+            messages=[], agent=None, context_variables={})
+        raw_results = iter(raw_results)
+
+        # apply results in tool-call order, however they were executed
+        for tool_call, name, func, args in prepared:
+            if func is None:
+                partial_response.messages.append(
+                    Message(
+                        role="tool",
+                        tool_call_id=tool_call.id,
+                        tool_name=name,
+                        content=args or f"Error: Tool {name} not found.",
+                    )
+                )
+                continue
 
-            result: Result = self.handle_function_result(raw_result, debug)
+            raw_result = next(raw_results)
+            if type(raw_result) is str:
+                # most tools return plain strings, which need no Result wrapper
+                content = raw_result
+            else:
+                result: Result = self.handle_function_result(raw_result, debug)
+                content = result.value
+                partial_response.context_variables.update(result.context_variables)
+                if result.agent:
+                    partial_response.agent = result.agent
             partial_response.messages.append(
-                {
-                    "role": "tool",
-                    "tool_call_id": tool_call.id,
-                    "tool_name": name,
-                    "content": result.value,
-                }
+                Message(
+                    role="tool",
+                    tool_call_id=tool_call.id,
+                    tool_name=name,
+                    content=content,
+                )
             )
-            partial_response.context_variables.update(result.context_variables)
-            if result.agent:
-                partial_response.agent = result.agent
 
         return partial_response
 
+    def execute_functions(self, calls: List[tuple]) -> List:
+        if self.tool_executor is None or len(calls) < 2:
+            return [func(**args) for func, args in calls]
+        futures = [self.tool_executor.submit(func, **args)
+                   for func, args in calls]
+        return [future.result() for future in futures]
+
+    def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: Union[List[AgentFunction], ToolRegistry],
+        context_variables: dict,
+        debug: bool,
+        trace: Optional[TurnTrace] = None,
+    ) -> Response:
+        prepared = self.prepare_tool_calls(
+            tool_calls, functions, context_variables, debug
+        )
+        if trace is None:
+            calls = [(func, args) for _, _, func, args in prepared if func]
+        else:
+            calls = [
+                (trace.wrap_tool(func, name, tool_call.id), args)
+                for tool_call, name, func, args in prepared
+                if func
+            ]
+        raw_results = self.execute_functions(calls)
+        return self.merge_tool_results(prepared, raw_results, debug)
+
+    def _start_run(self, agent: Agent, messages: List, context_variables: dict):
+        """
+        Bookkeeping shared by the run loops; returns `(context_variables,
+        history, init_len, trace)`.
+        """
+        context_variables = copy.deepcopy(context_variables)
+        # a MessageLog (e.g. a session's history) is extended in place
+        history = messages if isinstance(messages, MessageLog) else MessageLog(messages)
+        trace = self.tracer.start_turn(agent) if self.tracer is not None else None
+        return context_variables, history, len(history), trace
+
+    def _apply_tool_results(
+        self,
+        partial_response: Response,
+        active_agent: Agent,
+        history: MessageLog,
+        context_variables: dict,
+        trace: Optional[TurnTrace],
+    ) -> Agent:
+        """Record a round of tool results; returns the agent to continue with."""
+        history.extend(partial_response.messages)
+        context_variables.update(partial_response.context_variables)
+        if not partial_response.agent:
+            return active_agent
+        if trace is not None:
+            trace.handoff(active_agent, partial_response.agent)
+        return partial_response.agent
+
+    def _end_run(
+        self,
+        active_agent: Agent,
+        history: MessageLog,
+        init_len: int,
+        context_variables: dict,
+        trace: Optional[TurnTrace],
+    ) -> Response:
+        if trace is not None:
+            trace.turn_end(active_agent, len(history) - init_len)
+        return Response(
+            messages=history.since(init_len),
+            agent=active_agent,
+            context_variables=context_variables,
+        )
+
     def run_and_stream(
         self,
         agent: Agent,
@@ -145,88 +446,116 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        events: bool = False,
     ):
+        """
+        Stream a run. Yields raw delta dicts framed by `{"delim": ...}` markers
+        and ending with `{"response": Response}`, or with `events=True` the typed
+        events of `swarm.events`, ending with `RunComplete`.
+        """
         active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
-
-        while len(history) - init_len < max_turns:
-
-            message = {
-                "content": "",
-                "sender": agent.name,
-                "role": "assistant",
-                "function_call": None,
-                "tool_calls": defaultdict(
-                    lambda: {
-                        "function": {"arguments": "", "name": ""},
-                        "id": "",
-                        "type": "",
-                    }
-                ),
-            }
-
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
-                context_variables=context_variables,
-                model_override=model_override,
-                stream=True,
-                debug=debug,
-            )
+        context_variables, history, init_len, trace = self._start_run(
+            agent, messages, context_variables
+        )
 
-            yield {"delim": "start"}
-            for chunk in completion:
-                delta = json.loads(chunk.choices[0].delta.json())
-                if delta["role"] == "assistant":
-                    delta["sender"] = active_agent.name
-                yield delta
-                delta.pop("role", None)
-                delta.pop("sender", None)
-                merge_chunk(message, delta)
-            yield {"delim": "end"}
-
-            message["tool_calls"] = list(
-                message.get("tool_calls", {}).values())
-            if not message["tool_calls"]:
-                message["tool_calls"] = None
-            debug_print(debug, "Received completion:", message)
-            history.append(message)
-
-            if not message["tool_calls"] or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # convert tool_calls to objects
-            tool_calls = []
-            for tool_call in message["tool_calls"]:
-                function = Function(
-                    arguments=tool_call["function"]["arguments"],
-                    name=tool_call["function"]["name"],
+        speculative = None
+        try:
+            while len(history) - init_len < max_turns:
+
+                speculative = None
+                if self.speculative_tools and execute_tools:
+                    speculative = SpeculativeToolCalls(
+                        self, active_agent.tool_registry(), context_variables, debug, trace
+                    )
+                accumulator = StreamAccumulator(
+                    sender=active_agent.name,
+                    on_tool_call=speculative.dispatch if speculative is not None else None,
                 )
-                tool_call_object = ChatCompletionMessageToolCall(
-                    id=tool_call["id"], function=function, type=tool_call["type"]
+
+                # get completion with current history, agent
+                if trace is not None:
+                    trace.completion_request(
+                        active_agent, model_override or active_agent.model, True
+                    )
+                completion = self.get_chat_completion(
+                    agent=active_agent,
+                    history=history,
+                    context_variables=context_variables,
+                    model_override=model_override,
+                    stream=True,
+                    debug=debug,
                 )
-                tool_calls.append(tool_call_object)
 
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                tool_calls, active_agent.functions, context_variables, debug
-            )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        yield {
-            "response": Response(
-                messages=history[init_len:],
-                agent=active_agent,
-                context_variables=context_variables,
-            )
-        }
+                if trace is not None:
+                    completion = trace.watch_stream(completion, active_agent)
+
+                if events:
+                    yield MessageStart(active_agent.name)
+                    for chunk in completion:
+                        for event in accumulator.add_events(chunk):
+                            yield event
+                    for event in accumulator.finish():
+                        yield event
+                else:
+                    yield {"delim": "start"}
+                    for chunk in completion:
+                        delta = accumulator.add(chunk)
+                        if delta is not None:
+                            yield delta
+                    yield {"delim": "end"}
+
+                message = accumulator.message()
+                debug_print(debug, "Received completion:", message)
+                history.append(message)
+                if events:
+                    yield MessageEnd(message)
+
+                if not message["tool_calls"] or not execute_tools:
+                    debug_print(debug, "Ending turn.")
+                    break
+
+                # convert tool_calls to objects
+                tool_calls = []
+                for tool_call in message["tool_calls"]:
+                    function = Function(
+                        arguments=tool_call["function"]["arguments"],
+                        name=tool_call["function"]["name"],
+                    )
+                    tool_call_object = ChatCompletionMessageToolCall(
+                        id=tool_call["id"], function=function, type=tool_call["type"]
+                    )
+                    tool_calls.append(tool_call_object)
+
+                # handle function calls, updating context_variables, and switching agents
+                if speculative is not None:
+                    partial_response = speculative.join(tool_calls)
+                else:
+                    partial_response = self.handle_tool_calls(
+                        tool_calls, active_agent.tool_registry(), context_variables, debug, trace
+                    )
+                previous_agent = active_agent
+                active_agent = self._apply_tool_results(
+                    partial_response, active_agent, history, context_variables, trace
+                )
+                if events:
+                    for result in partial_response.messages:
+                        yield ToolResult(
+                            result["tool_call_id"], result["tool_name"], result["content"]
+                        )
+                    if partial_response.agent:
+                        yield AgentHandoff(previous_agent, partial_response.agent)
+        except BaseException as e:
+            # drop tool calls started for a message the run will not record
+            if speculative is not None:
+                speculative.cancel()
+            # close the turn's open spans if the run raised or its stream was
+            # abandoned
+            if trace is not None:
+                trace.turn_end(active_agent, len(history) - init_len, repr(e))
+            raise
+
+        response = self._end_run(active_agent, history, init_len, context_variables, trace)
+        yield RunComplete(response) if events else {"response": response}
 
     def run(
         self,
@@ -238,6 +567,7 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        events: bool = False,
     ) -> Response:
         if stream:
             return self.run_and_stream(
@@ -248,45 +578,52 @@ class Swarm:
                 debug=debug,
                 max_turns=max_turns,
                 execute_tools=execute_tools,
+                events=events,
             )
         active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
-
-        while len(history) - init_len < max_turns and active_agent:
-
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
-                context_variables=context_variables,
-                model_override=model_override,
-                stream=stream,
-                debug=debug,
-            )
-            message = completion.choices[0].message
-            debug_print(debug, "Received completion:", message)
-            message.sender = active_agent.name
-            history.append(
-                json.loads(message.model_dump_json())
-            )  # to avoid OpenAI types (?)
-
-            if not message.tool_calls or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                message.tool_calls, active_agent.functions, context_variables, debug
-            )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        return Response(
-            messages=history[init_len:],
-            agent=active_agent,
-            context_variables=context_variables,
+        context_variables, history, init_len, trace = self._start_run(
+            agent, messages, context_variables
         )
+
+        try:
+            while len(history) - init_len < max_turns and active_agent:
+
+                # get completion with current history, agent
+                if trace is not None:
+                    trace.completion_request(
+                        active_agent, model_override or active_agent.model, stream
+                    )
+                completion = self.get_chat_completion(
+                    agent=active_agent,
+                    history=history,
+                    context_variables=context_variables,
+                    model_override=model_override,
+                    stream=stream,
+                    debug=debug,
+                )
+                message = completion.choices[0].message
+                if trace is not None:
+                    trace.first_token(active_agent)
+                    trace.last_token(active_agent)
+                debug_print(debug, "Received completion:", message)
+                history.append(Message.from_completion(message, active_agent.name))
+
+                if not message.tool_calls or not execute_tools:
+                    debug_print(debug, "Ending turn.")
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                partial_response = self.handle_tool_calls(
+                    message.tool_calls, active_agent.tool_registry(), context_variables, debug, trace
+                )
+                active_agent = self._apply_tool_results(
+                    partial_response, active_agent, history, context_variables, trace
+                )
+        except BaseException as e:
+            # close the turn's open spans if the run raised or its stream was
+            # abandoned
+            if trace is not None:
+                trace.turn_end(active_agent, len(history) - init_len, repr(e))
+            raise
+
+        return self._end_run(active_agent, history, init_len, context_variables, trace)
@@ -0,0 +1,234 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Case- and whitespace-insensitive form of a query, used only for cache keys."""
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Cache key of `text`; texts differing only in case or spacing share it."""
+    return hashlib.sha256(f"{model}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Cache of embedding vectors keyed on model and normalized text.
+
+    Vectors are kept as packed float32 arrays in an in-memory LRU and, when
+    `path` is given, in a SQLite file so they survive restarts. Embeddings of a
+    given text do not change, so entries only expire by size.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        path: Optional[str] = None,
+        max_disk_entries: int = 1_000_000,
+    ):
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, vector BLOB, accessed_at REAL)"
+                )
+                self._conn.execute(
+                    "CREATE INDEX IF NOT EXISTS embeddings_accessed "
+                    "ON embeddings (accessed_at)"
+                )
+
+    def get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return vector.tolist()
+
+            if self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    with self._conn:
+                        self._conn.execute(
+                            "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                            (time.time(), key),
+                        )
+                    vector = array("f")
+                    vector.frombytes(row[0])
+                    self._remember(key, vector)
+                    self.hits += 1
+                    return vector.tolist()
+
+            self.misses += 1
+            return None
+
+    def set_many(self, items: Dict[str, Sequence[float]]) -> None:
+        packed = {key: array("f", vector) for key, vector in items.items()}
+        with self._lock:
+            for key, vector in packed.items():
+                self._remember(key, vector)
+            if self._conn is not None:
+                now = time.time()
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) "
+                        "VALUES (?, ?, ?)",
+                        [(key, vector.tobytes(), now) for key, vector in packed.items()],
+                    )
+                    self._conn.execute(
+                        "DELETE FROM embeddings WHERE key IN ("
+                        "SELECT key FROM embeddings ORDER BY accessed_at DESC "
+                        "LIMIT -1 OFFSET ?)",
+                        (self.max_disk_entries,),
+                    )
+
+    def set(self, key: str, vector: Sequence[float]) -> None:
+        self.set_many({key: vector})
+
+    def _remember(self, key, vector) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM embeddings")
+
+
+class _Batch:
+    __slots__ = ("texts", "full", "done", "vectors", "error")
+
+    def __init__(self):
+        # cache key -> (position in the request, text sent)
+        self.texts: Dict[str, tuple] = {}
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.vectors: Optional[List[List[float]]] = None
+        self.error: Optional[BaseException] = None
+
+
+class BatchingEmbedder:
+    """
+    Thread-safe query embedder for retrieval tools.
+
+    Texts are looked up in `cache` first, under a key insensitive to case and
+    spacing; the text itself is embedded as given. Misses from concurrent
+    callers, e.g. tools running in parallel sessions, are coalesced: the first
+    caller waits up to `window` seconds (or until `max_batch` texts are queued)
+    and sends all of them in one multi-input `client.embeddings.create` call.
+    Texts sharing a key are embedded once. `requests` counts API calls.
+    """
+
+    def __init__(
+        self,
+        client,
+        model: str = "text-embedding-3-small",
+        cache: Optional[EmbeddingCache] = None,
+        window: float = 0.01,
+        max_batch: int = 256,
+    ):
+        self.client = client
+        self.model = model
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.window = window
+        self.max_batch = max_batch
+        self.requests = 0
+        self._batch: Optional[_Batch] = None
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> List[float]:
+        return self.embed_many([text])[0]
+
+    def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        keys = [embedding_key(self.model, text) for text in texts]
+        vectors: List[Optional[List[float]]] = [self.cache.get(key) for key in keys]
+        missing = {
+            key: text for key, text, vector in zip(keys, texts, vectors) if vector is None
+        }
+        if missing:
+            found = self._embed_uncached(missing)
+            vectors = [
+                vector if vector is not None else found[key]
+                for key, vector in zip(keys, vectors)
+            ]
+        return vectors
+
+    def _embed_uncached(self, pending: Dict[str, str]) -> Dict[str, List[float]]:
+        found = {}
+        while pending:
+            batch, leader = self._join(pending)
+            if leader:
+                self._flush(batch)
+            else:
+                batch.done.wait()
+            if batch.error is not None:
+                raise batch.error
+            remaining = {}
+            for key, text in pending.items():
+                entry = batch.texts.get(key)
+                if entry is None:
+                    remaining[key] = text
+                else:
+                    found[key] = batch.vectors[entry[0]]
+            # texts that did not fit a full batch go into the next one
+            pending = remaining
+        return found
+
+    def _join(self, pending: Dict[str, str]):
+        with self._lock:
+            batch = self._batch
+            leader = batch is None
+            if leader:
+                batch = self._batch = _Batch()
+            for key, text in pending.items():
+                if len(batch.texts) >= self.max_batch:
+                    break
+                if key not in batch.texts:
+                    batch.texts[key] = (len(batch.texts), text)
+            if len(batch.texts) >= self.max_batch:
+                self._batch = None
+                batch.full.set()
+        return batch, leader
+
+    def _flush(self, batch: _Batch) -> None:
+        batch.full.wait(self.window)
+        with self._lock:
+            if self._batch is batch:
+                self._batch = None
+        keys = list(batch.texts)
+        texts = [text for _, text in batch.texts.values()]
+        try:
+            self.requests += 1
+            response = self.client.embeddings.create(input=texts, model=self.model)
+            vectors = [None] * len(texts)
+            for item in response.data:
+                vectors[item.index] = item.embedding
+            batch.vectors = vectors
+            self.cache.set_many(dict(zip(keys, vectors)))
+        except BaseException as e:
+            batch.error = e
+        finally:
+            batch.done.set()
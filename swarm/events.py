@@ -0,0 +1,87 @@
+from dataclasses import dataclass
+from typing import Optional
+
+from .types import Agent, Response
+
+
+class StreamEvent:
+    """Base class of the typed events yielded by `run(stream=True, events=True)`."""
+
+    __slots__ = ()
+
+
+@dataclass(slots=True)
+class MessageStart(StreamEvent):
+    """An assistant message from `sender` begins streaming."""
+
+    sender: str
+
+
+@dataclass(slots=True)
+class ContentDelta(StreamEvent):
+    sender: str
+    content: str
+
+
+@dataclass(slots=True)
+class ToolCallStarted(StreamEvent):
+    """The name of a tool call is known; its arguments are still streaming."""
+
+    index: int
+    id: str
+    name: str
+
+
+@dataclass(slots=True)
+class ToolCallArgumentsDelta(StreamEvent):
+    index: int
+    id: str
+    arguments: str
+
+
+@dataclass(slots=True)
+class ToolCallCompleted(StreamEvent):
+    """
+    The arguments of a tool call have closed. Emitted as soon as they form a
+    complete JSON object, usually well before the end of the stream.
+    """
+
+    index: int
+    id: str
+    name: str
+    arguments: str
+    type: str = "function"
+
+
+@dataclass(slots=True)
+class MessageEnd(StreamEvent):
+    """The assembled assistant message, as appended to the history."""
+
+    message: dict
+
+
+@dataclass(slots=True)
+class ToolResult(StreamEvent):
+    tool_call_id: str
+    name: str
+    content: str
+
+
+@dataclass(slots=True)
+class AgentHandoff(StreamEvent):
+    from_agent: Agent
+    to_agent: Agent
+
+
+@dataclass(slots=True)
+class RunComplete(StreamEvent):
+    response: Response
+
+
+def response_of(event) -> Optional[Response]:
+    """The final `Response` carried by a stream item of either kind, if any."""
+    if isinstance(event, RunComplete):
+        return event.response
+    if isinstance(event, dict):
+        return event.get("response")
+    return None
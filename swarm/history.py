@@ -0,0 +1,91 @@
+from collections.abc import Sequence
+from itertools import islice
+from typing import Iterable, List, Optional
+
+from .util import estimate_message_tokens
+
+
+class MessageLog(Sequence):
+    """
+    Append-only conversation history for a single run.
+
+    Message dicts are shared with the sequence the log was created from instead of
+    deep-copied: Swarm only ever appends, so neither the caller's list nor its
+    messages are mutated. Slot 0 of the backing list is reserved for the system
+    prompt, so the same list is handed to the client on every turn instead of
+    rebuilding `[system] + history`.
+
+    Estimated token counts are cached per message, `context_state` holds the
+    context policy's window and summary, `prefix_state` the pinned system
+    prompts of `StablePrefix` and `instructions_memo` the instructions rendered
+    per agent (see `Agent.render_instructions`), so all of them carry over
+    between the turns of a session.
+    """
+
+    __slots__ = (
+        "_messages",
+        "_token_counts",
+        "context_state",
+        "prefix_state",
+        "instructions_memo",
+    )
+
+    def __init__(self, messages: Iterable[dict] = ()):
+        self._messages = [None]
+        self._messages.extend(messages)
+        self._token_counts: List[int] = []
+        self.context_state: Optional[dict] = None
+        self.prefix_state: Optional[dict] = None
+        self.instructions_memo: dict = {}
+
+    def __len__(self) -> int:
+        return len(self._messages) - 1
+
+    def __iter__(self):
+        return islice(self._messages, 1, None)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._messages[start + 1: stop + 1]
+            return [self._messages[i + 1] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MessageLog index out of range")
+        return self._messages[index + 1]
+
+    def __repr__(self) -> str:
+        return f"MessageLog({self._messages[1:]!r})"
+
+    def append(self, message: dict) -> None:
+        self._messages.append(message)
+
+    def extend(self, messages: Iterable[dict]) -> None:
+        self._messages.extend(messages)
+
+    def truncate(self, length: int) -> None:
+        """Drop every message after the first `length`, e.g. to discard a failed turn."""
+        del self._messages[length + 1:]
+        del self._token_counts[length:]
+
+    def token_counts(self) -> List[int]:
+        """Estimated tokens per message, counting only messages added since the last call."""
+        counts = self._token_counts
+        for message in islice(self._messages, len(counts) + 1, None):
+            counts.append(estimate_message_tokens(message))
+        return counts
+
+    def since(self, start: int) -> List[dict]:
+        """Return the messages appended after the first `start` ones."""
+        return self._messages[start + 1:]
+
+    def with_system(self, instructions: str) -> List[dict]:
+        """
+        Return the prompt for the next completion: the system message followed by
+        the whole history. The list is reused (and its system slot overwritten) on
+        the next call, so clients must consume it before then.
+        """
+        self._messages[0] = {"role": "system", "content": instructions}
+        return self._messages
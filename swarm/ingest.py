@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def iter_json_documents(directory: str, suffix: str = ".json") -> Iterator[Tuple[str, dict]]:
+    """
+    Yield `(document_id, document)` for the JSON files of `directory`, in file
+    name order, reading one file at a time. The id is the file name without
+    its suffix.
+    """
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(suffix):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            yield name[: -len(suffix)], json.load(f)
+
+
+def openai_embedder(client, model: str) -> Callable[[List[str]], List[List[float]]]:
+    """An `embed_batch` function embedding texts with one multi-input API call."""
+
+    def embed_batch(texts: List[str]) -> List[List[float]]:
+        response = client.embeddings.create(model=model, input=texts)
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    return embed_batch
+
+
+class Checkpoint:
+    """
+    Append-only record of the document ids already stored, so an interrupted
+    ingestion can be resumed. Ids are written one per line after each upsert.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done.update(line.rstrip("\n") for line in f if line.strip())
+
+    def __contains__(self, document_id: str) -> bool:
+        return document_id in self.done
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def add(self, document_ids: Iterable[str]) -> None:
+        document_ids = list(document_ids)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(f"{document_id}\n" for document_id in document_ids)
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(document_ids)
+
+
+def _report(document_ids: List[str], error: BaseException) -> None:
+    logger.warning("Failed to embed %s: %s", ", ".join(document_ids), error)
+
+
+class IngestPipeline:
+    """
+    Streaming embed-and-upsert pipeline for document collections.
+
+    Documents are read lazily and embedded `batch_size` at a time by a pool of
+    `workers` threads, with at most `2 * workers` batches in flight so memory
+    stays bounded however large the collection is. Embedded records
+    `{"id", "vector", "payload"}` are passed to `upsert` in chunks of
+    `upsert_size`, and their ids are then recorded in the optional `checkpoint`;
+    documents already in it are skipped, so re-running an interrupted ingestion
+    resumes it. When a batch fails, its documents are retried one by one, and
+    only those that still fail are passed to `on_error` (by default logged as
+    warnings) and left out of the checkpoint, to be retried by the next run.
+
+    Args:
+        embed_batch: Maps a list of texts to their vectors, e.g. `openai_embedder`.
+        upsert: Stores a list of records in the vector store.
+        text_key: The document field that is embedded.
+    """
+
+    def __init__(
+        self,
+        embed_batch: Callable[[List[str]], List[List[float]]],
+        upsert: Callable[[List[dict]], None],
+        batch_size: int = 64,
+        upsert_size: int = 256,
+        workers: int = 4,
+        checkpoint: Optional[Checkpoint] = None,
+        text_key: str = "text",
+        on_error: Callable[[List[str], BaseException], None] = _report,
+    ):
+        self.embed_batch = embed_batch
+        self.upsert = upsert
+        self.batch_size = batch_size
+        self.upsert_size = upsert_size
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.text_key = text_key
+        self.on_error = on_error
+
+    def _batches(self, documents: Iterable[Tuple[str, dict]]) -> Iterator[List[Tuple[str, dict]]]:
+        batch = []
+        for document_id, document in documents:
+            if self.checkpoint is not None and document_id in self.checkpoint:
+                continue
+            batch.append((document_id, document))
+            if len(batch) == self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _embed_documents(self, batch: List[Tuple[str, dict]]) -> List[dict]:
+        vectors = self.embed_batch([document[self.text_key] for _, document in batch])
+        if len(vectors) != len(batch):
+            raise ValueError(f"expected {len(batch)} vectors, got {len(vectors)}")
+        return [
+            {"id": document_id, "vector": vector, "payload": document}
+            for (document_id, document), vector in zip(batch, vectors)
+        ]
+
+    def _embed(self, batch: List[Tuple[str, dict]]) -> Tuple[List[dict], list]:
+        """Embed a batch, isolating failures to the documents that cause them."""
+        try:
+            return self._embed_documents(batch), []
+        except Exception:
+            if len(batch) == 1:
+                raise
+        records, failures = [], []
+        for document in batch:
+            try:
+                records.extend(self._embed_documents([document]))
+            except Exception as e:
+                failures.append((document[0], e))
+        return records, failures
+
+    def run(self, documents: Iterable[Tuple[str, dict]]) -> Dict[str, int]:
+        """Ingest `(document_id, document)` pairs; returns stored and failed counts."""
+        stats = {"stored": 0, "failed": 0}
+        pending: List[dict] = []
+
+        def flush():
+            self.upsert(pending)
+            if self.checkpoint is not None:
+                self.checkpoint.add(record["id"] for record in pending)
+            stats["stored"] += len(pending)
+            pending.clear()
+
+        def collect(batch, future):
+            try:
+                records, failures = future.result()
+            except Exception as e:
+                records, failures = [], [(batch[0][0], e)]
+            for document_id, error in failures:
+                stats["failed"] += 1
+                self.on_error([document_id], error)
+            pending.extend(records)
+            while len(pending) >= self.upsert_size:
+                chunk = pending[self.upsert_size:]
+                del pending[self.upsert_size:]
+                flush()
+                pending.extend(chunk)
+
+        in_flight = deque()
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            for batch in self._batches(documents):
+                if len(in_flight) >= 2 * self.workers:
+                    collect(*in_flight.popleft())
+                in_flight.append((batch, pool.submit(self._embed, batch)))
+            while in_flight:
+                collect(*in_flight.popleft())
+        if pending:
+            flush()
+        return stats
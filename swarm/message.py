@@ -0,0 +1,206 @@
+import sys
+from collections.abc import Mapping
+from typing import Iterator
+
+from pydantic_core import SchemaSerializer, core_schema
+
+# the fields of chat messages as stored in histories, in wire order
+FIELDS = (
+    "role",
+    "content",
+    "sender",
+    "name",
+    "tool_calls",
+    "tool_call_id",
+    "tool_name",
+    "function_call",
+    "refusal",
+    "audio",
+    "annotations",
+)
+_FIELD_SET = frozenset(FIELDS)
+_INTERNED = ("role", "sender", "tool_name")
+
+
+class Message(Mapping):
+    """
+    Compact, read-mostly chat message for in-memory histories.
+
+    Fields live in `__slots__` instead of a per-message dict, `None` fields are
+    not stored at all, and role and sender strings are interned, so a history of
+    many messages costs a fraction of the equivalent dicts. Messages are
+    `Mapping`s and read like the dicts they replace: `message["tool_calls"]` and
+    `message.get("tool_calls")` are None when absent, while iteration, `len`, `in`
+    and `dict(message)` only see the fields that are set. They compare equal to
+    dicts with the same non-null items. Unknown keys are kept in `extra`.
+
+    The OpenAI client serializes mappings as objects, so messages are sent as is;
+    `to_dict()` gives the wire format explicitly. Pydantic serializes messages as
+    dicts, including in untyped fields such as `Response.messages`, so
+    `model_dump_json()` works; with `json.dumps` pass `default=dict`.
+    """
+
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, **fields):
+        extra = None
+        for key, value in fields.items():
+            if value is None:
+                continue
+            if key in _FIELD_SET:
+                if key in _INTERNED and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            else:
+                if extra is None:
+                    extra = {}
+                extra[key] = value
+        if extra is not None:
+            self.extra = extra
+
+    @classmethod
+    def from_dict(cls, message: Mapping) -> "Message":
+        if isinstance(message, cls):
+            return message
+        return cls(**message)
+
+    @classmethod
+    def from_completion(cls, message, sender: str) -> "Message":
+        """
+        Convert an OpenAI `ChatCompletionMessage` straight from its attributes,
+        without a JSON round trip. Null fields are dropped.
+        """
+        tool_calls = message.tool_calls
+        if tool_calls:
+            tool_calls = [
+                {
+                    "id": tool_call.id,
+                    "type": tool_call.type,
+                    "function": {
+                        "name": tool_call.function.name,
+                        "arguments": tool_call.function.arguments,
+                    },
+                }
+                for tool_call in tool_calls
+            ]
+        out = cls(
+            role=message.role,
+            content=message.content,
+            sender=sender,
+            tool_calls=tool_calls,
+            refusal=getattr(message, "refusal", None),
+        )
+        # rarely set; these are nested models, dumped the slow way
+        for key in ("function_call", "audio", "annotations"):
+            value = getattr(message, key, None)
+            if value is not None:
+                out[key] = (
+                    [item.model_dump() for item in value]
+                    if isinstance(value, list)
+                    else value.model_dump()
+                )
+        model_extra = getattr(message, "model_extra", None)
+        if model_extra:
+            for key, value in model_extra.items():
+                if value is not None:
+                    out[key] = value
+        return out
+
+    @classmethod
+    def _validate(cls, value) -> "Message":
+        if isinstance(value, Mapping):
+            return cls.from_dict(value)
+        raise ValueError(f"expected a message mapping, got {type(value).__name__}")
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source, handler):
+        return _CORE_SCHEMA
+
+    def __getitem__(self, key: str):
+        if key in _FIELD_SET:
+            return getattr(self, key, None)
+        extra = getattr(self, "extra", None)
+        if extra is not None and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default=None):
+        value = self[key] if key in self else None
+        return default if value is None else value
+
+    def __setitem__(self, key: str, value) -> None:
+        if key in _FIELD_SET:
+            if value is None:
+                self.__delitem__(key)
+            else:
+                if key in _INTERNED and type(value) is str:
+                    value = sys.intern(value)
+                setattr(self, key, value)
+            return
+        extra = getattr(self, "extra", None)
+        if extra is None:
+            extra = self.extra = {}
+        extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                pass
+        else:
+            extra = getattr(self, "extra", None)
+            if extra is not None:
+                extra.pop(key, None)
+
+    def __contains__(self, key) -> bool:
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        extra = getattr(self, "extra", None)
+        return extra is not None and key in extra
+
+    def __iter__(self) -> Iterator[str]:
+        for key in FIELDS:
+            if hasattr(self, key):
+                yield key
+        extra = getattr(self, "extra", None)
+        if extra is not None:
+            yield from extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Mapping):
+            return self.to_dict() == {
+                key: value for key, value in other.items() if value is not None
+            }
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Message({self.to_dict()!r})"
+
+    def __reduce__(self):
+        return (_rebuild, (self.to_dict(),))
+
+    def to_dict(self) -> dict:
+        """The message in the wire format, without null fields."""
+        out = {key: getattr(self, key) for key in FIELDS if hasattr(self, key)}
+        extra = getattr(self, "extra", None)
+        if extra is not None:
+            out.update(extra)
+        return out
+
+
+def _rebuild(fields: dict) -> Message:
+    return Message(**fields)
+
+
+_CORE_SCHEMA = core_schema.no_info_plain_validator_function(
+    Message._validate,
+    serialization=core_schema.plain_serializer_function_ser_schema(Message.to_dict),
+)
+# found by pydantic when serializing values of untyped (`Any`) fields
+Message.__pydantic_serializer__ = SchemaSerializer(_CORE_SCHEMA)
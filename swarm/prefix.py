@@ -0,0 +1,87 @@
+import hashlib
+import json
+from typing import Callable, Optional
+
+from .history import MessageLog
+
+
+class StablePrefix:
+    """
+    Prompt-prefix stability mode, for providers that cache repeated prompt
+    prefixes.
+
+    The system prompt an agent renders on its first turn in a conversation is
+    pinned and reused byte for byte on later turns, so callable instructions are
+    not re-rendered; context that changes from turn to turn belongs in
+    `Agent.context_instructions`, which is sent as a trailing system message
+    after the history instead of in the system prompt. The tool list is already
+    stable as long as the agent's functions do not change.
+
+    Each request's prefix (model, system prompt and tools) is hashed; when it
+    differs from the previous request of the same conversation, e.g. after a
+    handoff, `on_change(previous_hash, new_hash, agent)` is called and `changes`
+    is incremented. `stable_ratio` is the share of requests that reused the
+    previous prefix, among those that had one to compare with; `untracked`
+    counts the others.
+
+    The pinned prompts and the last prefix are kept on the conversation's
+    `MessageLog`, so tracking across turns needs a `Session`, or the same
+    `MessageLog` passed to each `Swarm.run`. A plain list of messages starts a
+    new conversation on every call: its first request is untracked.
+    """
+
+    def __init__(self, on_change: Optional[Callable] = None):
+        self.on_change = on_change
+        self.requests = 0
+        self.changes = 0
+        self.untracked = 0
+
+    @property
+    def stable_ratio(self) -> Optional[float]:
+        """None until a request could be compared with a previous prefix."""
+        compared = self.requests - self.untracked
+        if not compared:
+            return None
+        return 1.0 - self.changes / compared
+
+    def _state(self, history: MessageLog) -> dict:
+        state = history.prefix_state
+        if state is None:
+            state = history.prefix_state = {
+                "instructions": {},
+                "hash": None,
+                "tools": (None, None),
+            }
+        return state
+
+    def instructions(self, history: MessageLog, agent, render: Callable[[], str]) -> str:
+        """The agent's pinned system prompt for this conversation, rendering it once."""
+        pinned = self._state(history)["instructions"]
+        instructions = pinned.get(agent.name)
+        if instructions is None:
+            instructions = pinned[agent.name] = render()
+        return instructions
+
+    def check(self, history: MessageLog, agent, model: str, instructions: str, tools) -> str:
+        """Hash the prefix of the next request and report it if it changed."""
+        state = self._state(history)
+        schemas, tools_digest = state["tools"]
+        if schemas is not tools:
+            tools_digest = hashlib.sha256(
+                json.dumps(tools, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            state["tools"] = (tools, tools_digest)
+
+        digest = hashlib.sha256(
+            "\0".join((model, instructions, tools_digest)).encode("utf-8")
+        ).hexdigest()
+        previous = state["hash"]
+        state["hash"] = digest
+        self.requests += 1
+        if previous is None:
+            self.untracked += 1
+        elif previous != digest:
+            self.changes += 1
+            if self.on_change is not None:
+                self.on_change(previous, digest, agent)
+        return digest
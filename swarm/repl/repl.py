@@ -1,37 +1,40 @@
 import json
 
 from swarm import Swarm
+from swarm.events import (
+    ContentDelta,
+    MessageEnd,
+    MessageStart,
+    RunComplete,
+    ToolCallStarted,
+)
 
 
 def process_and_print_streaming_response(response):
-    content = ""
-    last_sender = ""
-
-    for chunk in response:
-        if "sender" in chunk:
-            last_sender = chunk["sender"]
-
-        if "content" in chunk and chunk["content"] is not None:
-            if not content and last_sender:
-                print(f"\033[94m{last_sender}:\033[0m", end=" ", flush=True)
-                last_sender = ""
-            print(chunk["content"], end="", flush=True)
-            content += chunk["content"]
-
-        if "tool_calls" in chunk and chunk["tool_calls"] is not None:
-            for tool_call in chunk["tool_calls"]:
-                f = tool_call["function"]
-                name = f["name"]
-                if not name:
-                    continue
-                print(f"\033[94m{last_sender}: \033[95m{name}\033[0m()")
-
-        if "delim" in chunk and chunk["delim"] == "end" and content:
+    printed_content = False
+
+    for event in response:
+        if isinstance(event, MessageStart):
+            sender = event.sender
+            printed_content = False
+
+        elif isinstance(event, ContentDelta):
+            if not printed_content:
+                print(f"\033[94m{sender}:\033[0m", end=" ", flush=True)
+                printed_content = True
+            print(event.content, end="", flush=True)
+
+        elif isinstance(event, ToolCallStarted):
+            if printed_content:
+                print()
+                printed_content = False
+            print(f"\033[94m{sender}: \033[95m{event.name}\033[0m()")
+
+        elif isinstance(event, MessageEnd) and printed_content:
             print()  # End of response message
-            content = ""
 
-        if "response" in chunk:
-            return chunk["response"]
+        elif isinstance(event, RunComplete):
+            return event.response
 
 
 def pretty_print_messages(messages) -> None:
@@ -63,25 +66,15 @@ def run_demo_loop(
     client = Swarm()
     print("Starting Swarm CLI 🐝")
 
-    messages = []
-    agent = starting_agent
+    session = client.session(
+        starting_agent, context_variables=context_variables, debug=debug
+    )
 
     while True:
         user_input = input("\033[90mUser\033[0m: ")
-        messages.append({"role": "user", "content": user_input})
-
-        response = client.run(
-            agent=agent,
-            messages=messages,
-            context_variables=context_variables or {},
-            stream=stream,
-            debug=debug,
-        )
+        response = session.send(user_input, stream=stream, events=stream)
 
         if stream:
             response = process_and_print_streaming_response(response)
         else:
             pretty_print_messages(response.messages)
-
-        messages.extend(response.messages)
-        agent = response.agent
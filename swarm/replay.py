@@ -0,0 +1,138 @@
+import asyncio
+import gzip
+import json
+import threading
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+from typing import Optional
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from .cache import request_key
+
+
+def _open(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordingClient:
+    """
+    Wraps an OpenAI-compatible client and appends every chat completion it makes
+    to a JSONL file (gzipped if `path` ends in `.gz`): the request hash, the
+    response latency and the completion, or for streams each chunk with the delay
+    since the previous one. Play the file back with `ReplayClient`.
+    """
+
+    def __init__(self, client, path: str):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _write(self, record: dict) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        with self._lock, _open(self.path, "a") as f:
+            f.write(line)
+
+    def create(self, **params):
+        key = request_key(params)
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(**params)
+        latency = time.perf_counter() - start
+        if not params.get("stream"):
+            self._write(
+                {
+                    "key": key,
+                    "latency": latency,
+                    "completion": response.model_dump(mode="json"),
+                }
+            )
+            return response
+        return self._record_stream(key, latency, response)
+
+    def _record_stream(self, key, latency, stream):
+        chunks = []
+        last = time.perf_counter()
+        for chunk in stream:
+            now = time.perf_counter()
+            chunks.append([now - last, chunk.model_dump(mode="json")])
+            last = now
+            yield chunk
+        self._write({"key": key, "latency": latency, "chunks": chunks})
+
+
+class ReplayClient:
+    """
+    OpenAI-compatible client serving completions recorded by `RecordingClient`,
+    for deterministic offline runs and benchmarks.
+
+    Requests are matched on the same canonical hash the recording used; repeated
+    recordings of one request are served in order, cycling. Recorded latencies
+    and inter-chunk delays are reproduced divided by `speed` (2.0 replays twice
+    as fast); `speed=None` replays without any delay. With `strict=False`,
+    unmatched requests get the recordings in file order instead of a KeyError.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0, strict: bool = True):
+        self.speed = speed
+        self.strict = strict
+        self._by_key = defaultdict(deque)
+        self._in_order = deque()
+        with _open(path, "r") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._by_key[record["key"]].append(record)
+                    self._in_order.append(record)
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _delay(self, seconds: float) -> float:
+        return 0.0 if self.speed is None else seconds / self.speed
+
+    def _next_record(self, params: dict) -> dict:
+        key = request_key(params)
+        with self._lock:
+            records = self._by_key.get(key)
+            if not records:
+                if self.strict:
+                    raise KeyError(f"No recorded completion for request {key}.")
+                records = self._in_order
+            record = records[0]
+            records.rotate(-1)
+        return record
+
+    def create(self, **params):
+        record = self._next_record(params)
+        time.sleep(self._delay(record["latency"]))
+        if "chunks" in record:
+            return self._replay(record["chunks"])
+        return ChatCompletion.model_validate(record["completion"])
+
+    def _replay(self, chunks):
+        for delay, chunk in chunks:
+            delay = self._delay(delay)
+            if delay:
+                time.sleep(delay)
+            yield ChatCompletionChunk.model_validate(chunk)
+
+
+class AsyncReplayClient(ReplayClient):
+    """`ReplayClient` for `AsyncSwarm`: `create` is awaited and streams are async."""
+
+    async def create(self, **params):
+        record = self._next_record(params)
+        await asyncio.sleep(self._delay(record["latency"]))
+        if "chunks" in record:
+            return self._areplay(record["chunks"])
+        return ChatCompletion.model_validate(record["completion"])
+
+    async def _areplay(self, chunks):
+        for delay, chunk in chunks:
+            delay = self._delay(delay)
+            if delay:
+                await asyncio.sleep(delay)
+            yield ChatCompletionChunk.model_validate(chunk)
@@ -0,0 +1,290 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, List, Optional, Union
+
+from .types import Agent
+from .util import estimate_tokens
+
+
+class QueueFullError(RuntimeError):
+    pass
+
+
+class _Job:
+    __slots__ = ("tenant", "model", "cost", "key", "func", "future", "enqueued_at", "error")
+
+    def __init__(self, tenant, model, cost, key, func):
+        self.tenant = tenant
+        self.model = model
+        # an int, or a callable estimating it when the job is dispatched
+        self.cost = cost
+        # jobs sharing a key (e.g. one session) never run concurrently
+        self.key = key
+        self.func = func
+        # set when the cost estimate raised; the job is then failed, not run
+        self.error: Optional[BaseException] = None
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+class _TokenBucket:
+    """Per-model token budget refilled continuously at `tokens_per_minute`."""
+
+    __slots__ = ("capacity", "rate", "tokens", "updated_at")
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = tokens_per_minute
+        self.rate = tokens_per_minute / 60.0
+        self.tokens = float(tokens_per_minute)
+        self.updated_at = time.monotonic()
+
+    def wait_time(self, cost: int, now: float) -> float:
+        """Seconds until `cost` tokens are available (0 if they are now)."""
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        # a request larger than the whole budget only needs a full bucket
+        needed = min(cost, self.capacity)
+        if self.tokens >= needed:
+            return 0.0
+        return (needed - self.tokens) / self.rate
+
+    def take(self, cost: int) -> None:
+        self.tokens -= cost
+
+
+class SwarmScheduler:
+    """
+    Admits Swarm turns into a bounded pool of worker threads.
+
+    Queued turns are dispatched round-robin across tenants, so one busy tenant
+    cannot starve the others, subject to a global worker limit, a per-tenant
+    concurrency limit and optional per-model token budgets (tokens per minute,
+    estimated from the prompt). Bursts wait in the queue instead of turning into
+    rate-limit errors; `stats` reports queue depth and wait times. Turns of the
+    same session run one at a time, in order.
+    """
+
+    def __init__(
+        self,
+        swarm,
+        max_workers: int = 8,
+        max_concurrent_per_tenant: int = 2,
+        max_queue: Optional[int] = None,
+        token_budgets: Optional[Dict[str, int]] = None,
+    ):
+        self.swarm = swarm
+        self.max_concurrent_per_tenant = max_concurrent_per_tenant
+        self.max_queue = max_queue
+        self._buckets = {
+            model: _TokenBucket(tokens_per_minute)
+            for model, tokens_per_minute in (token_budgets or {}).items()
+        }
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, deque] = {}
+        self._ring: deque = deque()  # tenants with queued work, in turn order
+        self._running: Dict[str, int] = {}
+        self._busy_keys: set = set()
+        self._queued = 0
+        self._waits: deque = deque(maxlen=4096)
+        self._shutdown = False
+
+        self._workers = [
+            threading.Thread(target=self._work, name=f"swarm-scheduler-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(
+        self,
+        tenant: str,
+        func: Callable,
+        *args,
+        model: Optional[str] = None,
+        cost: Union[int, Callable[[], int]] = 0,
+        key: Optional[Hashable] = None,
+        **kwargs,
+    ) -> Future:
+        """
+        Queue `func(*args, **kwargs)` for `tenant`, charging `cost` tokens to
+        `model`; a callable `cost` is evaluated when the job is dispatched. Jobs
+        with the same `key` are run one at a time, in submission order.
+        """
+        job = _Job(tenant, model, cost, key, lambda: func(*args, **kwargs))
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("Scheduler has been shut down.")
+            if self.max_queue is not None and self._queued >= self.max_queue:
+                raise QueueFullError(
+                    f"Scheduler queue is full ({self.max_queue} turns waiting)."
+                )
+            queue = self._queues.get(tenant)
+            if queue is None:
+                queue = self._queues[tenant] = deque()
+            if not queue:
+                self._ring.append(tenant)
+            queue.append(job)
+            self._queued += 1
+            self._cond.notify()
+        return job.future
+
+    def run(
+        self,
+        tenant: str,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        **run_options,
+    ) -> Future:
+        """Queue a non-streaming `Swarm.run`; the future resolves to its `Response`."""
+        return self.submit(
+            tenant,
+            self.swarm.run,
+            agent=agent,
+            messages=messages,
+            context_variables=context_variables,
+            model_override=model_override,
+            model=model_override or agent.model,
+            cost=estimate_tokens(messages),
+            **run_options,
+        )
+
+    def send(self, tenant: str, session, message) -> Future:
+        """
+        Queue `session.send(message)`; the future resolves to its `Response`.
+        Turns of one session are serialized, and the prompt cost is estimated
+        from its history when the turn is dispatched, while no other turn of
+        the session is running.
+        """
+        return self.submit(
+            tenant,
+            session.send,
+            message,
+            model=session.model_override or session.agent.model,
+            cost=lambda: sum(session.history.token_counts()),
+            key=session,
+        )
+
+    def _next_job(self):
+        """
+        Pick the next runnable job, round-robin across tenants. Called with the
+        condition held; returns `(job, None)`, or `(None, seconds)` when nothing
+        may run yet (seconds until a token budget refills, or None to wait for
+        a notification). A job whose cost estimate raised is dequeued and
+        returned with its `error` set, without being counted as running.
+        """
+        now = time.monotonic()
+        refill_wait = None
+        for _ in range(len(self._ring)):
+            tenant = self._ring[0]
+            self._ring.rotate(-1)
+            if self._running.get(tenant, 0) >= self.max_concurrent_per_tenant:
+                continue
+            queue = self._queues[tenant]
+            # the first job whose session (key) is not already running
+            for index, job in enumerate(queue):
+                if job.key is None or job.key not in self._busy_keys:
+                    break
+            else:
+                continue
+            if callable(job.cost):
+                try:
+                    job.cost = job.cost()
+                except Exception as e:
+                    job.error = e
+                    self._dequeue(tenant, queue, index)
+                    return job, None
+            bucket = self._buckets.get(job.model)
+            if bucket is not None:
+                wait = bucket.wait_time(job.cost, now)
+                if wait:
+                    refill_wait = wait if refill_wait is None else min(refill_wait, wait)
+                    continue
+                bucket.take(job.cost)
+
+            self._dequeue(tenant, queue, index)
+            if job.key is not None:
+                self._busy_keys.add(job.key)
+            self._running[tenant] = self._running.get(tenant, 0) + 1
+            self._waits.append(now - job.enqueued_at)
+            return job, None
+        return None, refill_wait
+
+    def _dequeue(self, tenant: str, queue: deque, index: int) -> None:
+        del queue[index]
+        if not queue:
+            self._ring.remove(tenant)
+        self._queued -= 1
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._shutdown and not self._queued:
+                        return
+                    job, timeout = self._next_job()
+                    if job is not None:
+                        break
+                    self._cond.wait(timeout=timeout)
+
+            if job.error is not None:
+                if job.future.set_running_or_notify_cancel():
+                    job.future.set_exception(job.error)
+                with self._cond:
+                    self._cond.notify_all()
+                continue
+
+            if job.future.set_running_or_notify_cancel():
+                try:
+                    job.future.set_result(job.func())
+                except BaseException as e:
+                    job.future.set_exception(e)
+
+            with self._cond:
+                self._running[job.tenant] -= 1
+                if not self._running[job.tenant]:
+                    del self._running[job.tenant]
+                self._busy_keys.discard(job.key)
+                self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Queue depth, running turns per tenant and queue wait percentiles (seconds)."""
+        with self._cond:
+            waits = sorted(self._waits)
+            tenants = {
+                tenant: {
+                    "queued": len(self._queues.get(tenant, ())),
+                    "running": self._running.get(tenant, 0),
+                }
+                for tenant in set(self._running) | set(self._ring)
+            }
+            queued = self._queued
+            running = sum(self._running.values())
+
+        def percentile(p):
+            if not waits:
+                return 0.0
+            return waits[min(len(waits) - 1, int(p * len(waits)))]
+
+        return {
+            "queued": queued,
+            "running": running,
+            "tenants": tenants,
+            "wait_p50": percentile(0.50),
+            "wait_p99": percentile(0.99),
+            "wait_max": waits[-1] if waits else 0.0,
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting turns; queued turns still run before the workers exit."""
+        with self._cond:
+            self._shutdown = True
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
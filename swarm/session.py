@@ -0,0 +1,191 @@
+import uuid
+from typing import Dict, Iterable, List, Optional, Union
+
+from .events import response_of
+from .history import MessageLog
+from .message import Message
+from .stores import SessionStore
+from .types import Agent, Response
+
+
+class Session:
+    """
+    A conversation held by a `Swarm`: the active agent, the message history and
+    the context variables.
+
+    Each `send` appends the new user message to a history that is extended in
+    place by the run, so a turn costs only its new messages instead of resending
+    and recopying the whole conversation. Sessions can be parked with `to_dict`
+    and resumed with `Swarm.resume_session`, or persisted turn by turn to a
+    `SessionStore` and reloaded with `Swarm.load_session`.
+    """
+
+    def __init__(
+        self,
+        swarm,
+        agent: Agent,
+        messages: Iterable[dict] = (),
+        context_variables: Optional[dict] = None,
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        store: Optional[SessionStore] = None,
+        session_id: Optional[str] = None,
+    ):
+        self.swarm = swarm
+        self.agent = agent
+        self.history = MessageLog(messages)
+        self.context_variables = dict(context_variables or {})
+        self.model_override = model_override
+        self.debug = debug
+        self.max_turns = max_turns
+        self.execute_tools = execute_tools
+        self.store = store
+        self.session_id = session_id or uuid.uuid4().hex
+
+    @property
+    def messages(self) -> List[dict]:
+        return list(self.history)
+
+    def send(
+        self, message: Union[str, dict], stream: bool = False, events: bool = False
+    ):
+        """
+        Run one turn for a user message, given as text or as a message dict.
+
+        Returns the turn's `Response`, or with `stream=True` the chunk generator
+        of `Swarm.run_and_stream` (typed events with `events=True`); the session
+        is updated when its final response chunk is consumed.
+        """
+        mark = self._begin(message)
+        if stream:
+            return self._stream(mark, events)
+        try:
+            response = self.swarm.run(**self._run_params())
+        except BaseException:
+            self.history.truncate(mark)
+            raise
+        self._finish(response, mark)
+        return response
+
+    def _stream(self, mark: int, events: bool):
+        finished = False
+        try:
+            for chunk in self.swarm.run(
+                stream=True, events=events, **self._run_params()
+            ):
+                response = response_of(chunk)
+                if response is not None:
+                    self._finish(response, mark)
+                    finished = True
+                yield chunk
+        except BaseException:
+            # drop the partial turn so the history stays valid for the next send
+            if not finished:
+                self.history.truncate(mark)
+            raise
+
+    def _begin(self, message: Union[str, dict]) -> int:
+        if isinstance(message, str):
+            message = Message(role="user", content=message)
+        mark = len(self.history)
+        self.history.append(message)
+        return mark
+
+    def _run_params(self) -> dict:
+        return {
+            "agent": self.agent,
+            "messages": self.history,
+            "context_variables": self.context_variables,
+            "model_override": self.model_override,
+            "debug": self.debug,
+            "max_turns": self.max_turns,
+            "execute_tools": self.execute_tools,
+        }
+
+    def _finish(self, response: Response, mark: int) -> None:
+        agent = response.agent or self.agent
+        if self.store is not None:
+            # persist before committing, so a failed append drops the turn from
+            # memory too and the history stays in step with the store
+            try:
+                self.store.append(
+                    self.session_id,
+                    self.history.since(mark),
+                    agent.name,
+                    response.context_variables,
+                )
+            except BaseException:
+                self.history.truncate(mark)
+                raise
+        self.agent = agent
+        self.context_variables = response.context_variables
+
+    def to_dict(self) -> dict:
+        """JSON-serializable session state. The agent is stored by name."""
+        return {
+            "session_id": self.session_id,
+            "agent": self.agent.name,
+            "messages": [dict(message) for message in self.history],
+            "context_variables": self.context_variables,
+        }
+
+    @classmethod
+    def from_dict(
+        cls,
+        swarm,
+        state: dict,
+        agents: Union[Dict[str, Agent], Iterable[Agent]],
+        **options,
+    ) -> "Session":
+        if not isinstance(agents, dict):
+            agents = {agent.name: agent for agent in agents}
+        try:
+            agent = agents[state["agent"]]
+        except KeyError:
+            raise KeyError(
+                f"Cannot resume session: no agent named {state['agent']!r} was provided."
+            )
+        options.setdefault("session_id", state.get("session_id"))
+        return cls(
+            swarm,
+            agent,
+            messages=state["messages"],
+            context_variables=state["context_variables"],
+            **options,
+        )
+
+
+class AsyncSession(Session):
+    """`Session` driven by an `AsyncSwarm`; `send` must be awaited."""
+
+    async def send(
+        self, message: Union[str, dict], stream: bool = False, events: bool = False
+    ):
+        mark = self._begin(message)
+        if stream:
+            return self._stream(mark, events)
+        try:
+            response = await self.swarm.run(**self._run_params())
+        except BaseException:
+            self.history.truncate(mark)
+            raise
+        self._finish(response, mark)
+        return response
+
+    async def _stream(self, mark: int, events: bool):
+        finished = False
+        try:
+            async for chunk in await self.swarm.run(
+                stream=True, events=events, **self._run_params()
+            ):
+                response = response_of(chunk)
+                if response is not None:
+                    self._finish(response, mark)
+                    finished = True
+                yield chunk
+        except BaseException:
+            if not finished:
+                self.history.truncate(mark)
+            raise
@@ -0,0 +1,126 @@
+import asyncio
+from typing import Dict, List, Optional
+
+from .events import ToolCallCompleted
+from .tools import ToolRegistry
+from .tracing import TurnTrace
+from .types import ChatCompletionMessageToolCall, Function, Response
+
+
+def _retrieve(future) -> None:
+    # consume the outcome of an abandoned call so it is not reported as unhandled
+    if not future.cancelled():
+        future.exception()
+
+
+class SpeculativeToolCalls:
+    """
+    Starts the tool calls of a streaming assistant message while the rest of the
+    message is still arriving. Pass `dispatch` as the `on_tool_call` callback of
+    a `StreamAccumulator`; each call is submitted to the swarm's tool executor as
+    soon as its arguments close, and `join` collects the results once the stream
+    has ended, in tool-call order, exactly as `Swarm.handle_tool_calls` would.
+
+    Calls whose arguments do not parse, or that never closed before the end of
+    the stream, are left to `join` and run there. When the stream fails or is
+    abandoned instead, `cancel` drops the calls already started.
+    """
+
+    def __init__(
+        self,
+        swarm,
+        registry: ToolRegistry,
+        context_variables: dict,
+        debug: bool,
+        trace: Optional[TurnTrace] = None,
+    ):
+        self.swarm = swarm
+        self.registry = registry
+        self.context_variables = context_variables
+        self.debug = debug
+        self.trace = trace
+        # tool call id -> (prepared call, future or task)
+        self._started: Dict[str, tuple] = {}
+
+    def dispatch(self, event: ToolCallCompleted) -> None:
+        tool_call = ChatCompletionMessageToolCall(
+            id=event.id,
+            type=event.type,
+            function=Function(name=event.name, arguments=event.arguments),
+        )
+        (prepared,) = self.swarm.prepare_tool_calls(
+            [tool_call], self.registry, self.context_variables, self.debug
+        )
+        _, name, func, args = prepared
+        if func is None:
+            return
+        if self.trace is not None:
+            func = self.trace.wrap_tool(func, name, tool_call.id)
+        self._started[tool_call.id] = (prepared, self._submit(func, args))
+
+    def _submit(self, func, args):
+        return self.swarm.tool_executor.submit(func, **args)
+
+    def cancel(self) -> None:
+        """
+        Cancel the started calls: tasks at their next await, executor calls if
+        they have not begun. Calls that still complete have their results and
+        errors discarded.
+        """
+        started, self._started = self._started, {}
+        for _, future in started.values():
+            future.cancel()
+            future.add_done_callback(_retrieve)
+
+    def _split(self, tool_calls: List[ChatCompletionMessageToolCall]):
+        prepared, late = [], []
+        for tool_call in tool_calls:
+            started = self._started.get(tool_call.id)
+            if started is None:
+                (entry,) = self.swarm.prepare_tool_calls(
+                    [tool_call], self.registry, self.context_variables, self.debug
+                )
+                started = (entry, None)
+                if entry[2] is not None:
+                    late.append(entry)
+            prepared.append(started)
+        return prepared, late
+
+    def _late_calls(self, late: List[tuple]) -> List[tuple]:
+        if self.trace is None:
+            return [(func, args) for _, _, func, args in late]
+        return [
+            (self.trace.wrap_tool(func, name, tool_call.id), args)
+            for tool_call, name, func, args in late
+        ]
+
+    def join(self, tool_calls: List[ChatCompletionMessageToolCall]) -> Response:
+        prepared, late = self._split(tool_calls)
+        late_results = iter(self.swarm.execute_functions(self._late_calls(late)))
+        raw_results = [
+            future.result() if future is not None else next(late_results)
+            for (_, _, func, _), future in prepared
+            if func is not None
+        ]
+        return self.swarm.merge_tool_results(
+            [entry for entry, _ in prepared], raw_results, self.debug
+        )
+
+
+class AsyncSpeculativeToolCalls(SpeculativeToolCalls):
+    """`SpeculativeToolCalls` for `AsyncSwarm`: calls run as tasks on the loop."""
+
+    def _submit(self, func, args):
+        return asyncio.ensure_future(self.swarm.call_function(func, args))
+
+    async def join(self, tool_calls: List[ChatCompletionMessageToolCall]) -> Response:
+        prepared, late = self._split(tool_calls)
+        late_results = iter(await self.swarm.execute_functions(self._late_calls(late)))
+        raw_results = [
+            await task if task is not None else next(late_results)
+            for (_, _, func, _), task in prepared
+            if func is not None
+        ]
+        return self.swarm.merge_tool_results(
+            [entry for entry, _ in prepared], raw_results, self.debug
+        )
@@ -0,0 +1,226 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from .message import Message
+
+# session ids usable as a single path component: no separators, no "." or ".."
+_SAFE_SESSION_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9._-]{0,127}")
+
+
+class SessionStore:
+    """
+    Interface for persisting sessions turn by turn.
+
+    `append` is called with only the messages a turn added, and `load` returns a
+    state dict accepted by `Session.from_dict`, optionally limited to the last
+    `tail` messages.
+    """
+
+    def append(
+        self,
+        session_id: str,
+        messages: List[dict],
+        agent: str,
+        context_variables: dict,
+    ) -> None:
+        raise NotImplementedError
+
+    def load(self, session_id: str, tail: Optional[int] = None) -> Optional[dict]:
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+
+class SQLiteSessionStore(SessionStore):
+    """Append-only SQLite store: one row per message, one row of state per session."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "id TEXT PRIMARY KEY, agent TEXT, context_variables TEXT, "
+                "length INTEGER, updated_at REAL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "session_id TEXT, seq INTEGER, body TEXT, "
+                "PRIMARY KEY (session_id, seq))"
+            )
+
+    def append(self, session_id, messages, agent, context_variables) -> None:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT length FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            start = row[0] if row else 0
+            self._conn.executemany(
+                "INSERT INTO messages (session_id, seq, body) VALUES (?, ?, ?)",
+                [
+                    (session_id, start + i, json.dumps(message, default=dict))
+                    for i, message in enumerate(messages)
+                ],
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sessions "
+                "(id, agent, context_variables, length, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    session_id,
+                    agent,
+                    json.dumps(context_variables),
+                    start + len(messages),
+                    time.time(),
+                ),
+            )
+
+    def load(self, session_id, tail=None) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT agent, context_variables, length FROM sessions WHERE id = ?",
+                (session_id,),
+            ).fetchone()
+            if row is None:
+                return None
+            agent, context_variables, length = row
+            start = 0 if tail is None else max(length - tail, 0)
+            bodies = self._conn.execute(
+                "SELECT body FROM messages WHERE session_id = ? AND seq >= ? "
+                "ORDER BY seq",
+                (session_id, start),
+            ).fetchall()
+        return {
+            "agent": agent,
+            "messages": [Message(**json.loads(body)) for (body,) in bodies],
+            "context_variables": json.loads(context_variables),
+        }
+
+    def delete(self, session_id) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM messages WHERE session_id = ?", (session_id,))
+            self._conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class JSONLSessionStore(SessionStore):
+    """
+    File store keeping each session in a directory of fixed-size JSONL segments.
+
+    Appends only write to the last segment, and loading a tail reads just the
+    segments that hold it. Session state (agent, context variables, length) is
+    kept in a small `state.json`, replaced atomically after every append. A
+    session keeps the segment size it was created with, whatever the
+    `segment_size` of the store it is later reopened by.
+    Session ids must be slugs (letters, digits, `.`, `_`, `-`, starting with a
+    letter or digit), as they name the session directories.
+    """
+
+    def __init__(self, root: str, segment_size: int = 256):
+        self.root = root
+        self.segment_size = segment_size
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _session_dir(self, session_id: str) -> str:
+        if not isinstance(session_id, str) or not _SAFE_SESSION_ID.fullmatch(session_id):
+            raise ValueError(f"Invalid session id for a file store: {session_id!r}")
+        return os.path.join(self.root, session_id)
+
+    def _segment_path(self, session_id: str, segment: int) -> str:
+        return os.path.join(self._session_dir(session_id), f"{segment:06d}.jsonl")
+
+    def _read_state(self, session_id: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(self._session_dir(session_id), "state.json")) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _segment_size(self, state: Optional[dict]) -> int:
+        # sessions written before the size was recorded used the store's
+        if state is None or "segment_size" not in state:
+            return self.segment_size
+        return state["segment_size"]
+
+    def append(self, session_id, messages, agent, context_variables) -> None:
+        with self._lock:
+            os.makedirs(self._session_dir(session_id), exist_ok=True)
+            state = self._read_state(session_id)
+            length = state["length"] if state else 0
+            size = state["segment_bytes"] if state else 0
+            segment_size = self._segment_size(state)
+
+            i = 0
+            while i < len(messages):
+                segment, offset = divmod(length + i, segment_size)
+                batch = messages[i: i + segment_size - offset]
+                path = self._segment_path(session_id, segment)
+                if offset:
+                    # drop whatever a failed append left past the recorded end
+                    os.truncate(path, size)
+                with open(path, "ab" if offset else "wb") as f:
+                    f.write(
+                        "".join(json.dumps(m, default=dict) + "\n" for m in batch).encode("utf-8")
+                    )
+                    size = f.tell()
+                i += len(batch)
+
+            state_path = os.path.join(self._session_dir(session_id), "state.json")
+            with open(state_path + ".tmp", "w") as f:
+                json.dump(
+                    {
+                        "agent": agent,
+                        "context_variables": context_variables,
+                        "length": length + len(messages),
+                        "segment_bytes": size,
+                        "segment_size": segment_size,
+                    },
+                    f,
+                )
+            os.replace(state_path + ".tmp", state_path)
+
+    def load(self, session_id, tail=None) -> Optional[dict]:
+        with self._lock:
+            state = self._read_state(session_id)
+            if state is None:
+                return None
+            length = state["length"]
+            start = 0 if tail is None else max(length - tail, 0)
+            segment_size = self._segment_size(state)
+
+            messages = []
+            first_segment, skip = divmod(start, segment_size)
+            last_segment = (length - 1) // segment_size
+            for segment in range(first_segment, last_segment + 1):
+                with open(self._segment_path(session_id, segment)) as f:
+                    lines = f.readlines()
+                # ignore anything written past the recorded length (torn append)
+                end = length - segment * segment_size
+                messages.extend(Message(**json.loads(line)) for line in lines[skip:end])
+                skip = 0
+        return {
+            "agent": state["agent"],
+            "messages": messages,
+            "context_variables": state["context_variables"],
+        }
+
+    def delete(self, session_id) -> None:
+        with self._lock:
+            session_dir = self._session_dir(session_id)
+            if not os.path.isdir(session_dir):
+                return
+            for name in os.listdir(session_dir):
+                os.remove(os.path.join(session_dir, name))
+            os.rmdir(session_dir)
@@ -0,0 +1,193 @@
+import json
+from typing import Callable, Dict, List, Optional
+
+from .events import (
+    ContentDelta,
+    StreamEvent,
+    ToolCallArgumentsDelta,
+    ToolCallCompleted,
+    ToolCallStarted,
+)
+from .message import Message
+
+# tool call entry fields
+_ID, _TYPE, _NAME, _ARGUMENTS, _STATE = range(5)
+_PENDING, _STARTED, _COMPLETED = range(3)
+
+
+class StreamAccumulator:
+    """
+    Assembles one streamed assistant message from chat completion chunks.
+
+    Delta attributes are read directly off the chunk objects instead of being
+    serialized and re-parsed, and content and tool-call fragments are collected
+    in lists that are joined once when the stream is done.
+    """
+
+    __slots__ = ("sender", "on_tool_call", "_content", "_tool_calls")
+
+    def __init__(
+        self,
+        sender: str,
+        on_tool_call: Optional[Callable[[ToolCallCompleted], None]] = None,
+    ):
+        self.sender = sender
+        # called with each ToolCallCompleted as soon as the call's arguments close
+        self.on_tool_call = on_tool_call
+        self._content: List[str] = []
+        # tool call index -> [id, type, name fragments, argument fragments, state]
+        self._tool_calls: Dict[int, list] = {}
+
+    def add(self, chunk) -> Optional[dict]:
+        """
+        Merge a chunk into the message and return a lightweight delta dict for
+        consumers, or None for chunks without choices (e.g. usage-only chunks).
+        """
+        if not chunk.choices:
+            return None
+        delta = chunk.choices[0].delta
+
+        content = delta.content
+        if content:
+            self._content.append(content)
+
+        tool_call_deltas = None
+        if delta.tool_calls:
+            tool_call_deltas = []
+            on_tool_call = self.on_tool_call
+            for tool_call in delta.tool_calls:
+                if on_tool_call is not None and tool_call.index not in self._tool_calls:
+                    self.finish()
+                entry, name, arguments = self._merge_tool_call(tool_call)
+                if (
+                    on_tool_call is not None
+                    and entry[_STATE] != _COMPLETED
+                    and entry[_NAME]
+                    and self._closes(entry, arguments)
+                ):
+                    self._complete(tool_call.index, entry)
+                tool_call_deltas.append(
+                    {
+                        "index": tool_call.index,
+                        "id": tool_call.id,
+                        "type": tool_call.type,
+                        "function": {"name": name, "arguments": arguments},
+                    }
+                )
+
+        role = delta.role
+        out = {
+            "content": content,
+            "role": role,
+            "function_call": None,
+            "tool_calls": tool_call_deltas,
+            "refusal": delta.refusal,
+        }
+        if role == "assistant":
+            out["sender"] = self.sender
+        return out
+
+    def add_events(self, chunk) -> List[StreamEvent]:
+        """
+        Merge a chunk into the message and return the typed events it produces.
+        A `ToolCallCompleted` is emitted as soon as a call's arguments parse as a
+        JSON object, or when the next call starts, whichever comes first.
+        """
+        if not chunk.choices:
+            return []
+        delta = chunk.choices[0].delta
+        events = []
+
+        content = delta.content
+        if content:
+            self._content.append(content)
+            events.append(ContentDelta(self.sender, content))
+
+        if delta.tool_calls:
+            for tool_call in delta.tool_calls:
+                if tool_call.index not in self._tool_calls:
+                    # calls are streamed one after another, so earlier ones are done
+                    events.extend(self.finish())
+                entry, _, arguments = self._merge_tool_call(tool_call)
+                if entry[_STATE] == _PENDING and entry[_NAME]:
+                    entry[_STATE] = _STARTED
+                    events.append(
+                        ToolCallStarted(tool_call.index, entry[_ID], "".join(entry[_NAME]))
+                    )
+                if arguments and entry[_STATE] == _STARTED:
+                    events.append(
+                        ToolCallArgumentsDelta(tool_call.index, entry[_ID], arguments)
+                    )
+                    if self._closes(entry, arguments):
+                        events.append(self._complete(tool_call.index, entry))
+        return events
+
+    def finish(self) -> List[StreamEvent]:
+        """Complete any tool calls that are still open, e.g. at the end of the stream."""
+        return [
+            self._complete(index, entry)
+            for index, entry in self._tool_calls.items()
+            if entry[_STATE] != _COMPLETED
+        ]
+
+    @staticmethod
+    def _closes(entry: list, arguments: Optional[str]) -> bool:
+        # only attempt a parse when the fragment could close the object
+        if not arguments or not arguments.rstrip().endswith("}"):
+            return False
+        try:
+            json.loads("".join(entry[_ARGUMENTS]))
+        except ValueError:
+            return False
+        return True
+
+    def _complete(self, index: int, entry: list) -> ToolCallCompleted:
+        entry[_STATE] = _COMPLETED
+        event = ToolCallCompleted(
+            index,
+            entry[_ID],
+            "".join(entry[_NAME]),
+            "".join(entry[_ARGUMENTS]),
+            entry[_TYPE] or "function",
+        )
+        if self.on_tool_call is not None:
+            self.on_tool_call(event)
+        return event
+
+    def _merge_tool_call(self, tool_call):
+        entry = self._tool_calls.get(tool_call.index)
+        if entry is None:
+            entry = self._tool_calls[tool_call.index] = ["", "", [], [], _PENDING]
+        if tool_call.id:
+            entry[_ID] = tool_call.id
+        if tool_call.type:
+            entry[_TYPE] = tool_call.type
+
+        name = arguments = None
+        function = tool_call.function
+        if function is not None:
+            name, arguments = function.name, function.arguments
+            if name:
+                entry[_NAME].append(name)
+            if arguments:
+                entry[_ARGUMENTS].append(arguments)
+        return entry, name, arguments
+
+    def tool_calls(self) -> List[dict]:
+        return [
+            {
+                "function": {"arguments": "".join(arguments), "name": "".join(name)},
+                "id": tool_call_id,
+                "type": tool_call_type,
+            }
+            for tool_call_id, tool_call_type, name, arguments, _ in self._tool_calls.values()
+        ]
+
+    def message(self) -> Message:
+        """The assembled assistant message, in the history format."""
+        return Message(
+            role="assistant",
+            content="".join(self._content),
+            sender=self.sender,
+            tool_calls=self.tool_calls() or None,
+        )
@@ -0,0 +1,117 @@
+import functools
+import inspect
+import json
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+# attribute set on functions by `cached_tool`
+CACHE_TTL_ATTR = "__swarm_cache_ttl__"
+
+
+def cached_tool(func: Optional[Callable] = None, *, ttl: Optional[float] = None):
+    """
+    Mark an agent function as pure, so repeated calls with the same arguments
+    are answered from the `Swarm`'s `ToolResultCache` for `ttl` seconds (forever
+    when None). Usable as `@cached_tool` or `@cached_tool(ttl=300)`.
+
+    Functions taking `context_variables` are never cached, as their result may
+    depend on the context.
+    """
+
+    def mark(func: Callable) -> Callable:
+        setattr(func, CACHE_TTL_ATTR, math.inf if ttl is None else ttl)
+        return func
+
+    return mark if func is None else mark(func)
+
+
+def cache_ttl(func: Callable, declared: Optional[dict] = None) -> Optional[float]:
+    """
+    The cache TTL of an agent function, from `cached_tool` or from an agent's
+    `cached_tools` declaration (name -> TTL in seconds, or None for no expiry).
+    None when the function is not cached.
+    """
+    if declared and func.__name__ in declared:
+        ttl = declared[func.__name__]
+        return math.inf if ttl is None else ttl
+    return getattr(func, CACHE_TTL_ATTR, None)
+
+
+def arguments_key(name: str, args: dict) -> str:
+    """Canonical cache key of a tool call: key order and spacing do not matter."""
+    return name + "\0" + json.dumps(
+        args, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=repr
+    )
+
+
+class ToolResultCache:
+    """
+    In-memory LRU of tool results for functions declared cacheable with
+    `cached_tool` or `Agent.cached_tools`, keyed on the tool name and its
+    canonicalized arguments. `hits` and `misses` count lookups.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str):
+        """Return `(True, result)` for a live entry, else `(False, None)`."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return True, result
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+    def set(self, key: str, result, ttl: float) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def wrap(self, func: Callable, name: str, args: dict, ttl: float) -> Callable:
+        """Wrap one call of `func` so it is served from, or recorded in, the cache."""
+        key = arguments_key(name, args)
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def cached_async(**kwargs):
+                found, result = self.get(key)
+                if not found:
+                    result = await func(**kwargs)
+                    self.set(key, result, ttl)
+                return result
+
+            return cached_async
+
+        @functools.wraps(func)
+        def cached(**kwargs):
+            found, result = self.get(key)
+            if not found:
+                result = func(**kwargs)
+                self.set(key, result, ttl)
+            return result
+
+        return cached
@@ -0,0 +1,86 @@
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .tool_cache import cache_ttl
+from .util import function_schema
+from .validation import ArgumentValidator, compile_validator
+
+__CTX_VARS_NAME__ = "context_variables"
+
+
+class CompiledTool(NamedTuple):
+    name: str
+    function: Callable
+    schema: dict
+    wants_context_variables: bool
+    validate: ArgumentValidator
+    # seconds results may be reused for, None if the tool is not cached
+    cache_ttl: Optional[float]
+
+
+class ToolRegistry:
+    """
+    Tool schemas and dispatch table compiled once from a list of agent functions.
+
+    Attributes:
+        functions (tuple): The functions the registry was compiled from.
+        cached_tools (dict): The agent's `cached_tools` declaration, if any.
+        tools (dict): Maps tool name to its `CompiledTool`.
+        schemas (tuple): Tool schemas as sent to the model, with
+            `context_variables` hidden. Shared between turns; do not mutate.
+    """
+
+    __slots__ = ("functions", "cached_tools", "tools", "schemas")
+
+    def __init__(self, functions: List[Callable], cached_tools: Optional[dict] = None):
+        self.functions: Tuple[Callable, ...] = tuple(functions)
+        self.cached_tools = dict(cached_tools) if cached_tools else None
+        self.tools: Dict[str, CompiledTool] = {}
+
+        schemas = []
+        for func in self.functions:
+            # cached per function and shared; copied only to hide context_variables
+            schema = function_schema(func)
+            params = schema["function"]["parameters"]
+            if __CTX_VARS_NAME__ in params["properties"]:
+                params = dict(
+                    params,
+                    properties={
+                        name: value
+                        for name, value in params["properties"].items()
+                        if name != __CTX_VARS_NAME__
+                    },
+                    required=[
+                        name for name in params["required"] if name != __CTX_VARS_NAME__
+                    ],
+                )
+                schema = dict(
+                    schema, function=dict(schema["function"], parameters=params)
+                )
+
+            wants_context_variables = __CTX_VARS_NAME__ in func.__code__.co_varnames
+            tool = CompiledTool(
+                name=func.__name__,
+                function=func,
+                schema=schema,
+                wants_context_variables=wants_context_variables,
+                validate=compile_validator(func),
+                # results may depend on the context, so such tools are never cached
+                cache_ttl=None
+                if wants_context_variables
+                else cache_ttl(func, self.cached_tools),
+            )
+            self.tools[tool.name] = tool
+            schemas.append(schema)
+        self.schemas: Tuple[dict, ...] = tuple(schemas)
+
+    def matches(self, functions: List[Callable], cached_tools: Optional[dict] = None) -> bool:
+        """Whether the registry was compiled from exactly these functions."""
+        compiled = self.functions
+        return (
+            len(functions) == len(compiled)
+            and all(a is b for a, b in zip(functions, compiled))
+            and (cached_tools or None) == self.cached_tools
+        )
+
+    def get(self, name: str) -> Optional[CompiledTool]:
+        return self.tools.get(name)
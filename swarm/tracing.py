@@ -0,0 +1,314 @@
+import functools
+import inspect
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+_run_ids = itertools.count(1)
+
+
+@dataclass(slots=True)
+class TraceEvent:
+    run_id: int
+    timestamp_ns: int
+
+
+@dataclass(slots=True)
+class TurnStart(TraceEvent):
+    agent: str
+
+
+@dataclass(slots=True)
+class TurnEnd(TraceEvent):
+    agent: Optional[str]
+    message_count: int
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class CompletionRequest(TraceEvent):
+    agent: str
+    model: str
+    stream: bool
+
+
+@dataclass(slots=True)
+class FirstToken(TraceEvent):
+    agent: str
+
+
+@dataclass(slots=True)
+class LastToken(TraceEvent):
+    agent: str
+
+
+@dataclass(slots=True)
+class ToolCallStart(TraceEvent):
+    name: str
+    tool_call_id: str
+
+
+@dataclass(slots=True)
+class ToolCallEnd(TraceEvent):
+    name: str
+    tool_call_id: str
+    error: Optional[str] = None
+
+
+@dataclass(slots=True)
+class Handoff(TraceEvent):
+    from_agent: str
+    to_agent: str
+
+
+def _has_token(chunk) -> bool:
+    if not chunk.choices:
+        return False
+    delta = chunk.choices[0].delta
+    return bool(delta.content or delta.tool_calls)
+
+
+class TurnTrace:
+    """
+    Emits the events of one `run`. Swarm only creates one when a tracer is set, so
+    runs without a tracer pay nothing beyond a `None` check. Timestamps come from
+    `time.monotonic_ns`. For non-streamed completions `FirstToken` and `LastToken`
+    are both emitted when the response arrives.
+    """
+
+    __slots__ = ("run_id", "_emit")
+
+    def __init__(self, emit: Callable):
+        self.run_id = next(_run_ids)
+        self._emit = emit
+
+    def turn_start(self, agent) -> None:
+        self._emit(TurnStart(self.run_id, time.monotonic_ns(), agent.name))
+
+    def turn_end(self, agent, message_count: int, error: Optional[str] = None) -> None:
+        """End the run; `error` is set when it raised or was abandoned."""
+        self._emit(
+            TurnEnd(
+                self.run_id,
+                time.monotonic_ns(),
+                agent.name if agent else None,
+                message_count,
+                error,
+            )
+        )
+
+    def completion_request(self, agent, model: str, stream: bool) -> None:
+        self._emit(
+            CompletionRequest(self.run_id, time.monotonic_ns(), agent.name, model, stream)
+        )
+
+    def first_token(self, agent) -> None:
+        self._emit(FirstToken(self.run_id, time.monotonic_ns(), agent.name))
+
+    def last_token(self, agent) -> None:
+        self._emit(LastToken(self.run_id, time.monotonic_ns(), agent.name))
+
+    def watch_stream(self, stream, agent):
+        """Pass chunks through, emitting `FirstToken` and `LastToken` around them."""
+        pending = True
+        for chunk in stream:
+            if pending and _has_token(chunk):
+                self.first_token(agent)
+                pending = False
+            yield chunk
+        self.last_token(agent)
+
+    async def awatch_stream(self, stream, agent):
+        pending = True
+        async for chunk in stream:
+            if pending and _has_token(chunk):
+                self.first_token(agent)
+                pending = False
+            yield chunk
+        self.last_token(agent)
+
+    def handoff(self, from_agent, to_agent) -> None:
+        self._emit(
+            Handoff(self.run_id, time.monotonic_ns(), from_agent.name, to_agent.name)
+        )
+
+    def wrap_tool(self, func: Callable, name: str, tool_call_id: str) -> Callable:
+        """Wrap an agent function so each call emits `ToolCallStart`/`ToolCallEnd`."""
+        emit, run_id = self._emit, self.run_id
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def traced_async(**kwargs):
+                emit(ToolCallStart(run_id, time.monotonic_ns(), name, tool_call_id))
+                try:
+                    result = await func(**kwargs)
+                except BaseException as e:
+                    emit(ToolCallEnd(run_id, time.monotonic_ns(), name, tool_call_id, repr(e)))
+                    raise
+                emit(ToolCallEnd(run_id, time.monotonic_ns(), name, tool_call_id))
+                return result
+
+            return traced_async
+
+        @functools.wraps(func)
+        def traced(**kwargs):
+            emit(ToolCallStart(run_id, time.monotonic_ns(), name, tool_call_id))
+            try:
+                result = func(**kwargs)
+            except BaseException as e:
+                emit(ToolCallEnd(run_id, time.monotonic_ns(), name, tool_call_id, repr(e)))
+                raise
+            emit(ToolCallEnd(run_id, time.monotonic_ns(), name, tool_call_id))
+            return result
+
+        return traced
+
+
+class Tracer:
+    """
+    Fans trace events out to exporters. An exporter is any callable taking a
+    `TraceEvent`; it runs inline on the hot path (and on tool worker threads), so
+    it should be quick and thread-safe.
+    """
+
+    def __init__(self, *exporters: Callable):
+        self.exporters: List[Callable] = list(exporters)
+
+    def add_exporter(self, exporter: Callable) -> None:
+        self.exporters.append(exporter)
+
+    def emit(self, event: TraceEvent) -> None:
+        for exporter in self.exporters:
+            exporter(event)
+
+    def start_turn(self, agent) -> TurnTrace:
+        trace = TurnTrace(self.emit)
+        trace.turn_start(agent)
+        return trace
+
+
+class RingBufferExporter:
+    """Keeps the last `capacity` events in memory."""
+
+    def __init__(self, capacity: int = 10_000):
+        self._events = deque(maxlen=capacity)
+
+    def __call__(self, event: TraceEvent) -> None:
+        self._events.append(event)
+
+    def events(self) -> List[TraceEvent]:
+        return list(self._events)
+
+    def clear(self) -> None:
+        self._events.clear()
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    trace_id: int
+    span_id: int
+    parent_id: Optional[int]
+    start_ns: int
+    end_ns: Optional[int] = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+    events: List[tuple] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def duration_ns(self) -> Optional[int]:
+        return None if self.end_ns is None else self.end_ns - self.start_ns
+
+
+class SpanExporter:
+    """
+    Folds trace events into OpenTelemetry-style spans: one `swarm.turn` span per
+    run, with child `swarm.completion` spans (carrying `time_to_first_token_ns`)
+    and `swarm.tool` spans; handoffs are recorded as span events on the turn.
+    Finished spans are passed to `on_span`, or collected in `spans` when it is
+    None, e.g. for forwarding to an OpenTelemetry SDK exporter. The end of a turn
+    also ends any of its spans still open, e.g. after an error, with an error.
+    """
+
+    def __init__(self, on_span: Optional[Callable[[Span], None]] = None):
+        self.on_span = on_span
+        self.spans: List[Span] = []
+        self._open: Dict[tuple, Span] = {}
+        self._lock = threading.Lock()
+
+    def _start(self, key, name, event, parent_key=None, **attributes) -> None:
+        parent = self._open.get(parent_key) if parent_key else None
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent else random.getrandbits(128),
+            span_id=random.getrandbits(64),
+            parent_id=parent.span_id if parent else None,
+            start_ns=event.timestamp_ns,
+            attributes=attributes,
+        )
+        self._open[key] = span
+
+    def _end(self, key, event, error=None) -> None:
+        span = self._open.pop(key, None)
+        if span is None:
+            return
+        span.end_ns = event.timestamp_ns
+        span.error = error
+        if self.on_span is not None:
+            self.on_span(span)
+        else:
+            self.spans.append(span)
+
+    def __call__(self, event: TraceEvent) -> None:
+        run = event.run_id
+        with self._lock:
+            match event:
+                case TurnStart():
+                    self._start(("turn", run), "swarm.turn", event, agent=event.agent)
+                case CompletionRequest():
+                    self._start(
+                        ("completion", run),
+                        "swarm.completion",
+                        event,
+                        parent_key=("turn", run),
+                        agent=event.agent,
+                        model=event.model,
+                        stream=event.stream,
+                    )
+                case FirstToken():
+                    span = self._open.get(("completion", run))
+                    if span is not None:
+                        span.attributes["time_to_first_token_ns"] = (
+                            event.timestamp_ns - span.start_ns
+                        )
+                case LastToken():
+                    self._end(("completion", run), event)
+                case ToolCallStart():
+                    self._start(
+                        ("tool", run, event.tool_call_id),
+                        "swarm.tool",
+                        event,
+                        parent_key=("turn", run),
+                        tool=event.name,
+                    )
+                case ToolCallEnd():
+                    self._end(("tool", run, event.tool_call_id), event, event.error)
+                case Handoff():
+                    span = self._open.get(("turn", run))
+                    if span is not None:
+                        span.events.append(
+                            ("handoff", event.timestamp_ns, event.from_agent, event.to_agent)
+                        )
+                case TurnEnd():
+                    span = self._open.get(("turn", run))
+                    if span is not None:
+                        span.attributes["final_agent"] = event.agent
+                        span.attributes["message_count"] = event.message_count
+                    for key in [k for k in self._open if k[1] == run and k[0] != "turn"]:
+                        self._end(key, event, event.error or "unfinished at end of turn")
+                    self._end(("turn", run), event, event.error)
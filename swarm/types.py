@@ -3,10 +3,13 @@ from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
     Function,
 )
-from typing import List, Callable, Union, Optional
+import copy
+from typing import Dict, List, Callable, Union, Optional
 
 # Third-party imports
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
+
+from .tools import ToolRegistry
 
 AgentFunction = Callable[[], Union[str, "Agent", dict]]
 
@@ -15,9 +18,79 @@ class Agent(BaseModel):
     name: str = "Agent"
     model: str = "gpt-4o"
     instructions: Union[str, Callable[[], str]] = "You are a helpful agent."
+    # context keys read by a callable `instructions`; when set, the rendered
+    # instructions are reused for as long as those values are unchanged
+    instructions_depends_on: Optional[List[str]] = None
+    # per-turn context, appended to the system prompt (or sent after the
+    # history with `StablePrefix`) so `instructions` can stay static
+    context_instructions: Union[str, Callable[[], str], None] = None
     functions: List[AgentFunction] = []
     tool_choice: str = None
     parallel_tool_calls: bool = True
+    # bounds the prompt sent for this agent, see `swarm.context`
+    context_policy: Optional[Callable] = None
+    # names of pure functions whose results may be reused, mapped to a TTL in
+    # seconds (None: no expiry); see `swarm.tool_cache.cached_tool`
+    cached_tools: Optional[Dict[str, Optional[float]]] = None
+
+    _tool_registry: Optional[ToolRegistry] = PrivateAttr(default=None)
+
+    def tool_registry(self) -> ToolRegistry:
+        """Return the compiled tools, recompiling only when `functions` changed."""
+        registry = self._tool_registry
+        if registry is None or not registry.matches(self.functions, self.cached_tools):
+            registry = self._tool_registry = ToolRegistry(
+                self.functions, self.cached_tools
+            )
+        return registry
+
+    def render_instructions(self, context_variables: dict, memo: Optional[dict] = None) -> str:
+        """
+        Render the system prompt. With `instructions_depends_on` and a `memo`
+        (a conversation's `MessageLog.instructions_memo`), a callable is only
+        re-run when one of the declared context values has changed, so
+        conversations sharing the agent do not evict each other's prompt.
+        """
+        instructions = self.instructions
+        if not callable(instructions):
+            return instructions
+        keys = self.instructions_depends_on
+        if keys is None or memo is None:
+            return instructions(context_variables)
+
+        values = tuple(context_variables.get(key, "") for key in keys)
+        entry = memo.get(self.name)
+        if (
+            entry is not None
+            and entry[0] is instructions
+            and all(map(_unchanged, values, entry[1], entry[2]))
+        ):
+            return entry[3]
+        rendered = instructions(context_variables)
+        try:
+            snapshots = tuple(map(_snapshot, values))
+        except Exception:
+            # uncopyable values (clients, ...): render on every call
+            memo.pop(self.name, None)
+            return rendered
+        memo[self.name] = (instructions, values, snapshots, rendered)
+        return rendered
+
+
+def _compared_by_identity(value) -> bool:
+    return type(value).__eq__ is object.__eq__
+
+
+def _snapshot(value):
+    # values are copied so in-place edits to them still invalidate the memo;
+    # a copy of a value compared by identity would never match, so keep none
+    return None if _compared_by_identity(value) else copy.deepcopy(value)
+
+
+def _unchanged(value, original, snapshot) -> bool:
+    if _compared_by_identity(value):
+        return value is original
+    return value == snapshot
 
 
 class Response(BaseModel):
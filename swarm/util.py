@@ -1,5 +1,14 @@
+import collections.abc
+import copy
+import dataclasses
+import enum
 import inspect
+import re
+import types
+import typing
+import weakref
 from datetime import datetime
+from typing import Dict, Optional
 
 
 def debug_print(debug: bool, *args: str) -> None:
@@ -10,6 +19,23 @@ def debug_print(debug: bool, *args: str) -> None:
     print(f"\033[97m[\033[90m{timestamp}\033[97m]\033[90m {message}\033[0m")
 
 
+def estimate_message_tokens(message) -> int:
+    """
+    Cheap local estimate of a message's prompt tokens (~4 characters per token
+    plus a small per-message overhead). Good enough for budgeting, not billing.
+    """
+    content = message.get("content") or ""
+    chars = len(content if isinstance(content, str) else str(content))
+    for tool_call in message.get("tool_calls") or ():
+        function = tool_call["function"]
+        chars += len(function["name"]) + len(function["arguments"])
+    return chars // 4 + 4
+
+
+def estimate_tokens(messages) -> int:
+    return sum(estimate_message_tokens(message) for message in messages)
+
+
 def merge_fields(target, source):
     for key, value in source.items():
         if isinstance(value, str):
@@ -28,28 +54,210 @@ def merge_chunk(final_response: dict, delta: dict) -> None:
         merge_fields(final_response["tool_calls"][index], tool_calls[0])
 
 
-def function_to_json(func) -> dict:
-    """
-    Converts a Python function into a JSON-serializable dictionary
-    that describes the function's signature, including its name,
-    description, and parameters.
+_TYPE_MAP = {
+    str: "string",
+    int: "integer",
+    float: "number",
+    bool: "boolean",
+    list: "array",
+    dict: "object",
+    type(None): "null",
+}
+_ARRAY_TYPES = (list, set, frozenset, tuple, collections.abc.Sequence, collections.abc.Set)
 
-    Args:
-        func: The function to be converted.
+# function -> schema, shared by every caller; see `function_schema`
+_schema_cache = weakref.WeakKeyDictionary()
 
-    Returns:
-        A dictionary representing the function's signature in JSON format.
+
+def type_to_schema(annotation, defs: Optional[dict] = None) -> dict:
     """
-    type_map = {
-        str: "string",
-        int: "integer",
-        float: "number",
-        bool: "boolean",
-        list: "array",
-        dict: "object",
-        type(None): "null",
+    JSON schema for a type hint. Builtins, `list[int]`-style generics, `Optional`
+    and other unions, `Literal`, enums, `Annotated` descriptions, dataclasses and
+    pydantic models are described structurally; anything else is a string.
+    Definitions of pydantic models are collected in `defs`.
+    """
+    if annotation is inspect.Parameter.empty:
+        return {"type": "string"}
+    if annotation is typing.Any:
+        return {}
+    if annotation in _TYPE_MAP:
+        return {"type": _TYPE_MAP[annotation]}
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Annotated:
+        schema = type_to_schema(args[0], defs)
+        descriptions = [meta for meta in args[1:] if isinstance(meta, str)]
+        if descriptions:
+            schema["description"] = " ".join(descriptions)
+        return schema
+
+    if origin is typing.Union or origin is types.UnionType:
+        options = [type_to_schema(arg, defs) for arg in args]
+        simple = [option.get("type") for option in options]
+        if all(len(o) == 1 and isinstance(t, str) for o, t in zip(options, simple)):
+            return {"type": simple}
+        return {"anyOf": options}
+
+    if origin is typing.Literal:
+        values = list(args)
+        kinds = {type(value) for value in values}
+        schema = {"enum": values}
+        if len(kinds) == 1 and kinds.pop() in _TYPE_MAP:
+            schema["type"] = _TYPE_MAP[type(values[0])]
+        return schema
+
+    if origin is not None and isinstance(origin, type):
+        if issubclass(origin, tuple) and args and args[-1] is not Ellipsis:
+            items = [type_to_schema(arg, defs) for arg in args]
+            return {
+                "type": "array",
+                "prefixItems": items,
+                "minItems": len(items),
+                "maxItems": len(items),
+            }
+        if issubclass(origin, _ARRAY_TYPES):
+            schema = {"type": "array"}
+            if args:
+                schema["items"] = type_to_schema(args[0], defs)
+            return schema
+        if issubclass(origin, collections.abc.Mapping):
+            schema = {"type": "object"}
+            if len(args) == 2:
+                schema["additionalProperties"] = type_to_schema(args[1], defs)
+            return schema
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, enum.Enum):
+            values = [member.value for member in annotation]
+            schema = {"enum": values}
+            kinds = {type(value) for value in values}
+            if len(kinds) == 1 and kinds.pop() in _TYPE_MAP:
+                schema["type"] = _TYPE_MAP[type(values[0])]
+            return schema
+        if hasattr(annotation, "model_json_schema"):
+            schema = annotation.model_json_schema(ref_template="#/$defs/{model}")
+            if defs is not None:
+                defs.update(schema.pop("$defs", {}))
+            return schema
+        if dataclasses.is_dataclass(annotation):
+            return _object_schema(
+                [
+                    (field.name, hints.get(field.name, field.type), _has_default(field))
+                    for hints in [_type_hints(annotation)]
+                    for field in dataclasses.fields(annotation)
+                ],
+                defs,
+            )
+        for base, name in _TYPE_MAP.items():
+            if base is not type(None) and issubclass(annotation, base):
+                return {"type": name}
+
+    return {"type": "string"}
+
+
+def _has_default(field) -> bool:
+    return (
+        field.default is not dataclasses.MISSING
+        or field.default_factory is not dataclasses.MISSING
+    )
+
+
+def _type_hints(obj) -> dict:
+    try:
+        return typing.get_type_hints(obj, include_extras=True)
+    except Exception:
+        # unresolvable forward references fall back to the raw annotations
+        return getattr(obj, "__annotations__", {})
+
+
+def _implicit_optional(annotation, default):
+    """`Optional[annotation]` for parameters written as `x: int = None`."""
+    if default is not None or annotation in (inspect.Parameter.empty, typing.Any):
+        return annotation
+    if typing.get_origin(annotation) is typing.Annotated:
+        inner, *metadata = typing.get_args(annotation)
+        return typing.Annotated[(typing.Optional[inner], *metadata)]
+    return typing.Optional[annotation]
+
+
+def _object_schema(fields, defs, descriptions=None) -> dict:
+    properties = {}
+    for name, annotation, _ in fields:
+        schema = type_to_schema(annotation, defs)
+        if descriptions and name in descriptions and "description" not in schema:
+            schema["description"] = descriptions[name]
+        properties[name] = schema
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": [name for name, _, has_default in fields if not has_default],
     }
 
+
+_DOC_SECTION = re.compile(r"^\s*(Args|Arguments|Parameters|Params)\s*:\s*$")
+_DOC_ARG = re.compile(r"^(\s*)\*{0,2}(\w+)\s*(?:\([^)]*\))?\s*:\s*(.*)$")
+_DOC_SPHINX = re.compile(r"^\s*:param\s+(?:[\w\[\], ]+\s+)?(\w+)\s*:\s*(.*)$")
+
+
+def parse_param_descriptions(doc: Optional[str]) -> Dict[str, str]:
+    """Parameter descriptions from a Google-style `Args:` section or `:param x:` lines."""
+    if not doc:
+        return {}
+    descriptions = {}
+    lines = inspect.cleandoc(doc).splitlines()
+    section_indent = None
+    current = None
+    for line in lines:
+        sphinx = _DOC_SPHINX.match(line)
+        if sphinx:
+            current = sphinx.group(1)
+            descriptions[current] = sphinx.group(2).strip()
+            continue
+        if _DOC_SECTION.match(line):
+            section_indent = -1
+            current = None
+            continue
+        if section_indent is None:
+            continue
+        if not line.strip():
+            continue
+        indent = len(line) - len(line.lstrip())
+        if section_indent == -1:
+            section_indent = indent
+        if indent < section_indent or (indent == 0 and line.rstrip().endswith(":")):
+            section_indent = None
+            current = None
+            continue
+        match = _DOC_ARG.match(line)
+        if indent == section_indent and match:
+            current = match.group(2)
+            descriptions[current] = match.group(3).strip()
+        elif current is not None:
+            descriptions[current] = f"{descriptions[current]} {line.strip()}".strip()
+    return descriptions
+
+
+def function_schema(func) -> dict:
+    """
+    The tool schema of `func`, built once per function object and cached in a
+    weak-keyed cache. The returned dict is shared: do not mutate it (use
+    `function_to_json` for a private copy).
+    """
+    try:
+        return _schema_cache[func]
+    except (KeyError, TypeError):
+        pass
+    schema = _build_function_schema(func)
+    try:
+        _schema_cache[func] = schema
+    except TypeError:
+        pass  # not weak-referenceable, e.g. some builtins; rebuilt on each call
+    return schema
+
+
+def _build_function_schema(func) -> dict:
     try:
         signature = inspect.signature(func)
     except ValueError as e:
@@ -57,31 +265,43 @@ def function_to_json(func) -> dict:
             f"Failed to get signature for function {func.__name__}: {str(e)}"
         )
 
-    parameters = {}
-    for param in signature.parameters.values():
-        try:
-            param_type = type_map.get(param.annotation, "string")
-        except KeyError as e:
-            raise KeyError(
-                f"Unknown type annotation {param.annotation} for parameter {param.name}: {str(e)}"
+    hints = _type_hints(func)
+    defs = {}
+    parameters = _object_schema(
+        [
+            (
+                param.name,
+                _implicit_optional(hints.get(param.name, param.annotation), param.default),
+                param.default is not inspect.Parameter.empty,
             )
-        parameters[param.name] = {"type": param_type}
-
-    required = [
-        param.name
-        for param in signature.parameters.values()
-        if param.default == inspect._empty
-    ]
+            for param in signature.parameters.values()
+        ],
+        defs,
+        parse_param_descriptions(func.__doc__),
+    )
+    if defs:
+        parameters["$defs"] = defs
 
     return {
         "type": "function",
         "function": {
             "name": func.__name__,
             "description": func.__doc__ or "",
-            "parameters": {
-                "type": "object",
-                "properties": parameters,
-                "required": required,
-            },
+            "parameters": parameters,
         },
     }
+
+
+def function_to_json(func) -> dict:
+    """
+    Converts a Python function into a JSON-serializable dictionary
+    that describes the function's signature, including its name,
+    description, and parameters.
+
+    Args:
+        func: The function to be converted.
+
+    Returns:
+        A dictionary representing the function's signature in JSON format.
+    """
+    return copy.deepcopy(function_schema(func))
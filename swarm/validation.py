@@ -0,0 +1,320 @@
+import dataclasses
+import enum
+import inspect
+import json
+import types
+import typing
+import weakref
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Tuple
+
+from .util import _implicit_optional, _type_hints
+
+_CTX_VARS_NAME = "context_variables"
+
+# function -> validator, see `compile_validator`
+_validator_cache = weakref.WeakKeyDictionary()
+
+
+class InvalidArgument(ValueError):
+    def __init__(self, path: str, message: str):
+        super().__init__(f"{path}: {message}")
+        self.path = path
+        self.message = message
+
+
+def _describe(value) -> str:
+    text = json.dumps(value, default=str)
+    return text if len(text) <= 40 else text[:37] + "..."
+
+
+def _passthrough(value, path):
+    return value
+
+
+def _to_int(value, path):
+    if type(value) is int:
+        return value
+    if type(value) is float and value.is_integer():
+        return int(value)
+    if type(value) is str:
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    raise InvalidArgument(path, f"expected an integer, got {_describe(value)}")
+
+
+def _to_float(value, path):
+    if type(value) in (int, float):
+        return float(value)
+    if type(value) is str:
+        try:
+            return float(value.strip())
+        except ValueError:
+            pass
+    raise InvalidArgument(path, f"expected a number, got {_describe(value)}")
+
+
+def _to_bool(value, path):
+    if type(value) is bool:
+        return value
+    if type(value) is str and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise InvalidArgument(path, f"expected a boolean, got {_describe(value)}")
+
+
+def _to_str(value, path):
+    if type(value) is str:
+        return value
+    if type(value) in (int, float):
+        return str(value)
+    raise InvalidArgument(path, f"expected a string, got {_describe(value)}")
+
+
+def _expect(kind, name):
+    def check(value, path):
+        if isinstance(value, kind):
+            return value
+        raise InvalidArgument(path, f"expected {name}, got {_describe(value)}")
+
+    return check
+
+
+_SCALARS = {
+    int: _to_int,
+    float: _to_float,
+    bool: _to_bool,
+    str: _to_str,
+    list: _expect(list, "an array"),
+    dict: _expect(dict, "an object"),
+}
+
+
+def compile_converter(annotation) -> Callable:
+    """
+    Build a `convert(value, path)` function for a type hint, mirroring the
+    schema `type_to_schema` describes. It returns the coerced value or raises
+    `InvalidArgument`; unknown types are passed through unchecked.
+    """
+    if annotation is inspect.Parameter.empty or annotation is typing.Any:
+        return _passthrough
+    if annotation is type(None):
+        def check_none(value, path):
+            if value is None:
+                return None
+            raise InvalidArgument(path, f"expected null, got {_describe(value)}")
+
+        return check_none
+    if annotation in _SCALARS:
+        return _SCALARS[annotation]
+
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is typing.Annotated:
+        return compile_converter(args[0])
+
+    if origin is typing.Union or origin is types.UnionType:
+        nullable = type(None) in args
+        options = [compile_converter(arg) for arg in args if arg is not type(None)]
+
+        if len(options) == 1:
+            (option,) = options
+
+            def convert_optional(value, path):
+                return None if value is None else option(value, path)
+
+            return convert_optional
+
+        def convert_union(value, path):
+            if value is None and nullable:
+                return None
+            errors = []
+            for option in options:
+                try:
+                    return option(value, path)
+                except InvalidArgument as e:
+                    errors.append(e.message)
+            raise InvalidArgument(path, " or ".join(errors))
+
+        return convert_union
+
+    if origin is typing.Literal:
+        allowed = list(args)
+
+        def convert_literal(value, path):
+            if value in allowed:
+                return value
+            raise InvalidArgument(
+                path, f"expected one of {_describe(allowed)}, got {_describe(value)}"
+            )
+
+        return convert_literal
+
+    if origin is not None and isinstance(origin, type):
+        if issubclass(origin, (list, set, frozenset, tuple, typing.Sequence)):
+            if issubclass(origin, tuple) and args and args[-1] is not Ellipsis:
+                items = [compile_converter(arg) for arg in args]
+
+                def convert_tuple(value, path):
+                    if not isinstance(value, list) or len(value) != len(items):
+                        raise InvalidArgument(
+                            path, f"expected an array of {len(items)} items"
+                        )
+                    return tuple(
+                        item(element, f"{path}[{i}]")
+                        for i, (item, element) in enumerate(zip(items, value))
+                    )
+
+                return convert_tuple
+
+            item = compile_converter(args[0]) if args else _passthrough
+            build = origin if origin in (set, frozenset, tuple) else list
+
+            def convert_array(value, path):
+                if not isinstance(value, list):
+                    raise InvalidArgument(path, f"expected an array, got {_describe(value)}")
+                items = [item(element, f"{path}[{i}]") for i, element in enumerate(value)]
+                try:
+                    return build(items)
+                except TypeError:
+                    # e.g. objects in a set
+                    raise InvalidArgument(path, f"items of {build.__name__} must be hashable")
+
+            return convert_array
+
+        if issubclass(origin, Mapping):
+            item = compile_converter(args[1]) if len(args) == 2 else _passthrough
+
+            def convert_mapping(value, path):
+                if not isinstance(value, dict):
+                    raise InvalidArgument(path, f"expected an object, got {_describe(value)}")
+                return {key: item(element, f"{path}.{key}") for key, element in value.items()}
+
+            return convert_mapping
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, enum.Enum):
+            def convert_enum(value, path):
+                try:
+                    return annotation(value)
+                except ValueError:
+                    allowed = [member.value for member in annotation]
+                    raise InvalidArgument(
+                        path, f"expected one of {_describe(allowed)}, got {_describe(value)}"
+                    )
+
+            return convert_enum
+
+        if hasattr(annotation, "model_validate"):
+            def convert_model(value, path):
+                try:
+                    return annotation.model_validate(value)
+                except ValueError as e:
+                    raise InvalidArgument(path, str(e).splitlines()[0])
+
+            return convert_model
+
+        if dataclasses.is_dataclass(annotation):
+            hints = _type_hints(annotation)
+            fields = [
+                (field.name, compile_converter(hints.get(field.name, field.type)))
+                for field in dataclasses.fields(annotation)
+            ]
+
+            def convert_dataclass(value, path):
+                if not isinstance(value, dict):
+                    raise InvalidArgument(path, f"expected an object, got {_describe(value)}")
+                unknown = set(value) - {name for name, _ in fields}
+                if unknown:
+                    raise InvalidArgument(path, f"unexpected fields {sorted(unknown)}")
+                try:
+                    return annotation(
+                        **{
+                            name: convert(value[name], f"{path}.{name}")
+                            for name, convert in fields
+                            if name in value
+                        }
+                    )
+                except TypeError as e:
+                    raise InvalidArgument(path, str(e))
+
+            return convert_dataclass
+
+    return _passthrough
+
+
+class ArgumentValidator:
+    """
+    Checks and coerces the JSON arguments of one tool before it is called:
+    required parameters must be present, unknown ones are rejected unless the
+    function takes `**kwargs`, and each value is converted to its annotated type
+    (e.g. `"3"` to `3` for an `int`). Compiled once per function.
+    """
+
+    __slots__ = ("converters", "required", "accepts_extra")
+
+    def __init__(self, func: Callable):
+        signature = inspect.signature(func)
+        hints = _type_hints(func)
+        self.converters: Dict[str, Callable] = {}
+        self.required: List[str] = []
+        self.accepts_extra = False
+        for param in signature.parameters.values():
+            if param.kind is param.VAR_KEYWORD:
+                self.accepts_extra = True
+                continue
+            if param.kind is param.VAR_POSITIONAL or param.name == _CTX_VARS_NAME:
+                continue
+            self.converters[param.name] = compile_converter(
+                _implicit_optional(hints.get(param.name, param.annotation), param.default)
+            )
+            if param.default is param.empty:
+                self.required.append(param.name)
+
+    def __call__(self, args) -> Tuple[dict, List[str]]:
+        """Return the converted arguments and a list of problems, empty if valid."""
+        if not isinstance(args, dict):
+            return args, [f"arguments must be a JSON object, got {_describe(args)}"]
+        errors = [f"{name}: missing required argument" for name in self.required if name not in args]
+        converted = {}
+        for name, value in args.items():
+            convert = self.converters.get(name)
+            if convert is None:
+                if self.accepts_extra:
+                    converted[name] = value
+                elif name != _CTX_VARS_NAME:
+                    errors.append(f"{name}: unexpected argument")
+                continue
+            try:
+                converted[name] = convert(value, name)
+            except InvalidArgument as e:
+                errors.append(str(e))
+        return converted, errors
+
+
+def compile_validator(func: Callable) -> ArgumentValidator:
+    """The `ArgumentValidator` of `func`, cached per function object."""
+    try:
+        return _validator_cache[func]
+    except (KeyError, TypeError):
+        pass
+    validator = ArgumentValidator(func)
+    try:
+        _validator_cache[func] = validator
+    except TypeError:
+        pass
+    return validator
+
+
+def argument_error(name: str, errors: List[str]) -> str:
+    """The tool message sent back to the model for rejected arguments."""
+    return json.dumps(
+        {
+            "error": "invalid_arguments",
+            "tool": name,
+            "details": errors,
+            "hint": "Fix the arguments and call the tool again.",
+        }
+    )
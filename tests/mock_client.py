@@ -1,7 +1,12 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
 from openai import OpenAI
 from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice as ChunkChoice,
+    ChoiceDelta,
+)
 import json
 
 
@@ -41,6 +46,68 @@ def create_mock_response(message, function_calls=[], model="gpt-4o"):
     )
 
 
+def create_mock_chunk(delta, model="gpt-4o"):
+    return ChatCompletionChunk(
+        id="mock_chunk_id",
+        created=1234567890,
+        model=model,
+        object="chat.completion.chunk",
+        choices=[ChunkChoice(delta=ChoiceDelta(**delta), index=0, finish_reason=None)],
+    )
+
+
+def create_mock_stream(content="", function_calls=[], fragment_size=4, model="gpt-4o"):
+    """
+    Build the chunk sequence of a streamed completion, splitting content and
+    tool call arguments into fragments of `fragment_size` characters.
+    """
+    chunks = [create_mock_chunk({"role": "assistant"}, model)]
+    for i in range(0, len(content), fragment_size):
+        chunks.append(
+            create_mock_chunk({"content": content[i: i + fragment_size]}, model))
+    for index, call in enumerate(function_calls):
+        chunks.append(
+            create_mock_chunk(
+                {
+                    "tool_calls": [
+                        {
+                            "index": index,
+                            "id": f"mock_tc_id_{index}",
+                            "type": "function",
+                            "function": {"name": call.get("name", ""), "arguments": ""},
+                        }
+                    ]
+                },
+                model,
+            )
+        )
+        arguments = json.dumps(call.get("args", {}))
+        for i in range(0, len(arguments), fragment_size):
+            chunks.append(
+                create_mock_chunk(
+                    {
+                        "tool_calls": [
+                            {
+                                "index": index,
+                                "function": {"arguments": arguments[i: i + fragment_size]},
+                            }
+                        ]
+                    },
+                    model,
+                )
+            )
+    return chunks
+
+
+class MockAsyncStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
 class MockOpenAIClient:
     def __init__(self):
         self.chat = MagicMock()
@@ -64,6 +131,13 @@ class MockOpenAIClient:
         self.chat.completions.create.assert_called_with(**kwargs)
 
 
+class MockAsyncOpenAIClient(MockOpenAIClient):
+    def __init__(self):
+        self.chat = MagicMock()
+        self.chat.completions = MagicMock()
+        self.chat.completions.create = AsyncMock()
+
+
 # Initialize the mock client
 client = MockOpenAIClient()
 
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from swarm import AsyncSwarm, Agent
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockAsyncStream,
+    create_mock_response,
+    create_mock_stream,
+)
+from unittest.mock import Mock
+
+DEFAULT_RESPONSE_CONTENT = "sample response content"
+
+
+@pytest.fixture
+def mock_openai_client():
+    m = MockAsyncOpenAIClient()
+    m.set_response(
+        create_mock_response({"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT})
+    )
+    return m
+
+
+def test_run_with_simple_message(mock_openai_client: MockAsyncOpenAIClient):
+    agent = Agent()
+    client = AsyncSwarm(client=mock_openai_client)
+    messages = [{"role": "user", "content": "Hello, how are you?"}]
+    response = asyncio.run(client.run(agent=agent, messages=messages))
+
+    assert response.messages[-1]["role"] == "assistant"
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_async_and_sync_tool_calls(mock_openai_client: MockAsyncOpenAIClient):
+    get_weather_mock = Mock()
+    sync_threads = []
+
+    async def get_weather(location):
+        get_weather_mock(location=location)
+        return "It's sunny today."
+
+    def get_time(location):
+        sync_threads.append(threading.current_thread())
+        return "noon"
+
+    agent = Agent(name="Test Agent", functions=[get_weather, get_time])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "get_weather", "args": {"location": "San Francisco"}},
+                    {"name": "get_time", "args": {"location": "San Francisco"}},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_openai_client)
+    messages = [{"role": "user", "content": "Weather and time in San Francisco?"}]
+    response = asyncio.run(client.run(agent=agent, messages=messages))
+
+    get_weather_mock.assert_called_once_with(location="San Francisco")
+    # sync functions are offloaded so they never block the event loop
+    assert sync_threads and sync_threads[0] is not threading.main_thread()
+    assert [m["content"] for m in response.messages if m["role"] == "tool"] == [
+        "It's sunny today.",
+        "noon",
+    ]
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_sync_tools_run_on_the_tool_executor(mock_openai_client: MockAsyncOpenAIClient):
+    def get_time():
+        return threading.current_thread().name
+
+    agent = Agent(functions=[get_time])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "get_time", "args": {}}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tools") as pool:
+        client = AsyncSwarm(client=mock_openai_client, tool_executor=pool)
+        messages = [{"role": "user", "content": "What time is it?"}]
+        response = asyncio.run(client.run(agent=agent, messages=messages))
+
+    assert client.tool_executor is pool
+    assert response.messages[1]["content"].startswith("tools")
+
+
+def test_handoff(mock_openai_client: MockAsyncOpenAIClient):
+    async def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Test Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Test Agent 2")
+
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "transfer_to_agent2"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_openai_client)
+    messages = [{"role": "user", "content": "I want to talk to agent 2"}]
+    response = asyncio.run(client.run(agent=agent1, messages=messages))
+
+    assert response.agent == agent2
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_concurrent_tool_calls_keep_order(mock_openai_client: MockAsyncOpenAIClient):
+    finished = []
+
+    async def slow_lookup(order_id):
+        await asyncio.sleep(0.05)
+        finished.append(order_id)
+        return f"order {order_id}"
+
+    async def fast_lookup(order_id):
+        finished.append(order_id)
+        return f"order {order_id}"
+
+    agent = Agent(name="Test Agent", functions=[slow_lookup, fast_lookup])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "slow_lookup", "args": {"order_id": "1"}},
+                    {"name": "fast_lookup", "args": {"order_id": "2"}},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_openai_client, concurrent_tool_calls=True)
+    messages = [{"role": "user", "content": "Check orders 1 and 2"}]
+    response = asyncio.run(client.run(agent=agent, messages=messages))
+
+    # the fast call overtakes the slow one, but history keeps tool-call order
+    assert finished == ["2", "1"]
+    assert [m["content"] for m in response.messages if m["role"] == "tool"] == [
+        "order 1",
+        "order 2",
+    ]
+
+
+def test_run_and_stream(mock_openai_client: MockAsyncOpenAIClient):
+    async def get_weather(location):
+        return "It's sunny today."
+
+    agent = Agent(name="Test Agent", functions=[get_weather])
+    mock_openai_client.set_sequential_responses(
+        [
+            MockAsyncStream(
+                create_mock_stream(
+                    function_calls=[
+                        {"name": "get_weather", "args": {"location": "Boston"}}
+                    ]
+                )
+            ),
+            MockAsyncStream(create_mock_stream(content=DEFAULT_RESPONSE_CONTENT)),
+        ]
+    )
+
+    async def collect():
+        client = AsyncSwarm(client=mock_openai_client)
+        messages = [{"role": "user", "content": "Weather in Boston?"}]
+        return [c async for c in await client.run(agent, messages, stream=True)]
+
+    chunks = asyncio.run(collect())
+    response = chunks[-1]["response"]
+
+    assert response.messages[0]["tool_calls"][0]["function"] == {
+        "name": "get_weather",
+        "arguments": '{"location": "Boston"}',
+    }
+    assert response.messages[1]["content"] == "It's sunny today."
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
@@ -0,0 +1,27 @@
+from benchmarks.bench_swarm import main
+
+
+def test_benchmarks_smoke(tmp_path, capsys):
+    baseline = str(tmp_path / "baseline.json")
+    args = ["--iterations", "3", "--history", "4", "--baseline", baseline]
+
+    assert main(args + ["--save-baseline"]) == 0
+    output = capsys.readouterr().out
+    for scenario in ("run_tools", "run_handoff", "stream_tools", "handle_tool_calls"):
+        assert scenario in output
+    # a generous tolerance keeps the timing comparison itself from flaking
+    assert main(args + ["--compare", "--tolerance", "100"]) == 0
+
+
+def test_message_benchmark_smoke(capsys):
+    from benchmarks.bench_messages import main as bench_messages
+
+    assert bench_messages(["--iterations", "5"]) == 0
+    assert "from_completion" in capsys.readouterr().out
+
+
+def test_types_benchmark_smoke(capsys):
+    from benchmarks.bench_types import main as bench_types
+
+    assert bench_types(["--iterations", "16", "--history", "4"]) == 0
+    assert "merge/str" in capsys.readouterr().out
@@ -0,0 +1,68 @@
+from swarm import Swarm, Agent
+from swarm.cache import CompletionCache, request_key
+from tests.mock_client import (
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "What is your refund policy?"}]
+
+
+def test_request_key_is_canonical():
+    a = {"model": "gpt-4o", "messages": MESSAGES, "tools": None}
+    b = {"tools": None, "messages": MESSAGES, "model": "gpt-4o"}
+    assert request_key(a) == request_key(b)
+    assert request_key(a) != request_key({**a, "tool_choice": "required"})
+
+
+def test_repeated_run_is_served_from_cache():
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "30 days"}))
+    cache = CompletionCache()
+    client = Swarm(client=mock_client, cache=cache)
+
+    first = client.run(agent=Agent(), messages=MESSAGES)
+    second = client.run(agent=Agent(), messages=MESSAGES)
+
+    assert mock_client.chat.completions.create.call_count == 1
+    assert second.messages == first.messages
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_streamed_completion_is_replayed():
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_stream(content="30 days"))
+    client = Swarm(client=mock_client, cache=CompletionCache())
+
+    live = list(client.run(agent=Agent(), messages=MESSAGES, stream=True))
+    replayed = list(client.run(agent=Agent(), messages=MESSAGES, stream=True))
+
+    assert mock_client.chat.completions.create.call_count == 1
+    assert replayed[:-1] == live[:-1]
+    assert replayed[-1]["response"].messages == live[-1]["response"].messages
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "completions.db")
+    params = {"model": "gpt-4o", "messages": MESSAGES}
+    completion = create_mock_response({"role": "assistant", "content": "30 days"})
+
+    CompletionCache(path=path).get_or_create(params, lambda: completion)
+    restored = CompletionCache(path=path).get_or_create(params, lambda: 1 / 0)
+
+    assert restored == completion
+    assert restored is not completion
+
+
+def test_ttl_and_size_eviction(tmp_path):
+    expired = CompletionCache(ttl=0)
+    expired.set("a", {"completion": "{}"})
+    assert expired.get("a") is None
+
+    small = CompletionCache(max_entries=2, path=str(tmp_path / "c.db"), max_disk_entries=2)
+    for key in "abc":
+        small.set(key, {"completion": key})
+    assert list(small._memory) == ["b", "c"]
+    count = small._conn.execute("SELECT COUNT(*) FROM completions").fetchone()[0]
+    assert count == 2
@@ -0,0 +1,173 @@
+import asyncio
+
+import pytest
+
+from swarm import AsyncSwarm, Swarm, Agent
+from swarm.context import (
+    SUMMARY_PREFIX,
+    SlidingWindow,
+    SummarizingWindow,
+    completion_summarizer,
+)
+from swarm.history import MessageLog
+from swarm.util import estimate_message_tokens, estimate_tokens
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+)
+
+SYSTEM = {"role": "system", "content": "You are a helpful agent."}
+
+
+def conversation(turns):
+    """User/assistant turns, every third of which calls a tool."""
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i} " + "x" * 200})
+        if i % 3 == 0:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": "",
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "type": "function",
+                            "function": {"name": "lookup", "arguments": "{}"},
+                        }
+                    ],
+                }
+            )
+            messages.append(
+                {"role": "tool", "tool_call_id": f"call_{i}", "content": "y" * 400}
+            )
+        messages.append({"role": "assistant", "content": f"answer {i} " + "z" * 200})
+    return messages
+
+
+def assert_valid(prompt):
+    calls = set()
+    for message in prompt:
+        for tool_call in message.get("tool_calls") or ():
+            calls.add(tool_call["id"])
+        if message["role"] == "tool":
+            assert message["tool_call_id"] in calls
+
+
+def test_window_is_bounded_and_keeps_tool_pairs():
+    policy = SlidingWindow(max_tokens=1000)
+    history = MessageLog()
+    starts = set()
+    for message in conversation(40):
+        history.append(message)
+        prompt = policy(history, SYSTEM)
+        assert prompt[0] is SYSTEM
+        assert prompt[-1] is message
+        assert estimate_tokens(prompt) <= 1000
+        assert_valid(prompt)
+        starts.add(history.context_state["start"])
+    # evictions come in batches rather than on every message
+    assert len(starts) < len(history) / 3
+
+
+def test_pinned_messages_are_kept():
+    messages = conversation(30)
+    messages.insert(1, {"role": "system", "content": "The customer is a gold member."})
+    history = MessageLog(messages)
+
+    prompt = SlidingWindow(max_tokens=800)(history, SYSTEM)
+
+    assert prompt[1] is messages[1]
+    assert prompt[2] is not messages[2]
+    assert len(prompt) < len(messages)
+
+
+def test_summarizing_window_rolls_evicted_messages_into_summary():
+    calls = []
+
+    def summarize(messages, previous):
+        calls.append((len(messages), previous))
+        return f"summary {len(calls)}"
+
+    policy = SummarizingWindow(max_tokens=1200, summarize=summarize, summary_tokens=50)
+    history = MessageLog()
+    for message in conversation(40):
+        history.append(message)
+        prompt = policy(history, SYSTEM)
+        assert estimate_tokens(prompt) <= 1200
+        assert_valid(prompt)
+
+    assert 1 < len(calls) < 20
+    assert calls[0][1] is None
+    assert calls[1][1] == "summary 1"
+    assert prompt[1] == {"role": "system", "content": SUMMARY_PREFIX + f"summary {len(calls)}"}
+
+
+def test_token_counts_are_incremental():
+    messages = conversation(3)
+    history = MessageLog(messages)
+    assert history.token_counts() == [estimate_message_tokens(m) for m in messages]
+
+    history.truncate(2)
+    history.append({"role": "user", "content": "abcd" * 10})
+    assert history.token_counts()[-1] == 14
+    assert len(history.token_counts()) == 3
+
+
+def test_swarm_applies_agent_policy():
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    client = Swarm(client=mock_client)
+    session = client.session(Agent(context_policy=SlidingWindow(max_tokens=600)))
+
+    for i in range(20):
+        session.send(f"message {i} " + "x" * 200)
+        sent = mock_client.chat.completions.create.call_args.kwargs["messages"]
+        assert estimate_tokens(sent) <= 600
+        assert sent[-1]["content"].startswith(f"message {i}")
+
+    # the full history is still kept by the session
+    assert len(session.messages) == 40
+
+
+def test_async_swarm_awaits_the_summarizer():
+    mock_client = MockAsyncOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    summary_client = MockAsyncOpenAIClient()
+    summary_client.set_response(
+        create_mock_response({"role": "assistant", "content": "They asked about orders."})
+    )
+    policy = SummarizingWindow(
+        max_tokens=600, summarize=completion_summarizer(summary_client), summary_tokens=50
+    )
+    client = AsyncSwarm(client=mock_client, context_policy=policy)
+    session = client.session(Agent())
+
+    async def chat():
+        for i in range(10):
+            await session.send(f"message {i} " + "x" * 200)
+
+    asyncio.run(chat())
+
+    assert summary_client.chat.completions.create.await_count >= 1
+    sent = mock_client.chat.completions.create.call_args.kwargs["messages"]
+    assert sent[1]["content"] == SUMMARY_PREFIX + "They asked about orders."
+
+    with pytest.raises(TypeError):
+        policy(MessageLog(conversation(20)), SYSTEM)
+
+
+def test_pinned_messages_follow_rollbacks():
+    history = MessageLog(conversation(20))
+    policy = SlidingWindow(max_tokens=800)
+    policy(history, SYSTEM)
+    mark = len(history)
+    note = {"role": "system", "content": "Escalated to a human."}
+    history.append(note)
+    history.extend(conversation(2))
+    assert note in policy(history, SYSTEM)
+
+    history.truncate(mark)
+    history.extend(conversation(3))
+    assert note not in policy(history, SYSTEM)
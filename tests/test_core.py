@@ -1,6 +1,14 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from swarm import Swarm, Agent
-from tests.mock_client import MockOpenAIClient, create_mock_response
+from swarm.types import Result
+from tests.mock_client import (
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
 from unittest.mock import Mock
 import json
 
@@ -143,3 +151,158 @@ def test_handoff(mock_openai_client: MockOpenAIClient):
     assert response.agent == agent2
     assert response.messages[-1]["role"] == "assistant"
     assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_parallel_tool_calls_with_executor(mock_openai_client: MockOpenAIClient):
+    # both calls must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def lookup_order(order_id):
+        barrier.wait()
+        return f"order {order_id}"
+
+    def set_customer(name):
+        barrier.wait()
+        return Result(value="ok", context_variables={"customer": name})
+
+    agent = Agent(name="Test Agent", functions=[lookup_order, set_customer])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "lookup_order", "args": {"order_id": "42"}},
+                    {"name": "set_customer", "args": {"name": "Ada"}},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        client = Swarm(client=mock_openai_client, tool_executor=executor)
+        messages = [{"role": "user", "content": "Check order 42 for Ada"}]
+        response = client.run(agent=agent, messages=messages)
+
+    tool_messages = [m for m in response.messages if m["role"] == "tool"]
+    assert [m["tool_name"] for m in tool_messages] == ["lookup_order", "set_customer"]
+    assert [m["content"] for m in tool_messages] == ["order 42", "ok"]
+    assert response.context_variables == {"customer": "Ada"}
+
+
+def test_run_does_not_mutate_or_copy_messages(mock_openai_client: MockOpenAIClient):
+    agent = Agent(instructions="Be brief.")
+    user_message = {"role": "user", "content": "Hello"}
+    messages = [user_message]
+
+    client = Swarm(client=mock_openai_client)
+    response = client.run(agent=agent, messages=messages)
+
+    assert messages == [{"role": "user", "content": "Hello"}]
+    assert len(response.messages) == 1
+    sent = mock_openai_client.chat.completions.create.call_args.kwargs["messages"]
+    assert sent[0] == {"role": "system", "content": "Be brief."}
+    # history shares the caller's message dicts instead of deep-copying them
+    assert sent[1] is user_message
+
+
+def test_run_and_stream(mock_openai_client: MockOpenAIClient):
+    def get_weather(location):
+        return "It's sunny today."
+
+    agent = Agent(name="Test Agent", functions=[get_weather])
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_stream(
+                content="Let me check.",
+                function_calls=[
+                    {"name": "get_weather", "args": {"location": "San Francisco"}},
+                    {"name": "get_weather", "args": {"location": "Boston"}},
+                ],
+            ),
+            create_mock_stream(content=DEFAULT_RESPONSE_CONTENT),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client)
+    messages = [{"role": "user", "content": "Weather in SF and Boston?"}]
+    chunks = list(client.run(agent=agent, messages=messages, stream=True))
+
+    assert chunks[0] == {"delim": "start"}
+    assert chunks[1]["sender"] == "Test Agent"
+    streamed = "".join(c["content"] for c in chunks if c.get("content"))
+    assert streamed == "Let me check." + DEFAULT_RESPONSE_CONTENT
+
+    response = chunks[-1]["response"]
+    first = response.messages[0]
+    assert first["content"] == "Let me check."
+    assert [json.loads(t["function"]["arguments"]) for t in first["tool_calls"]] == [
+        {"location": "San Francisco"},
+        {"location": "Boston"},
+    ]
+    assert [m["role"] for m in response.messages] == [
+        "assistant",
+        "tool",
+        "tool",
+        "assistant",
+    ]
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+    assert response.messages[-1]["tool_calls"] is None
+
+
+def test_instructions_memoized_per_conversation(mock_openai_client: MockOpenAIClient):
+    renders = []
+
+    def instructions(context_variables):
+        renders.append(dict(context_variables["customer"]))
+        return f"Customer: {context_variables['customer']['name']}"
+
+    agent = Agent(instructions=instructions, instructions_depends_on=["customer"])
+    client = Swarm(client=mock_openai_client)
+    ada = client.session(agent, context_variables={"customer": {"name": "Ada"}})
+    grace = client.session(agent, context_variables={"customer": {"name": "Grace"}})
+
+    # conversations sharing the agent do not evict each other's prompt
+    for turn in range(3):
+        ada.context_variables["turn"] = turn
+        ada.send("Hi")
+        grace.send("Hi")
+    assert renders == [{"name": "Ada"}, {"name": "Grace"}]
+
+    # in-place edits to a declared value are picked up
+    ada.context_variables["customer"]["name"] = "Lovelace"
+    ada.send("Hi")
+    system = mock_openai_client.chat.completions.create.call_args.kwargs["messages"][0]
+    assert system["content"] == "Customer: Lovelace"
+    assert len(renders) == 3
+
+
+def test_instructions_memo_with_uncopyable_values():
+    class Client:
+        def __eq__(self, other):
+            return isinstance(other, Client)
+
+        def __deepcopy__(self, memo):
+            raise TypeError("cannot copy a client")
+
+    renders = []
+
+    def instructions(context_variables):
+        renders.append(1)
+        return "Use the tools."
+
+    agent = Agent(instructions=instructions, instructions_depends_on=["lock", "client"])
+    memo = {}
+    # compared by identity, so no copy is needed
+    context_variables = {"lock": threading.Lock()}
+    agent.render_instructions(context_variables, memo)
+    agent.render_instructions(context_variables, memo)
+    assert len(renders) == 1
+
+    # compared by value but uncopyable: rendered on every call
+    context_variables["client"] = Client()
+    assert agent.render_instructions(context_variables, memo) == "Use the tools."
+    assert agent.render_instructions(context_variables, memo) == "Use the tools."
+    assert len(renders) == 3
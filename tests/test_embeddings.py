@@ -0,0 +1,84 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from swarm.embeddings import BatchingEmbedder, EmbeddingCache
+
+
+class FakeEmbeddings:
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def create(self, input, model):
+        self.calls.append(list(input))
+        if self.fail:
+            raise RuntimeError("rate limited")
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(len(text)), float(i)])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+def make_embedder(**options):
+    embeddings = FakeEmbeddings(options.pop("fail", False))
+    client = SimpleNamespace(embeddings=embeddings)
+    return embeddings, BatchingEmbedder(client, model="m", **options)
+
+
+def test_normalized_queries_hit_the_cache():
+    embeddings, embedder = make_embedder(window=0)
+
+    first = embedder.embed("How do I reset my  password?")
+    second = embedder.embed("  how do i reset my password? ")
+
+    assert first == second
+    # normalization only shapes the cache key; the text is embedded as given
+    assert embeddings.calls == [["How do I reset my  password?"]]
+    assert (embedder.cache.hits, embedder.cache.misses) == (1, 1)
+
+
+def test_disk_tier_survives_restarts(tmp_path):
+    path = str(tmp_path / "embeddings.sqlite")
+    embeddings, embedder = make_embedder(window=0, cache=EmbeddingCache(path=path))
+    vector = embedder.embed("billing")
+
+    embeddings, embedder = make_embedder(window=0, cache=EmbeddingCache(path=path))
+
+    assert embedder.embed("billing") == vector
+    assert embeddings.calls == []
+
+
+def test_concurrent_requests_are_coalesced():
+    embeddings, embedder = make_embedder(window=0.2)
+    texts = [f"question {i}" for i in range(8)] + ["question 0"]
+    results = {}
+
+    def worker(text):
+        results[text] = embedder.embed(text)
+
+    threads = [threading.Thread(target=worker, args=(text,)) for text in texts]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert embedder.requests == 1
+    assert sorted(embeddings.calls[0]) == sorted(set(texts))
+    assert results["question 3"][0] == len("question 3")
+
+
+def test_batches_are_bounded_and_errors_propagate():
+    embeddings, embedder = make_embedder(window=0, max_batch=3)
+
+    vectors = embedder.embed_many([f"t{i}" for i in range(7)])
+
+    assert [len(call) for call in embeddings.calls] == [3, 3, 1]
+    assert len(vectors) == 7
+
+    _, failing = make_embedder(window=0, fail=True)
+    with pytest.raises(RuntimeError):
+        failing.embed("anything")
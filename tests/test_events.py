@@ -0,0 +1,137 @@
+import json
+
+from swarm import Swarm, Agent
+from swarm.events import (
+    AgentHandoff,
+    ContentDelta,
+    MessageEnd,
+    MessageStart,
+    RunComplete,
+    ToolCallArgumentsDelta,
+    ToolCallCompleted,
+    ToolCallStarted,
+    ToolResult,
+)
+from swarm.repl.repl import process_and_print_streaming_response
+from swarm.streaming import StreamAccumulator
+from tests.mock_client import MockOpenAIClient, create_mock_chunk, create_mock_stream
+
+MESSAGES = [{"role": "user", "content": "What's the weather?"}]
+CALLS = [
+    {"name": "get_weather", "args": {"location": "San Francisco", "unit": {"temp": "C"}}},
+    {"name": "get_time", "args": {"zone": "PST"}},
+]
+
+
+def test_tool_call_completes_when_its_arguments_close():
+    chunks = create_mock_stream(function_calls=CALLS)
+    # trailing chunk so the last call closes before the stream ends
+    chunks.append(create_mock_chunk({}))
+    accumulator = StreamAccumulator(sender="Agent")
+
+    completed_at = {}
+    for position, chunk in enumerate(chunks):
+        for event in accumulator.add_events(chunk):
+            if isinstance(event, ToolCallCompleted):
+                completed_at[event.name] = position
+                assert json.loads(event.arguments) == next(
+                    c["args"] for c in CALLS if c["name"] == event.name
+                )
+    assert accumulator.finish() == []
+
+    # role chunk, header chunk, then 4-character argument fragments
+    last_fragment = 1 + -(-len(json.dumps(CALLS[0]["args"])) // 4)
+    assert completed_at["get_weather"] == last_fragment
+    assert completed_at["get_time"] == len(chunks) - 2
+
+
+def test_argument_fragments_and_unclosed_calls():
+    chunks = create_mock_stream(function_calls=[{"name": "ping"}])
+    accumulator = StreamAccumulator(sender="Agent")
+    events = [event for chunk in chunks for event in accumulator.add_events(chunk)]
+
+    assert isinstance(events[0], ToolCallStarted)
+    fragments = [e.arguments for e in events if isinstance(e, ToolCallArgumentsDelta)]
+    assert "".join(fragments) == "{}"
+    assert [e.name for e in events if isinstance(e, ToolCallCompleted)] == ["ping"]
+
+    # a call whose arguments never parse is completed at the end of the stream
+    accumulator = StreamAccumulator(sender="Agent")
+    broken = create_mock_stream(function_calls=[{"name": "ping"}])[:-1]
+    for chunk in broken:
+        assert not any(isinstance(e, ToolCallCompleted) for e in accumulator.add_events(chunk))
+    (completed,) = accumulator.finish()
+    assert completed.name == "ping"
+
+
+def test_run_yields_typed_events():
+    def get_weather(location, unit):
+        return "sunny"
+
+    def get_time(zone):
+        return "noon"
+
+    weather_agent = Agent(name="Weather Agent")
+
+    def transfer():
+        return weather_agent
+
+    agent = Agent(name="Triage", functions=[get_weather, get_time, transfer])
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses(
+        [
+            create_mock_stream(function_calls=CALLS + [{"name": "transfer"}]),
+            create_mock_stream("It is sunny."),
+        ]
+    )
+    client = Swarm(client=mock_client)
+
+    events = list(client.run(agent=agent, messages=MESSAGES, stream=True, events=True))
+
+    assert isinstance(events[0], MessageStart)
+    assert [e.name for e in events if isinstance(e, ToolCallCompleted)] == [
+        "get_weather",
+        "get_time",
+        "transfer",
+    ]
+    assert [e.content for e in events if isinstance(e, ToolResult)] == [
+        "sunny",
+        "noon",
+        '{"assistant": "Weather Agent"}',
+    ]
+    (handoff,) = [e for e in events if isinstance(e, AgentHandoff)]
+    assert handoff.to_agent is weather_agent
+    content = "".join(e.content for e in events if isinstance(e, ContentDelta))
+    assert content == "It is sunny."
+    assert [e.message["sender"] for e in events if isinstance(e, MessageEnd)] == [
+        "Triage",
+        "Weather Agent",
+    ]
+    assert isinstance(events[-1], RunComplete)
+    assert events[-1].response.agent is weather_agent
+
+
+def test_session_and_repl_consume_events(capsys):
+    def get_weather(location, unit):
+        return "sunny"
+
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses(
+        [
+            create_mock_stream(function_calls=CALLS[:1]),
+            create_mock_stream("It is sunny."),
+        ]
+    )
+    session = Swarm(client=mock_client).session(
+        Agent(name="Weather Agent", functions=[get_weather])
+    )
+
+    response = process_and_print_streaming_response(
+        session.send("Weather?", stream=True, events=True)
+    )
+
+    assert response.messages[-1]["content"] == "It is sunny."
+    assert len(session.messages) == 4
+    out = capsys.readouterr().out
+    assert "get_weather" in out
+    assert "It is sunny." in out
@@ -0,0 +1,28 @@
+from swarm.history import MessageLog
+
+
+def test_message_log_sequence_api():
+    base = [{"role": "user", "content": str(i)} for i in range(3)]
+    log = MessageLog(base)
+    log.append({"role": "assistant", "content": "3"})
+
+    assert len(log) == 4
+    assert len(base) == 3
+    assert log[0] is base[0]
+    assert log[-1]["content"] == "3"
+    assert [m["content"] for m in log[1:3]] == ["1", "2"]
+    assert [m["content"] for m in log[::2]] == ["0", "2"]
+    assert [m["content"] for m in log.since(3)] == ["3"]
+
+
+def test_with_system_reuses_prompt_list():
+    log = MessageLog([{"role": "user", "content": "hi"}])
+
+    first = log.with_system("one")
+    log.append({"role": "assistant", "content": "hello"})
+    second = log.with_system("two")
+
+    assert second is first
+    assert second[0] == {"role": "system", "content": "two"}
+    assert len(second) == 3
+    assert list(log) == second[1:]
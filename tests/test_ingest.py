@@ -0,0 +1,81 @@
+import json
+
+from swarm.ingest import Checkpoint, IngestPipeline, iter_json_documents
+
+
+def write_articles(directory, count):
+    for i in range(count):
+        (directory / f"article_{i:02d}.json").write_text(
+            json.dumps({"title": f"Article {i}", "text": f"text {i}"})
+        )
+    (directory / "notes.txt").write_text("not an article")
+
+
+def test_documents_are_embedded_in_batches_and_upserted_in_chunks(tmp_path):
+    write_articles(tmp_path, 10)
+    embedded, upserted = [], []
+
+    def embed_batch(texts):
+        embedded.append(len(texts))
+        return [[float(text.split()[1])] for text in texts]
+
+    pipeline = IngestPipeline(
+        embed_batch, lambda records: upserted.append(list(records)),
+        batch_size=3, upsert_size=4, workers=2,
+    )
+    stats = pipeline.run(iter_json_documents(str(tmp_path)))
+
+    assert stats == {"stored": 10, "failed": 0}
+    assert embedded == [3, 3, 3, 1]
+    assert [len(chunk) for chunk in upserted] == [4, 4, 2]
+    records = [record for chunk in upserted for record in chunk]
+    assert [record["id"] for record in records] == [f"article_{i:02d}" for i in range(10)]
+    assert records[7]["vector"] == [7.0]
+    assert records[7]["payload"]["title"] == "Article 7"
+
+
+def test_interrupted_run_resumes_from_checkpoint(tmp_path):
+    data = tmp_path / "data"
+    data.mkdir()
+    write_articles(data, 6)
+    checkpoint_path = str(tmp_path / "checkpoint")
+    stored, errors = [], []
+
+    def flaky(texts):
+        if "text 4" in texts:
+            raise RuntimeError("rate limited")
+        return [[0.0] for _ in texts]
+
+    def run(embed_batch):
+        pipeline = IngestPipeline(
+            embed_batch, lambda records: stored.extend(r["id"] for r in records),
+            batch_size=2, upsert_size=2, checkpoint=Checkpoint(checkpoint_path),
+            on_error=lambda ids, e: errors.append(ids),
+        )
+        return pipeline.run(iter_json_documents(str(data)))
+
+    # the failing batch is retried per document, so only article 4 is lost
+    assert run(flaky) == {"stored": 5, "failed": 1}
+    assert errors == [["article_04"]]
+    assert len(Checkpoint(checkpoint_path)) == 5
+
+    assert run(lambda texts: [[1.0] for _ in texts]) == {"stored": 1, "failed": 0}
+    assert stored[-1:] == ["article_04"]
+
+
+def test_bad_documents_do_not_fail_their_batch(tmp_path, caplog):
+    write_articles(tmp_path, 4)
+    (tmp_path / "article_01.json").write_text(json.dumps({"title": "No text"}))
+    stored = []
+
+    pipeline = IngestPipeline(
+        lambda texts: [[0.0] for _ in texts],
+        lambda records: stored.extend(r["id"] for r in records),
+        batch_size=4,
+    )
+    with caplog.at_level("WARNING", logger="swarm.ingest"):
+        stats = pipeline.run(iter_json_documents(str(tmp_path)))
+
+    assert stats == {"stored": 3, "failed": 1}
+    assert stored == ["article_00", "article_02", "article_03"]
+    assert "article_01" in caplog.text
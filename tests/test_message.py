@@ -0,0 +1,124 @@
+import json
+import pickle
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from typing import List
+
+from pydantic import TypeAdapter
+
+from benchmarks.synthetic_client import make_completion
+from swarm.message import Message
+from swarm.repl.repl import pretty_print_messages
+from swarm.types import Response
+
+TOOL_CALLS = [
+    {
+        "id": "call_1",
+        "type": "function",
+        "function": {"name": "lookup", "arguments": '{"order_id": 1}'},
+    }
+]
+
+
+def test_reads_like_a_dict():
+    message = Message(
+        role="assistant",
+        content="",
+        sender="Agent",
+        tool_calls=TOOL_CALLS,
+        function_call=None,
+        refusal=None,
+    )
+
+    assert message["tool_calls"] is TOOL_CALLS
+    assert message["function_call"] is None
+    assert message.get("refusal", "none") == "none"
+    assert "sender" in message and "refusal" not in message
+    assert list(message) == ["role", "content", "sender", "tool_calls"]
+    assert message == {
+        "role": "assistant",
+        "content": "",
+        "sender": "Agent",
+        "tool_calls": TOOL_CALLS,
+        "function_call": None,
+    }
+    assert json.loads(json.dumps(message, default=dict)) == dict(message)
+    assert pickle.loads(pickle.dumps(message)) == message
+
+    message["content"] = "done"
+    message["custom"] = 1
+    assert message.to_dict()["content"] == "done"
+    assert message["custom"] == 1
+
+
+def test_role_and_sender_are_interned():
+    sender = "".join(["Triage ", "Agent"])
+    message = Message(role="assistant", content="hi", sender=sender)
+    assert message["sender"] is sys.intern("Triage Agent")
+
+
+def test_smaller_than_dicts():
+    def allocated(make):
+        tracemalloc.start()
+        items = [make(i) for i in range(2000)]
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        assert len(items) == 2000
+        return size
+
+    fields = dict(
+        role="assistant",
+        sender="Agent",
+        tool_calls=None,
+        function_call=None,
+        refusal=None,
+        audio=None,
+    )
+    as_dicts = allocated(lambda i: dict(fields, content=str(i)))
+    as_messages = allocated(lambda i: Message(content=str(i), **fields))
+    assert as_messages < as_dicts * 0.7
+
+
+def test_pretty_print(capsys):
+    pretty_print_messages(
+        [Message(role="assistant", content="", sender="Agent", tool_calls=TOOL_CALLS)]
+    )
+    assert "lookup" in capsys.readouterr().out
+
+
+def test_from_completion_matches_json_round_trip():
+    from benchmarks.bench_messages import json_round_trip, make_message
+
+    for tool_calls in (0, 3):
+        message = make_message(tool_calls, 50)
+        converted = Message.from_completion(message, "Agent")
+        assert converted == json_round_trip(message, "Agent")
+        assert "function_call" not in converted
+        if tool_calls:
+            assert converted["tool_calls"][2]["function"]["name"] == "tool_2"
+
+
+def test_from_completion_without_refusal_field():
+    # older SDKs and compatible clients do not define `refusal`
+    message = SimpleNamespace(role="assistant", content="hello", tool_calls=None)
+    converted = Message.from_completion(message, "Agent")
+    assert converted["content"] == "hello"
+    assert converted["refusal"] is None
+
+
+def test_response_round_trips_through_json():
+    history = [
+        Message(role="user", content="hi"),
+        Message.from_completion(
+            make_completion("Working on it.", [("lookup", {"id": 1})]).choices[0].message,
+            "Agent",
+        ),
+    ]
+    response = Response(messages=history, context_variables={"a": 1})
+
+    restored = Response.model_validate_json(response.model_dump_json())
+
+    assert restored.messages == history
+    assert response.model_dump()["messages"] == [m.to_dict() for m in history]
+    assert TypeAdapter(List[Message]).validate_python(restored.messages) == history
@@ -0,0 +1,105 @@
+from swarm import Swarm, Agent
+from swarm.history import MessageLog
+from swarm.prefix import StablePrefix
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def sent_messages(mock_client):
+    return mock_client.chat.completions.create.call_args.kwargs["messages"]
+
+
+def make_client(**options):
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    return mock_client, Swarm(client=mock_client, **options)
+
+
+def lookup(order_id):
+    return "shipped"
+
+
+def test_system_prompt_is_pinned_and_context_trails():
+    renders = []
+
+    def instructions(context_variables):
+        renders.append(context_variables["user"])
+        return f"You help {context_variables['user']}."
+
+    agent = Agent(
+        instructions=instructions,
+        context_instructions=lambda ctx: f"Cart: {ctx['cart']}",
+        functions=[lookup],
+    )
+    changes = []
+    stable = StablePrefix(on_change=lambda *args: changes.append(args))
+    mock_client, client = make_client(stable_prefix=stable)
+    session = client.session(agent, context_variables={"user": "Ada", "cart": 1})
+
+    prompts = []
+    for cart in range(2, 5):
+        session.send("hi")
+        messages = sent_messages(mock_client)
+        prompts.append((messages[0]["content"], messages[-1]["content"]))
+        session.context_variables = {"user": "Grace", "cart": cart}
+
+    assert renders == ["Ada"]
+    assert [system for system, _ in prompts] == ["You help Ada."] * 3
+    assert [context for _, context in prompts] == ["Cart: 1", "Cart: 2", "Cart: 3"]
+    assert changes == []
+    assert (stable.requests, stable.stable_ratio) == (3, 1.0)
+
+
+def test_prefix_change_is_reported_on_handoff():
+    sales = Agent(name="Sales", instructions="Sell things.")
+
+    def transfer_to_sales():
+        return sales
+
+    triage = Agent(name="Triage", instructions="Route users.", functions=[transfer_to_sales])
+    changes = []
+    stable = StablePrefix(on_change=lambda old, new, agent: changes.append(agent.name))
+    mock_client, client = make_client(stable_prefix=stable)
+    mock_client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                function_calls=[{"name": "transfer_to_sales"}],
+            ),
+            create_mock_response({"role": "assistant", "content": "Hello from sales"}),
+        ]
+    )
+
+    client.run(agent=triage, messages=[{"role": "user", "content": "buy"}])
+
+    assert changes == ["Sales"]
+    assert (stable.requests, stable.untracked, stable.stable_ratio) == (2, 1, 0.0)
+
+
+def test_tracking_across_runs_needs_a_shared_history():
+    stable = StablePrefix()
+    mock_client, client = make_client(stable_prefix=stable)
+    agent = Agent(instructions="Be brief.")
+
+    # a plain list starts a new conversation each time: nothing to compare with
+    for _ in range(3):
+        client.run(agent=agent, messages=[{"role": "user", "content": "hi"}])
+    assert (stable.requests, stable.untracked, stable.stable_ratio) == (3, 3, None)
+
+    changes = []
+    stable.on_change = lambda *args: changes.append(args)
+    history = MessageLog([{"role": "user", "content": "hi"}])
+    client.run(agent=agent, messages=history)
+    client.run(agent=agent, messages=history)
+    client.run(agent=agent, messages=history, model_override="gpt-4o-mini")
+    assert len(changes) == 1
+    assert (stable.untracked, stable.changes, stable.stable_ratio) == (4, 1, 0.5)
+
+
+def test_context_instructions_without_stable_prefix():
+    agent = Agent(instructions="Be brief.", context_instructions="Today is Monday.")
+    mock_client, client = make_client()
+
+    client.run(agent=agent, messages=[{"role": "user", "content": "hi"}])
+
+    messages = sent_messages(mock_client)
+    assert messages[0]["content"] == "Be brief.\n\nToday is Monday."
@@ -0,0 +1,99 @@
+import asyncio
+import json
+import time
+
+import pytest
+from swarm import AsyncSwarm, Swarm, Agent
+from swarm.replay import AsyncReplayClient, RecordingClient, ReplayClient
+from tests.mock_client import (
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+
+def get_weather(location):
+    return "It's sunny today."
+
+
+AGENT = Agent(name="Weather Agent", functions=[get_weather])
+MESSAGES = [{"role": "user", "content": "Weather in Boston?"}]
+
+
+def record(path, stream):
+    mock_client = MockOpenAIClient()
+    if stream:
+        responses = [
+            create_mock_stream(
+                function_calls=[{"name": "get_weather", "args": {"location": "Boston"}}]
+            ),
+            create_mock_stream(content="Sunny in Boston."),
+        ]
+    else:
+        responses = [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                [{"name": "get_weather", "args": {"location": "Boston"}}],
+            ),
+            create_mock_response({"role": "assistant", "content": "Sunny in Boston."}),
+        ]
+    mock_client.set_sequential_responses(responses)
+    client = Swarm(client=RecordingClient(mock_client, path))
+    return client.run(agent=AGENT, messages=MESSAGES, stream=stream)
+
+
+@pytest.mark.parametrize("suffix", [".jsonl", ".jsonl.gz"])
+def test_record_and_replay(tmp_path, suffix):
+    path = str(tmp_path / f"session{suffix}")
+    recorded = record(path, stream=False)
+
+    replayed = Swarm(client=ReplayClient(path, speed=None)).run(
+        agent=AGENT, messages=MESSAGES
+    )
+    assert replayed.messages == recorded.messages
+
+
+def test_replay_stream_with_timings(tmp_path):
+    path = str(tmp_path / "stream.jsonl")
+    recorded = list(record(path, stream=True))
+
+    replay_client = ReplayClient(path, speed=None)
+    replayed = list(Swarm(client=replay_client).run(AGENT, MESSAGES, stream=True))
+    assert replayed[:-1] == recorded[:-1]
+    assert replayed[-1]["response"].messages == recorded[-1]["response"].messages
+
+    # stretch the recorded latencies so the replay delay is measurable
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    with open(path, "w") as f:
+        for r in records:
+            f.write(json.dumps({**r, "latency": 0.05}) + "\n")
+
+    start = time.perf_counter()
+    list(Swarm(client=ReplayClient(path, speed=2.0)).run(AGENT, MESSAGES, stream=True))
+    assert time.perf_counter() - start >= 0.045
+
+
+def test_async_replay(tmp_path):
+    path = str(tmp_path / "stream.jsonl")
+    recorded = list(record(path, stream=True))
+
+    async def replay():
+        client = AsyncSwarm(client=AsyncReplayClient(path, speed=None))
+        return [c async for c in await client.run(AGENT, MESSAGES, stream=True)]
+
+    replayed = asyncio.run(replay())
+    assert replayed[-1]["response"].messages == recorded[-1]["response"].messages
+
+
+def test_strict_replay_rejects_unknown_requests(tmp_path):
+    path = str(tmp_path / "session.jsonl")
+    record(path, stream=False)
+
+    client = Swarm(client=ReplayClient(path, speed=None))
+    other = [{"role": "user", "content": "Something else"}]
+    with pytest.raises(KeyError):
+        client.run(agent=AGENT, messages=other)
+
+    lenient = Swarm(client=ReplayClient(path, speed=None, strict=False))
+    assert lenient.run(agent=AGENT, messages=other).messages
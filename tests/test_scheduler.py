@@ -0,0 +1,131 @@
+import threading
+import time
+
+import pytest
+from swarm import Swarm, Agent
+from swarm.scheduler import QueueFullError, SwarmScheduler
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def test_round_robin_across_tenants():
+    order = []
+    gate = threading.Event()
+    scheduler = SwarmScheduler(swarm=None, max_workers=1)
+
+    # hold the only worker so everything below queues up
+    blocker = scheduler.submit("warmup", gate.wait)
+    while scheduler.stats()["running"] == 0:
+        time.sleep(0.001)
+    for i in range(3):
+        scheduler.submit("busy", order.append, f"busy-{i}")
+    scheduler.submit("quiet", order.append, "quiet-0")
+    assert scheduler.stats()["queued"] == 4
+
+    gate.set()
+    scheduler.shutdown()
+    assert blocker.done()
+    assert order == ["busy-0", "quiet-0", "busy-1", "busy-2"]
+
+
+def test_per_tenant_concurrency_limit():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def turn():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+
+    scheduler = SwarmScheduler(swarm=None, max_workers=4, max_concurrent_per_tenant=1)
+    futures = [scheduler.submit("tenant", turn) for _ in range(4)]
+    for future in futures:
+        future.result(timeout=5)
+    scheduler.shutdown()
+    assert max(peak) == 1
+
+
+def test_queue_limit():
+    gate = threading.Event()
+    scheduler = SwarmScheduler(swarm=None, max_workers=1, max_queue=1)
+    scheduler.submit("a", gate.wait)
+    # wait until the worker has picked up the first job
+    while scheduler.stats()["running"] == 0:
+        time.sleep(0.001)
+    scheduler.submit("a", lambda: None)
+    with pytest.raises(QueueFullError):
+        scheduler.submit("b", lambda: None)
+    gate.set()
+    scheduler.shutdown()
+
+
+def test_token_budget_delays_turns():
+    # 600 tokens per minute refills 10 tokens per second
+    scheduler = SwarmScheduler(
+        swarm=None, max_workers=2, token_budgets={"gpt-4o": 600}
+    )
+    first = scheduler.submit("a", time.monotonic, model="gpt-4o", cost=600)
+    second = scheduler.submit("b", time.monotonic, model="gpt-4o", cost=1)
+    assert second.result(timeout=5) - first.result(timeout=5) >= 0.05
+    scheduler.shutdown()
+    assert scheduler.stats()["wait_max"] >= 0.05
+
+
+def test_run_resolves_to_response():
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    scheduler = SwarmScheduler(Swarm(client=mock_client), max_workers=2)
+
+    future = scheduler.run("tenant", Agent(), [{"role": "user", "content": "hi"}])
+    assert future.result(timeout=5).messages[-1]["content"] == "ok"
+    scheduler.shutdown()
+
+
+def test_turns_of_one_session_never_overlap():
+    running = []
+    peak = []
+    lock = threading.Lock()
+    mock_client = MockOpenAIClient()
+    response = create_mock_response({"role": "assistant", "content": "ok"})
+
+    def create(**kwargs):
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.pop()
+        return response
+
+    mock_client.chat.completions.create.side_effect = create
+    session = Swarm(client=mock_client).session(Agent())
+    scheduler = SwarmScheduler(session.swarm, max_workers=4, max_concurrent_per_tenant=2)
+
+    futures = [scheduler.send("tenant", session, f"message {i}") for i in range(3)]
+    for future in futures:
+        future.result(timeout=5)
+    scheduler.shutdown()
+    assert max(peak) == 1
+    assert [m["content"] for m in session.messages if m["role"] == "user"] == [
+        "message 0",
+        "message 1",
+        "message 2",
+    ]
+
+
+def test_failing_cost_estimate_fails_only_its_job():
+    def cost():
+        raise RuntimeError("no estimate")
+
+    scheduler = SwarmScheduler(swarm=None, max_workers=2)
+    failed = scheduler.submit("a", lambda: "never", cost=cost)
+    with pytest.raises(RuntimeError, match="no estimate"):
+        failed.result(timeout=5)
+
+    # the workers survive and the queue is consistent
+    assert scheduler.submit("a", lambda: "ok").result(timeout=5) == "ok"
+    assert scheduler.stats()["queued"] == 0
+    scheduler.shutdown()
@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+import pytest
+from swarm import AsyncSwarm, Swarm, Agent
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+
+def test_send_keeps_history_and_agent():
+    def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Agent 1", functions=[transfer_to_agent2])
+    agent2 = Agent(name="Agent 2")
+
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                [{"name": "transfer_to_agent2"}],
+            ),
+            create_mock_response({"role": "assistant", "content": "Agent 2 here"}),
+            create_mock_response({"role": "assistant", "content": "Still here"}),
+        ]
+    )
+
+    session = Swarm(client=mock_client).session(agent1, context_variables={"a": 1})
+    first = session.send("Transfer me")
+    second = session.send("Thanks")
+
+    assert session.agent == agent2
+    assert [m["role"] for m in first.messages] == ["assistant", "tool", "assistant"]
+    assert [m["content"] for m in second.messages] == ["Still here"]
+    assert [m["role"] for m in session.messages] == [
+        "user",
+        "assistant",
+        "tool",
+        "assistant",
+        "user",
+        "assistant",
+    ]
+
+
+def test_failed_turn_is_rolled_back():
+    mock_client = MockOpenAIClient()
+    mock_client.chat.completions.create.side_effect = RuntimeError("boom")
+
+    session = Swarm(client=mock_client).session(Agent())
+    with pytest.raises(RuntimeError):
+        session.send("Hello")
+    assert session.messages == []
+
+
+def test_streamed_send_updates_session():
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_stream(content="Hi there"))
+
+    session = Swarm(client=mock_client).session(Agent(name="Streamer"))
+    chunks = list(session.send("Hello", stream=True))
+
+    assert chunks[-1]["response"].messages[-1]["content"] == "Hi there"
+    assert [m["content"] for m in session.messages] == ["Hello", "Hi there"]
+
+
+def test_session_round_trip():
+    agent = Agent(name="Support")
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    client = Swarm(client=mock_client)
+
+    session = client.session(agent, context_variables={"user_id": 7})
+    session.send("Hello")
+    state = json.loads(json.dumps(session.to_dict()))
+
+    resumed = client.resume_session(state, agents=[agent])
+    assert resumed.agent is agent
+    assert resumed.context_variables == {"user_id": 7}
+    assert resumed.messages == session.messages
+
+    with pytest.raises(KeyError):
+        client.resume_session(state, agents=[Agent(name="Other")])
+
+
+def test_async_session():
+    mock_client = MockAsyncOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    session = AsyncSwarm(client=mock_client).session(Agent())
+
+    async def talk():
+        await session.send("one")
+        return await session.send("two")
+
+    response = asyncio.run(talk())
+    assert response.messages[-1]["content"] == "ok"
+    assert [m["content"] for m in session.messages] == ["one", "ok", "two", "ok"]
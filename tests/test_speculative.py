@@ -0,0 +1,187 @@
+import asyncio
+import gc
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from swarm import AsyncSwarm, Swarm, Agent
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "Weather and time please"}]
+CALLS = [
+    {"name": "get_weather", "args": {"location": "San Francisco"}},
+    {"name": "get_time", "args": {"zone": "PST"}},
+    {"name": "missing_tool", "args": {}},
+]
+# role chunk, first call's header and its argument fragments
+FIRST_CALL_CHUNKS = 2 + -(-len(json.dumps(CALLS[0]["args"])) // 4)
+
+
+def make_agent(started):
+    def get_weather(location):
+        started.set()
+        return f"sunny in {location}"
+
+    def get_time(zone, context_variables):
+        return f"noon {zone} for {context_variables['user']}"
+
+    return Agent(name="Agent", functions=[get_weather, get_time])
+
+
+def test_tool_starts_before_stream_ends():
+    started = threading.Event()
+    chunks = create_mock_stream(function_calls=CALLS)
+
+    def stream():
+        yield from chunks[:FIRST_CALL_CHUNKS]
+        # the first call must already be running while the stream is still open
+        assert started.wait(5)
+        yield from chunks[FIRST_CALL_CHUNKS:]
+
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses([stream(), create_mock_stream("Done.")])
+    client = Swarm(
+        client=mock_client,
+        tool_executor=ThreadPoolExecutor(max_workers=2),
+        speculative_tools=True,
+    )
+
+    *_, last = client.run(
+        agent=make_agent(started),
+        messages=MESSAGES,
+        context_variables={"user": "Ada"},
+        stream=True,
+    )
+
+    tool_messages = [m for m in last["response"].messages if m["role"] == "tool"]
+    assert [m["content"] for m in tool_messages] == [
+        "sunny in San Francisco",
+        "noon PST for Ada",
+        "Error: Tool missing_tool not found.",
+    ]
+    assert last["response"].messages[-1]["content"] == "Done."
+
+
+def test_matches_regular_streaming():
+    def run(**options):
+        mock_client = MockOpenAIClient()
+        mock_client.set_sequential_responses(
+            [create_mock_stream(function_calls=CALLS), create_mock_stream("Done.")]
+        )
+        client = Swarm(client=mock_client, **options)
+        *_, last = client.run(
+            agent=make_agent(threading.Event()),
+            messages=MESSAGES,
+            context_variables={"user": "Ada"},
+            stream=True,
+        )
+        return last["response"].messages
+
+    assert run() == run(
+        tool_executor=ThreadPoolExecutor(max_workers=2), speculative_tools=True
+    )
+
+
+def test_requires_executor():
+    with pytest.raises(ValueError):
+        Swarm(client=MockOpenAIClient(), speculative_tools=True)
+
+
+def test_async_tool_starts_before_stream_ends():
+    chunks = create_mock_stream(function_calls=CALLS[:2])
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def get_weather(location):
+            started.set()
+            return f"sunny in {location}"
+
+        def get_time(zone):
+            return f"noon {zone}"
+
+        async def stream():
+            for chunk in chunks[:FIRST_CALL_CHUNKS]:
+                yield chunk
+            await asyncio.wait_for(started.wait(), 5)
+            for chunk in chunks[FIRST_CALL_CHUNKS:]:
+                yield chunk
+
+        async def final():
+            for chunk in create_mock_stream("Done."):
+                yield chunk
+
+        mock_client = MockAsyncOpenAIClient()
+        mock_client.set_sequential_responses([stream(), final()])
+        client = AsyncSwarm(client=mock_client, speculative_tools=True)
+        agent = Agent(functions=[get_weather, get_time])
+        return [
+            chunk
+            async for chunk in await client.run(
+                agent=agent, messages=MESSAGES, stream=True
+            )
+        ]
+
+    *_, last = asyncio.run(scenario())
+    tool_messages = [m for m in last["response"].messages if m["role"] == "tool"]
+    assert [m["content"] for m in tool_messages] == ["sunny in San Francisco", "noon PST"]
+
+
+def run_failing_stream(tool):
+    """Stream the first call of `CALLS` to `tool`, then fail; returns loop errors."""
+    chunks = create_mock_stream(function_calls=CALLS[:1])
+
+    async def scenario():
+        errors = []
+        asyncio.get_running_loop().set_exception_handler(
+            lambda loop, context: errors.append(context)
+        )
+        started = asyncio.Event()
+
+        async def get_weather(location):
+            started.set()
+            return await tool(location)
+
+        async def stream():
+            for chunk in chunks[:FIRST_CALL_CHUNKS]:
+                yield chunk
+            await asyncio.wait_for(started.wait(), 5)
+            await asyncio.sleep(0)
+            raise ConnectionError("stream dropped")
+
+        mock_client = MockAsyncOpenAIClient()
+        mock_client.set_sequential_responses([stream()])
+        client = AsyncSwarm(client=mock_client, speculative_tools=True)
+        with pytest.raises(ConnectionError):
+            async for _ in await client.run(
+                agent=Agent(functions=[get_weather]), messages=MESSAGES, stream=True
+            ):
+                pass
+        await asyncio.sleep(0.05)
+        gc.collect()
+        return errors
+
+    return asyncio.run(scenario())
+
+
+def test_failed_stream_cancels_started_calls():
+    finished = []
+
+    async def slow_weather(location):
+        await asyncio.sleep(0.02)
+        finished.append(location)
+
+    assert run_failing_stream(slow_weather) == []
+    assert finished == []
+
+
+def test_failed_stream_retrieves_errors_of_started_calls():
+    async def broken_weather(location):
+        raise RuntimeError("weather service down")
+
+    assert run_failing_stream(broken_weather) == []
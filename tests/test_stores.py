@@ -0,0 +1,127 @@
+import pytest
+from swarm import Swarm, Agent
+from swarm.stores import JSONLSessionStore, SQLiteSessionStore
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+@pytest.fixture(params=["sqlite", "jsonl"])
+def store(request, tmp_path):
+    if request.param == "sqlite":
+        store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+        yield store
+        store.close()
+    else:
+        yield JSONLSessionStore(str(tmp_path / "sessions"), segment_size=3)
+
+
+def message(i):
+    return {"role": "user", "content": f"message {i}"}
+
+
+def test_append_and_load(store):
+    store.append("s1", [message(0), message(1)], "Agent A", {"step": 1})
+    store.append("s1", [message(i) for i in range(2, 7)], "Agent B", {"step": 2})
+
+    state = store.load("s1")
+    assert state["agent"] == "Agent B"
+    assert state["context_variables"] == {"step": 2}
+    assert [m["content"] for m in state["messages"]] == [
+        f"message {i}" for i in range(7)
+    ]
+
+    tail = store.load("s1", tail=4)
+    assert [m["content"] for m in tail["messages"]] == [
+        f"message {i}" for i in range(3, 7)
+    ]
+    assert store.load("missing") is None
+
+    store.delete("s1")
+    assert store.load("s1") is None
+
+
+def test_jsonl_store_ignores_torn_append(tmp_path):
+    store = JSONLSessionStore(str(tmp_path), segment_size=4)
+    store.append("s1", [message(0)], "Agent", {})
+    # simulate a crash after writing messages but before the state update
+    with open(store._segment_path("s1", 0), "a") as f:
+        f.write('{"role": "user", "content": "lost"}\n{"role": "us')
+    store.append("s1", [message(1)], "Agent", {})
+
+    assert [m["content"] for m in store.load("s1")["messages"]] == [
+        "message 0",
+        "message 1",
+    ]
+
+
+def test_jsonl_store_keeps_the_segment_size_of_a_session(tmp_path):
+    JSONLSessionStore(str(tmp_path), segment_size=4).append(
+        "s1", [message(i) for i in range(10)], "Agent", {}
+    )
+
+    reopened = JSONLSessionStore(str(tmp_path))
+    reopened.append("s1", [message(10)], "Agent", {})
+    assert len(reopened.load("s1")["messages"]) == 11
+    assert [m["content"] for m in reopened.load("s1", tail=3)["messages"]] == [
+        "message 8",
+        "message 9",
+        "message 10",
+    ]
+
+
+@pytest.mark.parametrize("session_id", ["..", "../escaped", "a/b", "", ".hidden", "a\x00b"])
+def test_jsonl_store_rejects_unsafe_session_ids(tmp_path, session_id):
+    root = tmp_path / "store"
+    store = JSONLSessionStore(str(root))
+
+    with pytest.raises(ValueError):
+        store.append(session_id, [message(0)], "Agent", {})
+    with pytest.raises(ValueError):
+        store.delete(session_id)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["store"]
+    assert list(root.iterdir()) == []
+
+
+def test_session_persists_each_turn(store):
+    agent = Agent(name="Support")
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    client = Swarm(client=mock_client)
+
+    session = client.session(agent, store=store, session_id="abc")
+    session.send("one")
+    session.send("two")
+
+    loaded = client.load_session(store, "abc", agents=[agent], tail=2)
+    assert [m["content"] for m in loaded.messages] == ["two", "ok"]
+
+    loaded.send("three")
+    full = client.load_session(store, "abc", agents=[agent])
+    assert [m["content"] for m in full.messages] == [
+        "one",
+        "ok",
+        "two",
+        "ok",
+        "three",
+        "ok",
+    ]
+
+
+def test_failed_append_rolls_the_turn_back(store):
+    agent = Agent(name="Support")
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    client = Swarm(client=mock_client)
+    session = client.session(agent, store=store, session_id="abc")
+    session.send("one")
+
+    session.context_variables = {"handle": object()}
+    with pytest.raises(TypeError):
+        session.send("lost")
+    assert [m["content"] for m in session.messages] == ["one", "ok"]
+
+    session.context_variables = {}
+    session.send("two")
+    stored = client.load_session(store, "abc", agents=[agent])
+    assert [m["content"] for m in stored.messages] == [m["content"] for m in session.messages]
+    assert [m["content"] for m in stored.messages] == ["one", "ok", "two", "ok"]
@@ -0,0 +1,76 @@
+from swarm import Swarm, Agent
+from swarm.tool_cache import ToolResultCache, arguments_key, cached_tool
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def tool_turn(*calls):
+    return create_mock_response(
+        {"role": "assistant", "content": ""},
+        function_calls=[{"name": name, "args": args} for name, args in calls],
+    )
+
+
+def run_twice(agent, call, **options):
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses(
+        [tool_turn(call), tool_turn(call), create_mock_response({"role": "assistant", "content": "done"})]
+    )
+    client = Swarm(client=mock_client, **options)
+    response = client.run(agent=agent, messages=[{"role": "user", "content": "hi"}])
+    return client, response
+
+
+def test_decorated_tool_is_served_from_cache():
+    calls = []
+
+    @cached_tool
+    def lookup(order_id: int, region: str = "eu"):
+        calls.append(order_id)
+        return f"order {order_id} shipped"
+
+    client, response = run_twice(Agent(functions=[lookup]), ("lookup", {"order_id": 7}))
+
+    assert calls == [7]
+    assert response.messages[1]["content"] == response.messages[3]["content"]
+    assert (client.tool_cache.hits, client.tool_cache.misses) == (1, 1)
+
+
+def test_agent_declaration_and_ttl():
+    calls = []
+
+    def lookup(order_id: int):
+        calls.append(order_id)
+        return "shipped"
+
+    agent = Agent(functions=[lookup], cached_tools={"lookup": 0})
+    client, _ = run_twice(agent, ("lookup", {"order_id": 7}))
+
+    assert calls == [7, 7]
+    assert client.tool_cache.hits == 0
+
+
+def test_context_dependent_tools_are_not_cached():
+    calls = []
+
+    @cached_tool
+    def greet(context_variables):
+        calls.append(1)
+        return f"Hello {context_variables.get('name')}"
+
+    agent = Agent(functions=[greet])
+    client, _ = run_twice(agent, ("greet", {}))
+
+    assert len(calls) == 2
+    assert agent.tool_registry().get("greet").cache_ttl is None
+
+
+def test_cache_is_lru_with_canonical_keys():
+    cache = ToolResultCache(max_entries=2)
+    assert arguments_key("f", {"a": 1, "b": 2}) == arguments_key("f", {"b": 2, "a": 1})
+
+    for i in range(3):
+        cache.set(arguments_key("f", {"i": i}), i, ttl=60)
+
+    assert len(cache) == 2
+    assert cache.get(arguments_key("f", {"i": 0})) == (False, None)
+    assert cache.get(arguments_key("f", {"i": 2})) == (True, 2)
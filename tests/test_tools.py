@@ -0,0 +1,57 @@
+from swarm import Agent
+from swarm import tools as tools_module
+
+
+def test_registry_hides_context_variables():
+    def greet(name: str, context_variables):
+        return f"Hello {name}"
+
+    registry = Agent(functions=[greet]).tool_registry()
+    tool = registry.get("greet")
+
+    assert tool.function is greet
+    assert tool.wants_context_variables
+    assert registry.schemas[0]["function"]["parameters"] == {
+        "type": "object",
+        "properties": {"name": {"type": "string"}},
+        "required": ["name"],
+    }
+
+
+def test_registry_is_compiled_once(monkeypatch):
+    calls = []
+    original = tools_module.function_schema
+
+    def counting_function_schema(func):
+        calls.append(func.__name__)
+        return original(func)
+
+    monkeypatch.setattr(tools_module, "function_schema", counting_function_schema)
+
+    def lookup(order_id):
+        pass
+
+    agent = Agent(functions=[lookup])
+    for _ in range(3):
+        registry = agent.tool_registry()
+    assert calls == ["lookup"]
+    assert agent.tool_registry() is registry
+
+
+def test_registry_recompiles_when_functions_change():
+    def lookup(order_id):
+        pass
+
+    def refund(order_id):
+        pass
+
+    agent = Agent(functions=[lookup])
+    first = agent.tool_registry()
+
+    agent.functions.append(refund)
+    second = agent.tool_registry()
+    assert second is not first
+    assert list(second.tools) == ["lookup", "refund"]
+
+    agent.functions = [refund]
+    assert list(agent.tool_registry().tools) == ["refund"]
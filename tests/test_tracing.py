@@ -0,0 +1,168 @@
+import pytest
+from swarm import Swarm, Agent
+from swarm.tracing import (
+    CompletionRequest,
+    FirstToken,
+    Handoff,
+    LastToken,
+    RingBufferExporter,
+    SpanExporter,
+    ToolCallEnd,
+    ToolCallStart,
+    Tracer,
+    TurnEnd,
+    TurnStart,
+)
+from tests.mock_client import (
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "What's the weather?"}]
+
+
+def make_agents():
+    weather_agent = Agent(name="Weather Agent")
+
+    def get_weather(location):
+        return "sunny"
+
+    def transfer_to_weather():
+        return weather_agent
+
+    triage = Agent(name="Triage", functions=[get_weather, transfer_to_weather])
+    return triage, weather_agent
+
+
+def tool_then_reply(stream=False):
+    calls = [
+        {"name": "get_weather", "args": {"location": "SF"}},
+        {"name": "transfer_to_weather"},
+    ]
+    if stream:
+        return [create_mock_stream(function_calls=calls), create_mock_stream("Sunny.")]
+    return [
+        create_mock_response({"role": "assistant", "content": ""}, function_calls=calls),
+        create_mock_response({"role": "assistant", "content": "Sunny."}),
+    ]
+
+
+def test_events_for_tool_calls_and_handoff():
+    triage, _ = make_agents()
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses(tool_then_reply())
+    ring = RingBufferExporter()
+    client = Swarm(client=mock_client, tracer=Tracer(ring))
+
+    client.run(agent=triage, messages=MESSAGES)
+
+    events = ring.events()
+    assert [type(e) for e in events] == [
+        TurnStart,
+        CompletionRequest,
+        FirstToken,
+        LastToken,
+        ToolCallStart,
+        ToolCallEnd,
+        ToolCallStart,
+        ToolCallEnd,
+        Handoff,
+        CompletionRequest,
+        FirstToken,
+        LastToken,
+        TurnEnd,
+    ]
+    assert len({e.run_id for e in events}) == 1
+    assert events[4].name == "get_weather"
+    assert (events[8].from_agent, events[8].to_agent) == ("Triage", "Weather Agent")
+    assert (events[-1].agent, events[-1].message_count) == ("Weather Agent", 4)
+    timestamps = [e.timestamp_ns for e in events]
+    assert timestamps == sorted(timestamps)
+
+
+def test_span_exporter_nests_spans_and_records_ttft():
+    triage, _ = make_agents()
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses(tool_then_reply(stream=True))
+    spans = SpanExporter()
+    client = Swarm(client=mock_client, tracer=Tracer(spans))
+
+    list(client.run(agent=triage, messages=MESSAGES, stream=True))
+
+    by_name = {}
+    for span in spans.spans:
+        by_name.setdefault(span.name, []).append(span)
+    (turn,) = by_name["swarm.turn"]
+    assert len(by_name["swarm.completion"]) == 2
+    assert len(by_name["swarm.tool"]) == 2
+    for child in by_name["swarm.completion"] + by_name["swarm.tool"]:
+        assert child.parent_id == turn.span_id
+        assert child.trace_id == turn.trace_id
+        assert turn.start_ns <= child.start_ns <= child.end_ns <= turn.end_ns
+    for completion in by_name["swarm.completion"]:
+        assert completion.attributes["stream"] is True
+        assert 0 <= completion.attributes["time_to_first_token_ns"] <= completion.duration_ns
+    assert [event[0] for event in turn.events] == ["handoff"]
+    assert turn.attributes["final_agent"] == "Weather Agent"
+
+
+def test_tool_errors_end_the_span():
+    def explode():
+        raise ValueError("boom")
+
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(
+        create_mock_response(
+            {"role": "assistant", "content": ""}, function_calls=[{"name": "explode"}]
+        )
+    )
+    ring = RingBufferExporter()
+    client = Swarm(client=mock_client, tracer=Tracer(ring))
+
+    with pytest.raises(ValueError):
+        client.run(agent=Agent(functions=[explode]), messages=MESSAGES)
+
+    (end,) = [e for e in ring.events() if isinstance(e, ToolCallEnd)]
+    assert "boom" in end.error
+
+
+def test_failed_and_abandoned_runs_close_their_spans():
+    def explode():
+        raise ValueError("boom")
+
+    agent = Agent(functions=[explode])
+    mock_client = MockOpenAIClient()
+    mock_client.set_response(
+        create_mock_response(
+            {"role": "assistant", "content": ""}, function_calls=[{"name": "explode"}]
+        )
+    )
+    spans = SpanExporter()
+    client = Swarm(client=mock_client, tracer=Tracer(spans))
+
+    with pytest.raises(ValueError):
+        client.run(agent=agent, messages=MESSAGES)
+
+    assert spans._open == {}
+    (turn,) = [span for span in spans.spans if span.name == "swarm.turn"]
+    assert "boom" in turn.error
+
+    mock_client.set_sequential_responses([create_mock_stream("Sunny and warm.")])
+    stream = client.run(agent=agent, messages=MESSAGES, stream=True)
+    next(stream)
+    next(stream)
+    stream.close()
+
+    assert spans._open == {}
+    completion, turn = spans.spans[-2:]
+    assert (completion.name, turn.name) == ("swarm.completion", "swarm.turn")
+    assert "GeneratorExit" in completion.error and "GeneratorExit" in turn.error
+
+
+def test_ring_buffer_is_bounded():
+    ring = RingBufferExporter(capacity=3)
+    tracer = Tracer(ring)
+    for _ in range(5):
+        tracer.start_turn(Agent())
+    assert len(ring.events()) == 3
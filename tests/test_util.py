@@ -1,4 +1,10 @@
-from swarm.util import function_to_json
+import dataclasses
+import enum
+from typing import Annotated, List, Literal, Optional
+
+from pydantic import BaseModel
+
+from swarm.util import function_schema, function_to_json
 
 
 def test_basic_function():
@@ -48,3 +54,63 @@ def test_complex_function():
             },
         },
     }
+
+
+def test_structured_types_and_docstring_descriptions():
+    class Color(enum.Enum):
+        RED = "red"
+        BLUE = "blue"
+
+    class Address(BaseModel):
+        street: str
+
+    @dataclasses.dataclass
+    class Item:
+        sku: str
+        qty: int = 1
+
+    def place_order(
+        ids: list[int],
+        name: Optional[str],
+        mode: Literal["pickup", "delivery"],
+        color: Color,
+        address: Address,
+        items: List[Item],
+        note: Annotated[str, "Free-form note"] = "",
+    ):
+        """Place an order.
+
+        Args:
+            ids: Product ids,
+                in cart order.
+            name (str): Customer name.
+        """
+
+    properties = function_to_json(place_order)["function"]["parameters"]["properties"]
+    assert properties["ids"] == {
+        "type": "array",
+        "items": {"type": "integer"},
+        "description": "Product ids, in cart order.",
+    }
+    assert properties["name"] == {"type": ["string", "null"], "description": "Customer name."}
+    assert properties["mode"] == {"type": "string", "enum": ["pickup", "delivery"]}
+    assert properties["color"] == {"type": "string", "enum": ["red", "blue"]}
+    assert properties["address"]["properties"]["street"]["type"] == "string"
+    assert properties["items"]["items"] == {
+        "type": "object",
+        "properties": {"sku": {"type": "string"}, "qty": {"type": "integer"}},
+        "required": ["sku"],
+    }
+    assert properties["note"] == {"type": "string", "description": "Free-form note"}
+
+
+def test_schemas_are_cached_per_function():
+    def lookup(order_id: int):
+        pass
+
+    shared = function_schema(lookup)
+    assert function_schema(lookup) is shared
+    copy = function_to_json(lookup)
+    assert copy == shared and copy is not shared
+    copy["function"]["name"] = "changed"
+    assert function_schema(lookup)["function"]["name"] == "lookup"
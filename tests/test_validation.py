@@ -0,0 +1,148 @@
+import json
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Literal, Optional
+
+from swarm import Swarm, Agent
+from swarm.util import function_schema
+from swarm.validation import compile_validator
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+class Unit(Enum):
+    CELSIUS = "celsius"
+    FAHRENHEIT = "fahrenheit"
+
+
+@dataclass
+class Window:
+    start: int
+    end: int
+
+
+def forecast(
+    city: str,
+    days: int,
+    unit: Unit = Unit.CELSIUS,
+    hours: Optional[List[int]] = None,
+    detail: Literal["short", "long"] = "short",
+    window: Optional[Window] = None,
+    context_variables: dict = {},
+):
+    return "sunny"
+
+
+def test_arguments_are_coerced():
+    validate = compile_validator(forecast)
+
+    args, errors = validate(
+        {
+            "city": "Oslo",
+            "days": "3",
+            "unit": "fahrenheit",
+            "hours": [6, "12"],
+            "window": {"start": 1, "end": "2"},
+        }
+    )
+
+    assert errors == []
+    assert args == {
+        "city": "Oslo",
+        "days": 3,
+        "unit": Unit.FAHRENHEIT,
+        "hours": [6, 12],
+        "window": Window(1, 2),
+    }
+    assert compile_validator(forecast) is validate
+
+
+def test_all_problems_are_reported():
+    _, errors = compile_validator(forecast)(
+        {"days": "many", "detail": "medium", "hours": [1, "x"], "color": "red"}
+    )
+
+    assert errors == [
+        "city: missing required argument",
+        'days: expected an integer, got "many"',
+        'detail: expected one of ["short", "long"], got "medium"',
+        'hours[1]: expected an integer, got "x"',
+        "color: unexpected argument",
+    ]
+
+
+def test_invalid_arguments_are_returned_to_the_model():
+    calls = []
+
+    def add(a: int, b: int):
+        calls.append((a, b))
+        return str(a + b)
+
+    agent = Agent(functions=[add])
+    mock_client = MockOpenAIClient()
+    mock_client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                function_calls=[{"name": "add", "args": {"a": "two", "b": 2}}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                function_calls=[{"name": "add", "args": {"a": "2", "b": 2}}],
+            ),
+            create_mock_response({"role": "assistant", "content": "4"}),
+        ]
+    )
+    client = Swarm(client=mock_client)
+
+    response = client.run(agent=agent, messages=[{"role": "user", "content": "2+2"}])
+
+    error = json.loads(response.messages[1]["content"])
+    assert error["error"] == "invalid_arguments"
+    assert error["details"] == ['a: expected an integer, got "two"']
+    assert response.messages[3]["content"] == "4"
+    assert calls == [(2, 2)]
+
+
+def test_malformed_json_is_returned_to_the_model():
+    agent = Agent(functions=[forecast])
+    tool_call = create_mock_response(
+        {"role": "assistant", "content": ""}, function_calls=[{"name": "forecast"}]
+    ).choices[0].message.tool_calls[0]
+    tool_call.function.arguments = '{"city": "Oslo"'
+
+    response = Swarm(client=MockOpenAIClient()).handle_tool_calls(
+        [tool_call], agent.tool_registry(), {}, debug=False
+    )
+
+    error = json.loads(response.messages[0]["content"])
+    assert error["details"][0].startswith("arguments are not valid JSON")
+
+
+def test_unhashable_set_items_are_an_argument_error():
+    def tag(labels: set[str], groups: frozenset[dict] = frozenset()):
+        return "ok"
+
+    validate = compile_validator(tag)
+
+    assert validate({"labels": ["a", "b", "a"]}) == ({"labels": {"a", "b"}}, [])
+    _, errors = validate({"labels": [{}], "groups": [{"x": 1}]})
+    assert errors == [
+        'labels[0]: expected a string, got {}',
+        "groups: items of frozenset must be hashable",
+    ]
+
+
+def test_none_default_accepts_null():
+    def search(query: str, limit: int = None, note: str = None):
+        return "ok"
+
+    validate = compile_validator(search)
+
+    assert validate({"query": "x", "limit": None, "note": None}) == (
+        {"query": "x", "limit": None, "note": None},
+        [],
+    )
+    assert validate({"query": "x", "limit": "5"}) == ({"query": "x", "limit": 5}, [])
+    properties = function_schema(search)["function"]["parameters"]["properties"]
+    assert properties["limit"] == {"type": ["integer", "null"]}
+    assert properties["note"] == {"type": ["string", "null"]}